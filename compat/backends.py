@@ -5,12 +5,14 @@ from __future__ import annotations
 import os
 import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 
+@lru_cache(maxsize=None)
 def git_available() -> bool:
-    """Return True if system git is available."""
+    """Return True if system git is available (looked up once per process)."""
     return shutil.which("git") is not None
 
 
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import argparse
+import copy
 import sys
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -203,8 +205,8 @@ def run_scenario(
             shutil.rmtree(tmp_pygit, ignore_errors=True)
 
 
-def load_scenario(name: str) -> Optional[List[Dict[str, Any]]]:
-    """Load scenario by name from compat/scenarios/."""
+@lru_cache(maxsize=None)
+def _load_scenario_cached(name: str) -> Optional[List[Dict[str, Any]]]:
     compat_dir = Path(__file__).resolve().parent
     scenarios_dir = compat_dir / "scenarios"
     # name can be "S1_linear_commits" or "S1" (try both)
@@ -225,6 +227,12 @@ def load_scenario(name: str) -> Optional[List[Dict[str, Any]]]:
     return getattr(mod, "OPS", None)
 
 
+def load_scenario(name: str) -> Optional[List[Dict[str, Any]]]:
+    """Load scenario by name from compat/scenarios/. Each scenario module runs once; callers get a private copy of its ops."""
+    ops = _load_scenario_cached(name)
+    return copy.deepcopy(ops) if ops is not None else None
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run compat scenario: git vs pygit")
     parser.add_argument("scenario", help="Scenario name (e.g. S1_linear_commits)")
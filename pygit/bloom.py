@@ -0,0 +1,51 @@
+"""Bloom filter over SHA-1 object names: fast 'definitely absent' answers before idx lookups."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+BLOOM_BITS_PER_ITEM = 10
+BLOOM_HASHES = 4
+
+
+class ShaBloomFilter:
+    """Fixed-size Bloom filter keyed by hex SHA-1s.
+
+    SHA-1 output is already uniformly distributed, so the k bit positions are taken straight from
+    32-bit slices of the name instead of rehashing it. False positives are possible; false negatives are not.
+    """
+
+    def __init__(self, capacity: int, bits_per_item: int = BLOOM_BITS_PER_ITEM, hashes: int = BLOOM_HASHES) -> None:
+        self._nbits = max(64, capacity * bits_per_item)
+        self._bits = bytearray((self._nbits + 7) // 8)
+        self._hashes = hashes
+
+    @classmethod
+    def from_shas(cls, shas: Iterable[str], capacity: int) -> "ShaBloomFilter":
+        """Build a filter sized for capacity names and add every sha."""
+        bloom = cls(capacity)
+        for sha in shas:
+            bloom.add(sha)
+        return bloom
+
+    def add(self, sha: str) -> None:
+        """Add a 40-char hex sha (any case)."""
+        v = int(sha, 16)
+        nbits = self._nbits
+        bits = self._bits
+        for _ in range(self._hashes):
+            pos = (v & 0xFFFFFFFF) % nbits
+            bits[pos >> 3] |= 1 << (pos & 7)
+            v >>= 32
+
+    def __contains__(self, sha: str) -> bool:
+        """False means sha was never added; True means it probably was."""
+        v = int(sha, 16)
+        nbits = self._nbits
+        bits = self._bits
+        for _ in range(self._hashes):
+            pos = (v & 0xFFFFFFFF) % nbits
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+            v >>= 32
+        return True
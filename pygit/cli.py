@@ -33,7 +33,7 @@ from .plumbing import (
 from .gc import gc as gc_run, prune as prune_run, repack as repack_run
 from .clone import clone as clone_run
 from .fetch import fetch as fetch_run
-from .stash import stash_apply, stash_list, stash_pop, stash_save
+from .stash import iter_stash, stash_apply, stash_pop, stash_save
 from .rebase import rebase, rebase_abort, rebase_continue
 from .push import push as push_run
 from .remote import get_remote_url, remote_add, remote_list, remote_remove
@@ -564,14 +564,14 @@ def cmd_stash(args: argparse.Namespace) -> int:
         return 1
     sub = getattr(args, "stash_subcommand", None)
     if not sub:
-        for ref, msg in stash_list(repo):
+        for ref, msg in iter_stash(repo):
             print(f"{ref}: {msg}")
         return 0
     try:
         if sub == "save":
             stash_save(repo, message=getattr(args, "message", None))
         elif sub == "list":
-            for ref, msg in stash_list(repo):
+            for ref, msg in iter_stash(repo):
                 print(f"{ref}: {msg}")
         elif sub == "apply":
             stash_apply(repo, ref=getattr(args, "ref", "stash@{0}"))
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import configparser
 import io
+import os
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple
 
 from .errors import InvalidConfigKeyError, PygitError
 from .util import read_text_safe, write_text_atomic
@@ -43,10 +44,33 @@ def read_config(repo: "Repository") -> configparser.ConfigParser:
     return cfg
 
 
+# Parsed configs for read-only lookups: path -> ((st_ino, st_mtime_ns, st_size), parser)
+_READ_CACHE: Dict[Path, Tuple[Tuple[int, int, int], configparser.ConfigParser]] = {}
+
+
+def _read_config_cached(repo: "Repository") -> configparser.ConfigParser:
+    """Parsed .git/config shared between read-only callers; reparsed when the file's stat changes. Do not mutate."""
+    repo.require_repo()
+    path = _config_path(repo)
+    try:
+        st = os.stat(path)
+    except OSError:
+        _READ_CACHE.pop(path, None)
+        return configparser.ConfigParser()
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    hit = _READ_CACHE.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    cfg = read_config(repo)
+    _READ_CACHE[path] = (key, cfg)
+    return cfg
+
+
 def write_config(repo: "Repository", cfg: configparser.ConfigParser) -> None:
     """Write config to .git/config atomically."""
     repo.require_repo()
     path = _config_path(repo)
+    _READ_CACHE.pop(path, None)
     path.parent.mkdir(parents=True, exist_ok=True)
     buf = io.StringIO()
     cfg.write(buf)
@@ -57,7 +81,7 @@ def get_value(repo: "Repository", key: str) -> Optional[str]:
     """Get config value for key (section.option). Return None if missing."""
     repo.require_repo()
     section, option = _parse_key(key)
-    cfg = read_config(repo)
+    cfg = _read_config_cached(repo)
     if cfg.has_section(section) and cfg.has_option(section, option):
         return cfg.get(section, option)
     return None
@@ -65,12 +89,18 @@ def get_value(repo: "Repository", key: str) -> Optional[str]:
 
 def set_value(repo: "Repository", key: str, value: str) -> None:
     """Set config value. Creates section if needed."""
+    set_values(repo, {key: value})
+
+
+def set_values(repo: "Repository", values: Mapping[str, str]) -> None:
+    """Set several config values with one read and one write. All keys are validated before anything is written."""
     repo.require_repo()
-    section, option = _parse_key(key)
+    parsed = [(_parse_key(key), value) for key, value in values.items()]
     cfg = read_config(repo)
-    if not cfg.has_section(section):
-        cfg.add_section(section)
-    cfg.set(section, option, value)
+    for (section, option), value in parsed:
+        if not cfg.has_section(section):
+            cfg.add_section(section)
+        cfg.set(section, option, value)
     write_config(repo, cfg)
 
 
@@ -91,7 +121,7 @@ def unset_value(repo: "Repository", key: str) -> bool:
 def list_values(repo: "Repository") -> list[tuple[str, str]]:
     """Return [(key, value), ...] sorted by key (section.option)."""
     repo.require_repo()
-    cfg = read_config(repo)
+    cfg = _read_config_cached(repo)
     result: list[tuple[str, str]] = []
     for section in sorted(cfg.sections()):
         for option in sorted(cfg.options(section)):
@@ -10,7 +10,7 @@ from .errors import ObjectNotFoundError
 from .idx import write_idx
 from .objects import Commit, Tag, Tree
 from .pack import write_pack
-from .refs import list_ref_names_with_prefix, resolve_ref
+from .refs import _read_packed_refs, list_ref_names_with_prefix, resolve_ref
 from .repo import Repository
 from .util import write_bytes_atomic
 
@@ -33,14 +33,15 @@ def _peel_to_commit(repo: Repository, sha: str) -> str | None:
 def reachable_objects(repo: Repository) -> Set[str]:
     """Return set of object SHAs reachable from refs/heads/* and refs/tags/* (loose + packed)."""
     repo.require_repo()
-    refnames = list_ref_names_with_prefix(repo.git_dir, REF_HEADS_PREFIX) + list_ref_names_with_prefix(
-        repo.git_dir, REF_TAGS_PREFIX
+    packed = _read_packed_refs(repo.git_dir)
+    refnames = list_ref_names_with_prefix(repo.git_dir, REF_HEADS_PREFIX, _packed=packed) + list_ref_names_with_prefix(
+        repo.git_dir, REF_TAGS_PREFIX, _packed=packed
     )
     commit_tips: list[str] = []
     tag_object_shas: set[str] = set()
 
     for refname in refnames:
-        sha = resolve_ref(repo.git_dir, refname)
+        sha = resolve_ref(repo.git_dir, refname, _packed=packed)
         if not sha:
             continue
         try:
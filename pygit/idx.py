@@ -8,7 +8,7 @@ from typing import Iterator, List, Optional, Tuple
 
 from .constants import MIN_PREFIX_LEN, SHA1_HEX_LEN
 from .errors import AmbiguousRefError, IdxError, ObjectNotFoundError
-from .util import sha1_hash, write_bytes_atomic
+from .util import sha1_hash_parts, write_bytes_atomic
 
 IDX_SIGNATURE = b"\xfftOc"
 IDX_VERSION_V2 = 2
@@ -197,7 +197,7 @@ def write_idx(
         body_parts.append(struct.pack(">Q", lo))
 
     body = b"".join(body_parts)
-    idx_sha = sha1_hash(body + pack_sha_bin)
+    idx_sha = sha1_hash_parts(body, pack_sha_bin)
     idx_bytes = body + pack_sha_bin + bytes.fromhex(idx_sha)
 
     path = Path(path)
@@ -6,13 +6,12 @@ import hashlib
 import json
 import os
 import struct
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, NamedTuple, Optional, Union
 
 from .constants import INDEX_FILENAME, MODE_FILE, MODE_FILE_EXECUTABLE
 from .errors import IndexChecksumError, IndexCorruptError
-from .util import read_text_safe, write_bytes, is_executable
+from .util import read_text_safe, write_bytes, is_executable_mode
 
 INDEX_CHECKSUM_LEN = 20
 
@@ -23,19 +22,13 @@ FLAGS_NAME_MASK = 0x0FFF  # low 12 bits for name length; 0xFFF = name in extende
 MAX_NAME_IN_FLAGS = 0xFFF
 
 
-@dataclass
-class IndexEntry:
-    """Single index entry (internal)."""
-    path: str
+class IndexEntry(NamedTuple):
+    """Compact index entry; save_index accepts these in place of entry dicts."""
     sha1: str
     mode: str
     size: int
-    mtime_ns: int
+    mtime_ns: int = 0
     ctime_ns: int = 0
-    dev: int = 0
-    ino: int = 0
-    uid: int = 0
-    gid: int = 0
 
 
 def _index_path(repo_git: Path) -> Path:
@@ -59,56 +52,57 @@ def _mode_from_int(m: int) -> str:
     return s.zfill(6) if len(s) <= 6 else MODE_FILE
 
 
-def _read_dirc(repo_git: Path) -> Dict[str, Dict[str, Any]]:
-    """Read binary DIRC v2 index; return {path: {sha1, mode, size, mtime_ns}}. Verifies trailing SHA-1 checksum when present; validates entry order."""
-    path = _index_path(repo_git)
-    data = path.read_bytes()
+def _read_dirc(repo_git: Path, data: Optional[bytes] = None) -> Dict[str, Dict[str, Any]]:
+    """Read binary DIRC v2 index; return {path: {sha1, mode, size, mtime_ns}}. Verifies trailing SHA-1 checksum when present; validates entry order.
+    Pass data when the caller already read the file.
+    """
+    if data is None:
+        data = _index_path(repo_git).read_bytes()
     if len(data) < 12:
         return {}
     sig = data[:4]
     if sig != DIRC_SIGNATURE:
         return {}
-    # Checksum: if file has at least 32 bytes, last 20 must be SHA-1 of preceding content
-    if len(data) >= 32:
-        body = data[:-INDEX_CHECKSUM_LEN]
-        stored = data[-INDEX_CHECKSUM_LEN:]
-        if hashlib.sha1(body).digest() != stored:
+    # Checksum: if file has at least 32 bytes, last 20 must be SHA-1 of preceding content.
+    # Entries are parsed straight out of data up to end, so the body is never copied.
+    end = len(data)
+    if end >= 32:
+        end -= INDEX_CHECKSUM_LEN
+        if hashlib.sha1(memoryview(data)[:end], usedforsecurity=False).digest() != data[end:]:
             raise IndexChecksumError("index checksum mismatch")
-    else:
-        body = data
-    version, count = struct.unpack(">II", body[4:12])
+    version, count = struct.unpack(">II", data[4:12])
     if version != INDEX_VERSION_BINARY:
         return {}
     result: Dict[str, Dict[str, Any]] = {}
     path_order: list[str] = []
     pos = 12
     for _ in range(count):
-        if pos + 62 > len(body):
+        if pos + 62 > end:
             raise IndexCorruptError("index truncated or corrupt")
         entry_start = pos
-        ctime_s, ctime_ns = struct.unpack(">II", body[pos : pos + 8])
+        ctime_s, ctime_ns = struct.unpack(">II", data[pos : pos + 8])
         pos += 8
-        mtime_s, mtime_ns = struct.unpack(">II", body[pos : pos + 8])
+        mtime_s, mtime_ns = struct.unpack(">II", data[pos : pos + 8])
         pos += 8
-        dev, ino = struct.unpack(">II", body[pos : pos + 8])
+        dev, ino = struct.unpack(">II", data[pos : pos + 8])
         pos += 8
-        mode, uid, gid = struct.unpack(">III", body[pos : pos + 12])
+        mode, uid, gid = struct.unpack(">III", data[pos : pos + 12])
         pos += 12
-        size = struct.unpack(">I", body[pos : pos + 4])[0]
+        size = struct.unpack(">I", data[pos : pos + 4])[0]
         pos += 4
-        sha1_bin = body[pos : pos + 20]
+        sha1_bin = data[pos : pos + 20]
         pos += 20
-        flags = struct.unpack(">H", body[pos : pos + 2])[0]
+        flags = struct.unpack(">H", data[pos : pos + 2])[0]
         pos += 2
         name_len = flags & FLAGS_NAME_MASK
         if name_len == MAX_NAME_IN_FLAGS:
-            null_idx = body.find(b"\0", pos)
-            if null_idx == -1 or null_idx >= len(body):
+            null_idx = data.find(b"\0", pos, end)
+            if null_idx == -1:
                 raise IndexCorruptError("index truncated or corrupt")
-            path_bytes = body[pos:null_idx]
+            path_bytes = data[pos:null_idx]
             pos = null_idx + 1
         else:
-            path_bytes = body[pos : pos + name_len]
+            path_bytes = data[pos : pos + name_len]
             pos += name_len + 1  # NUL
         path_str = path_bytes.decode("utf-8")
         path_order.append(path_str)
@@ -130,17 +124,20 @@ def _read_dirc(repo_git: Path) -> Dict[str, Dict[str, Any]]:
     return result
 
 
-def _write_dirc(repo_git: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+def _write_dirc(repo_git: Path, entries: Dict[str, Union[Dict[str, Any], IndexEntry]]) -> None:
     """Write binary DIRC v2 index (atomic)."""
     path = _index_path(repo_git)
     chunks = [DIRC_SIGNATURE, struct.pack(">II", INDEX_VERSION_BINARY, len(entries))]
     for path_str in sorted(entries.keys()):
         ent = entries[path_str]
-        sha1_hex = ent.get("sha1", "")
-        mode_str = ent.get("mode", MODE_FILE)
-        size = int(ent.get("size", 0))
-        mtime_ns = int(ent.get("mtime_ns", 0))
-        ctime_ns = int(ent.get("ctime_ns", 0))
+        if isinstance(ent, IndexEntry):
+            sha1_hex, mode_str, size, mtime_ns, ctime_ns = ent
+        else:
+            sha1_hex = ent.get("sha1", "")
+            mode_str = ent.get("mode", MODE_FILE)
+            size = int(ent.get("size", 0))
+            mtime_ns = int(ent.get("mtime_ns", 0))
+            ctime_ns = int(ent.get("ctime_ns", 0))
         mtime_s, mtime_nsec = divmod(mtime_ns, 1_000_000_000)
         ctime_s, ctime_nsec = divmod(ctime_ns, 1_000_000_000)
         mode = _mode_to_int(mode_str)
@@ -163,7 +160,7 @@ def _write_dirc(repo_git: Path, entries: Dict[str, Dict[str, Any]]) -> None:
             entry += b"\0"
         chunks.append(entry)
     content = b"".join(chunks)
-    write_bytes(path, content + hashlib.sha1(content).digest())
+    write_bytes(path, content + hashlib.sha1(content, usedforsecurity=False).digest())
 
 
 def _parse_json_entries(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -196,7 +193,7 @@ def load_index(repo_git: Path) -> Dict[str, Dict[str, Any]]:
         return {}
     raw_bytes = path.read_bytes()
     if len(raw_bytes) >= 4 and raw_bytes[:4] == DIRC_SIGNATURE:
-        return _read_dirc(repo_git)
+        return _read_dirc(repo_git, raw_bytes)
     raw = raw_bytes.decode("utf-8", errors="replace")
     try:
         data = json.loads(raw)
@@ -216,16 +213,17 @@ def load_index(repo_git: Path) -> Dict[str, Dict[str, Any]]:
     return entries
 
 
-def save_index(repo_git: Path, entries: Dict[str, Dict[str, Any]]) -> None:
-    """Save index as binary DIRC v2 (atomic)."""
+def save_index(repo_git: Path, entries: Dict[str, Union[Dict[str, Any], IndexEntry]]) -> None:
+    """Save index as binary DIRC v2 (atomic). Entries may be dicts or IndexEntry tuples."""
     _write_dirc(repo_git, entries)
 
 
-def index_entry_for_file(file_path: Path, blob_sha: str) -> Dict[str, Any]:
-    """Build index entry dict for a file (mode from +x, size, mtime_ns)."""
+def index_entry_for_file(file_path: Path, blob_sha: str, st: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """Build index entry dict for a file (mode from +x, size, mtime_ns). Pass st to reuse a stat the caller already has."""
     try:
-        st = file_path.stat()
-        mode = MODE_FILE_EXECUTABLE if is_executable(file_path) else MODE_FILE
+        if st is None:
+            st = file_path.stat()
+        mode = MODE_FILE_EXECUTABLE if is_executable_mode(st.st_mode) else MODE_FILE
         mtime_ns = getattr(st, "st_mtime_ns", int(st.st_mtime * 1_000_000_000))
         ctime_ns = getattr(st, "st_ctime_ns", int(st.st_ctime * 1_000_000_000))
         return {
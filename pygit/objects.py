@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import re
 import zlib
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from .constants import MODE_DIR, MODE_FILE, MODE_FILE_EXECUTABLE, OBJ_BLOB, OBJ_COMMIT, OBJ_TAG, OBJ_TREE
-from .util import sha1_hash
+from .util import sha1_hash_parts
+
+
+# Chunk size when streaming a large buffer through zlib
+COMPRESS_CHUNK_SIZE = 1 << 20
+# Loose objects use git's default core.looseCompression: fastest deflate, still readable by any zlib
+LOOSE_COMPRESSION_LEVEL = zlib.Z_BEST_SPEED
+# Tree entry: b"<octal mode> <name>\0" + 20-byte sha; the whole-body pattern checks entries are back to back
+_TREE_ENTRY_RE = re.compile(rb"([0-7]+) ([^\0]*)\0(.{20})", re.S)
+_TREE_BODY_RE = re.compile(rb"(?:[0-7]+ [^\0]*\0.{20})*", re.S)
 
 
 def _object_header(obj_type: str, content: bytes) -> bytes:
@@ -15,6 +25,20 @@ def _object_header(obj_type: str, content: bytes) -> bytes:
     return f"{obj_type} {len(content)}\0".encode()
 
 
+def hash_buffer(obj_type: str, data: bytes) -> str:
+    """SHA-1 of header + data without concatenating them. data may be any buffer (e.g. mmap)."""
+    return sha1_hash_parts(_object_header(obj_type, data), data)
+
+
+def compress_buffer(obj_type: str, data: bytes, chunk_size: int = COMPRESS_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield zlib(header + data) in pieces, reading data chunk_size bytes at a time."""
+    comp = zlib.compressobj(LOOSE_COMPRESSION_LEVEL)
+    yield comp.compress(_object_header(obj_type, data))
+    for start in range(0, len(data), chunk_size):
+        yield comp.compress(data[start : start + chunk_size])
+    yield comp.flush()
+
+
 class GitObject:
     """Base git object (blob, tree, commit)."""
 
@@ -24,36 +48,32 @@ class GitObject:
 
     def hash_id(self) -> str:
         """SHA-1 of uncompressed representation: header + content."""
-        header = _object_header(self.type, self.content)
-        return sha1_hash(header + self.content)
+        return hash_buffer(self.type, self.content)
 
     def serialize(self) -> bytes:
-        """Compressed bytes for storage: zlib(header + content)."""
-        header = _object_header(self.type, self.content)
-        return zlib.compress(header + self.content)
+        """Compressed bytes for storage: zlib(header + content), deflated without joining header and content first."""
+        return b"".join(compress_buffer(self.type, self.content))
 
     @classmethod
     def deserialize(cls, data: bytes) -> "GitObject":
         """Parse compressed object bytes into a GitObject (generic)."""
-        raw = zlib.decompress(data)
+        return cls.from_raw(zlib.decompress(data))
+
+    @classmethod
+    def from_raw(cls, raw: bytes) -> "GitObject":
+        """Parse uncompressed object bytes (type size\\0content) into a GitObject."""
         null_idx = raw.find(b"\0")
         if null_idx == -1:
             raise ValueError("invalid object: no null byte in header")
-        header = raw[:null_idx].decode()
-        content = raw[null_idx + 1 :]
-        parts = header.split(" ", 1)
-        if len(parts) != 2:
+        sp = raw.find(b" ", 0, null_idx)
+        if sp == -1:
             raise ValueError("invalid object header")
-        obj_type, _ = parts
-        if obj_type == OBJ_BLOB:
-            return Blob(content)
-        if obj_type == OBJ_TREE:
-            return Tree.from_content(content)
-        if obj_type == OBJ_COMMIT:
-            return Commit.from_content(content)
-        if obj_type == OBJ_TAG:
-            return Tag.from_content(content)
-        return cls(obj_type, content)
+        type_bytes = raw[:sp]
+        content = raw[null_idx + 1 :]
+        parse = _PARSERS_BY_TYPE.get(type_bytes)
+        if parse is not None:
+            return parse(content)
+        return cls(type_bytes.decode(), content)
 
 
 class Blob(GitObject):
@@ -104,6 +124,14 @@ class Tree(GitObject):
     @classmethod
     def from_content(cls, content: bytes) -> "Tree":
         tree = cls()
+        if _TREE_BODY_RE.fullmatch(content) is not None:
+            # Well-formed body: let the regex engine split every entry in one C-level pass
+            tree.entries = [
+                (mode.decode(), name.decode(), sha_bin.hex()) for mode, name, sha_bin in _TREE_ENTRY_RE.findall(content)
+            ]
+            tree.content = content
+            return tree
+        # Otherwise walk entry by entry and stop at the first malformed one
         i = 0
         while i < len(content):
             null_idx = content.find(b"\0", i)
@@ -124,6 +152,41 @@ class Tree(GitObject):
         return tree
 
 
+def tree_child_hashes(content: bytes) -> List[Tuple[bool, str]]:
+    """(is_subtree, sha) for each tree entry, without decoding names; for reachability walks."""
+    out: List[Tuple[bool, str]] = []
+    find = content.find
+    startswith = content.startswith
+    i, n = 0, len(content)
+    while i < n:
+        null_idx = find(b"\0", i)
+        if null_idx == -1 or null_idx + 21 > n:
+            break
+        out.append((startswith(b"40000 ", i) or startswith(b"040000 ", i), content[null_idx + 1 : null_idx + 21].hex()))
+        i = null_idx + 21
+    return out
+
+
+def commit_tree_and_parents(content: bytes) -> Tuple[str, List[str]]:
+    """(tree_hash, parent_hashes) from commit content, reading only the leading header lines."""
+    tree_hash = ""
+    parents: List[str] = []
+    i = 0
+    while True:
+        end = content.find(b"\n", i)
+        line = content[i:] if end == -1 else content[i:end]
+        if line.startswith(b"tree "):
+            tree_hash = line[5:].decode()
+        elif line.startswith(b"parent "):
+            parents.append(line[7:].decode())
+        else:
+            break
+        if end == -1:
+            break
+        i = end + 1
+    return tree_hash, parents
+
+
 @dataclass
 class CommitParsed:
     """Parsed commit fields."""
@@ -346,6 +409,15 @@ class Tag(GitObject):
         return tag
 
 
+# Object type as it appears in the raw header -> constructor for its content
+_PARSERS_BY_TYPE: Dict[bytes, Callable[[bytes], GitObject]] = {
+    OBJ_BLOB.encode(): Blob,
+    OBJ_TREE.encode(): Tree.from_content,
+    OBJ_COMMIT.encode(): Commit.from_content,
+    OBJ_TAG.encode(): Tag.from_content,
+}
+
+
 def verify_signature(obj: GitObject) -> Tuple[bool, str]:
     """Stub: report whether object has a PGP/GPG signature; do not perform verification (Phase F).
     Returns (valid, message). For unsigned objects returns (True, ""). For signed objects returns
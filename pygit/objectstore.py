@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import threading
 import zlib
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+from .bloom import ShaBloomFilter
 from .constants import MIN_PREFIX_LEN, SHA1_HEX_LEN
 from .errors import AmbiguousRefError, IdxError, ObjectNotFoundError, PackError
 from .idx import IdxV2
@@ -14,6 +16,9 @@ from .odb import ObjectDB
 from .pack import read_pack_entries_with_bases
 from .util import write_bytes
 
+# Pack membership queries answered by idx bisects before the bloom filter over all packs is worth building
+BLOOM_MIN_QUERIES = 256
+
 
 class ObjectStore:
     """Unified object database: loose objects + pack files (read)."""
@@ -23,6 +28,13 @@ class ObjectStore:
         self._loose = ObjectDB(self.objects_dir)
         self._packs: List[Tuple[Path, IdxV2]] = []
         self._pack_caches: Dict[Path, Dict[str, bytes]] = {}
+        # Serializes pack parsing so concurrent loaders parse each pack once. Store-wide rather than per pack:
+        # resolving a ref-delta base can parse another pack, and per-pack locks would then be taken in any order.
+        # Reentrant because those base lookups recurse on the same thread.
+        self._pack_parse_lock = threading.RLock()
+        self._pack_bloom: Optional[ShaBloomFilter] = None
+        self._pack_bloom_lock = threading.Lock()
+        self._pack_queries = 0
         self._scan_packs()
 
     def _scan_packs(self) -> None:
@@ -44,8 +56,49 @@ class ObjectStore:
         """Rescan pack directory (e.g. after gc/repack). Clears pack caches and reloads idx list."""
         self._packs.clear()
         self._pack_caches.clear()
+        self._pack_bloom = None
+        self._pack_queries = 0
         self._scan_packs()
 
+    def _count_pack_queries(self, n: int) -> None:
+        """Record n pack lookups; build the bloom filter over all idx names once BLOOM_MIN_QUERIES is reached.
+
+        Building it costs a pass over every pack index, so one-off lookups stick to idx bisects.
+        """
+        if self._pack_bloom is not None or not self._packs:
+            return
+        with self._pack_bloom_lock:
+            if self._pack_bloom is not None:
+                return
+            self._pack_queries += n
+            if self._pack_queries >= BLOOM_MIN_QUERIES:
+                self._pack_bloom = ShaBloomFilter.from_shas(
+                    (name for _pack_path, idx in self._packs for name in idx.iter_shas()),
+                    sum(idx.object_count for _pack_path, idx in self._packs),
+                )
+
+    def _maybe_packed(self, sha: str) -> bool:
+        """False if sha (lowercase hex) is in no registered pack; True if it may be, or there is no filter yet."""
+        if not self._packs:
+            return False
+        return self._pack_bloom is None or sha in self._pack_bloom
+
+    def _pack_cache(self, pack_path: Path) -> Optional[Dict[str, bytes]]:
+        """Resolved objects of one pack, parsed on first use. None if the pack cannot be read. Thread-safe."""
+        cache = self._pack_caches.get(pack_path)
+        if cache is not None:
+            return cache
+        with self._pack_parse_lock:
+            # Another thread may have parsed the pack while this one waited
+            cache = self._pack_caches.get(pack_path)
+            if cache is None:
+                try:
+                    cache = read_pack_entries_with_bases(pack_path, get_base_content=self._raw_load)
+                except PackError:
+                    return None
+                self._pack_caches[pack_path] = cache
+        return cache
+
     def _raw_load(self, sha: str) -> bytes:
         """Load raw object bytes (type size\\0content). From loose or pack. Raises ObjectNotFoundError."""
         sha = sha.lower()
@@ -65,21 +118,18 @@ class ObjectStore:
         for pack_path, idx in self._packs:
             offset = idx.lookup(sha)
             if offset is not None:
-                if pack_path not in self._pack_caches:
-                    try:
-                        resolved = read_pack_entries_with_bases(pack_path, get_base_content=self._raw_load)
-                        self._pack_caches[pack_path] = resolved
-                    except PackError:
-                        continue
-                if sha in self._pack_caches[pack_path]:
-                    return self._pack_caches[pack_path][sha]
+                cache = self._pack_cache(pack_path)
+                if cache is None:
+                    continue
+                if sha in cache:
+                    return cache[sha]
                 break
 
         raise ObjectNotFoundError(f"object {sha} not found")
 
     def _raw_to_object(self, raw: bytes) -> GitObject:
         """Convert raw object bytes (type size\\0content) to GitObject."""
-        return GitObject.deserialize(zlib.compress(raw))
+        return GitObject.from_raw(raw)
 
     def exists(self, sha: str) -> bool:
         """Return True if object exists (loose or packed)."""
@@ -88,6 +138,9 @@ class ObjectStore:
         sha = sha.lower()
         if self._loose.exists(sha):
             return True
+        self._count_pack_queries(1)
+        if not self._maybe_packed(sha):
+            return False
         for _pack_path, idx in self._packs:
             if idx.lookup(sha) is not None:
                 return True
@@ -96,10 +149,39 @@ class ObjectStore:
                 return True
         return False
 
+    def has_objects(self, shas: Iterable[str]) -> Set[str]:
+        """Return the subset of shas present (loose or packed); one directory listing per fan-out dir."""
+        wanted = {s.lower() for s in shas if len(s) == SHA1_HEX_LEN and all(c in "0123456789abcdef" for c in s.lower())}
+        found = self._loose.existing(wanted)
+        pending = wanted - found
+        self._count_pack_queries(len(pending))
+        for sha in pending:
+            if not self._maybe_packed(sha):
+                continue
+            if any(idx.lookup(sha) is not None for _pack_path, idx in self._packs):
+                found.add(sha)
+            elif any(sha in cache for cache in self._pack_caches.values()):
+                found.add(sha)
+        return found
+
+    def copy_to(self, other: "ObjectStore", sha: str) -> None:
+        """Copy object into other's loose store: loose files verbatim, packed objects re-encoded. Raises ObjectNotFoundError."""
+        sha = sha.lower()
+        if self._loose.copy_to(other._loose, sha):
+            return
+        raw = self._raw_load(sha)
+        nul = raw.index(b"\0")
+        obj_type = raw[: raw.index(b" ", 0, nul)].decode()
+        other.store_buffer(obj_type, memoryview(raw)[nul + 1 :])
+
     def store(self, obj: GitObject) -> str:
         """Write object to loose ODB; return full 40-char hash. (Pack writing is Phase 2.)"""
         return self._loose.store(obj)
 
+    def store_buffer(self, obj_type: str, data: bytes) -> str:
+        """Write object from a buffer (bytes or mmap) to loose ODB without building a GitObject; return hash."""
+        return self._loose.store_buffer(obj_type, data)
+
     def load(self, sha: str) -> GitObject:
         """Load object by full 40-char hash. From loose or pack. Raises ObjectNotFoundError."""
         raw = self._raw_load(sha)
@@ -112,7 +194,10 @@ class ObjectStore:
     def is_in_any_pack(self, sha: str) -> bool:
         """Return True if object exists in any pack index (for prune)."""
         sha = sha.lower()
-        if len(sha) != SHA1_HEX_LEN:
+        if len(sha) != SHA1_HEX_LEN or not all(c in "0123456789abcdef" for c in sha):
+            return False
+        self._count_pack_queries(1)
+        if not self._maybe_packed(sha):
             return False
         for _pack_path, idx in self._packs:
             if idx.lookup(sha) is not None:
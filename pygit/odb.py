@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
 from .constants import MIN_PREFIX_LEN, SHA1_HEX_LEN
 from .errors import AmbiguousRefError, ObjectNotFoundError
-from .objects import GitObject
-from .util import write_bytes
+from .objects import GitObject, compress_buffer, hash_buffer
+from .util import write_bytes, write_chunks_atomic
 
 
 class ObjectDB:
@@ -27,6 +28,43 @@ class ObjectDB:
         """Return True if object exists (sha must be full 40-char)."""
         return self._object_path(sha).exists()
 
+    def existing(self, shas: Iterable[str]) -> Set[str]:
+        """Return the subset of full 40-char shas stored loose, listing each fan-out dir once."""
+        by_prefix: Dict[str, List[str]] = {}
+        for sha in shas:
+            by_prefix.setdefault(sha[:2], []).append(sha)
+        found: Set[str] = set()
+        for prefix, group in by_prefix.items():
+            try:
+                names = set(os.listdir(self.objects_dir / prefix))
+            except OSError:
+                continue
+            found.update(sha for sha in group if sha[2:] in names)
+        return found
+
+    def copy_to(self, other: "ObjectDB", sha: str) -> bool:
+        """Copy loose object file verbatim into other (hard link when possible). False if sha is not loose here."""
+        src = self._object_path(sha)
+        dst = other._object_path(sha)
+        if dst.exists():
+            return src.exists()
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(src, dst)
+            return True
+        except FileNotFoundError:
+            return False
+        except FileExistsError:
+            return True
+        except OSError:
+            pass
+        try:
+            data = src.read_bytes()
+        except FileNotFoundError:
+            return False
+        write_bytes(dst, data)
+        return True
+
     def store(self, obj: GitObject) -> str:
         """Write object to ODB; return full 40-char hash."""
         sha = obj.hash_id()
@@ -37,6 +75,15 @@ class ObjectDB:
         write_bytes(path, obj.serialize())
         return sha
 
+    def store_buffer(self, obj_type: str, data: bytes) -> str:
+        """Write object from a buffer (bytes or mmap), hashing and compressing it in chunks; return hash."""
+        sha = hash_buffer(obj_type, data)
+        path = self._object_path(sha)
+        if path.exists():
+            return sha
+        write_chunks_atomic(path, compress_buffer(obj_type, data))
+        return sha
+
     def load(self, sha: str) -> GitObject:
         """Load object by full 40-char hash. Raises ObjectNotFoundError."""
         path = self._object_path(sha)
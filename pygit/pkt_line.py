@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import struct
+from functools import lru_cache
 from typing import Iterator, List, Optional
 
 # Max payload 65520; total line max 65524
@@ -10,17 +11,27 @@ PKT_MAX_PAYLOAD = 65520
 PKT_FLUSH = b"0000"
 
 
+@lru_cache(maxsize=256)
+def _pkt_header(n: int) -> bytes:
+    """4-hex-digit length header; want/have lines all share one length, so this is almost always a cache hit."""
+    return f"{n:04x}".encode()
+
+
 def pkt_encode(data: bytes) -> bytes:
     """Encode one pkt-line. data should not include trailing LF unless desired. Returns length(4 hex) + data."""
     n = 4 + len(data)
     if n > 65524:
         raise ValueError("pkt-line too long")
-    return f"{n:04x}".encode() + data
+    return _pkt_header(n) + data
 
 
 def pkt_encode_line(line: str) -> bytes:
     """Encode a text line (adds LF)."""
-    return pkt_encode(line.encode("utf-8") + b"\n")
+    data = line.encode("utf-8")
+    n = 5 + len(data)
+    if n > 65524:
+        raise ValueError("pkt-line too long")
+    return b"".join((_pkt_header(n), data, b"\n"))
 
 
 def pkt_flush() -> bytes:
@@ -5,12 +5,12 @@ from __future__ import annotations
 import sys
 from collections import deque
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, TextIO
 
 from .constants import OBJ_BLOB, OBJ_COMMIT, OBJ_TAG, OBJ_TREE, REF_HEADS_PREFIX, REF_TAGS_PREFIX
 from .errors import AmbiguousRefError, InvalidRefError, ObjectNotFoundError
 from .graph import get_commit_parents
-from .objects import Blob, Commit, GitObject, Tag, Tree
+from .objects import Commit, GitObject, Tag, Tree
 from .refs import (
     head_commit,
     list_branches,
@@ -21,7 +21,7 @@ from .refs import (
 )
 from .repo import Repository
 from .reflog import ZEROS, append_reflog
-from .util import read_bytes, timestamp_with_tz
+from .util import timestamp_with_tz
 
 
 def _peel_to_non_tag(repo: Repository, sha: str) -> str:
@@ -126,11 +126,9 @@ def hash_object(repo: Repository, path: str, write: bool) -> str:
     p = repo.safe_path(path)
     if not p.is_file():
         raise FileNotFoundError(f"path {path} is not a file")
-    content = read_bytes(p)
-    blob = Blob(content)
     if write:
-        return repo.store_object(blob)
-    return blob.hash_id()
+        return repo.store_file_blob(p)
+    return repo.hash_file_blob(p)
 
 
 def cat_file_type(repo: Repository, obj_ref: str) -> str:
@@ -141,34 +139,40 @@ def cat_file_type(repo: Repository, obj_ref: str) -> str:
     return obj.type
 
 
-def cat_file_pretty(repo: Repository, obj_ref: str) -> None:
-    """Pretty-print object: commit (headers + message), tree (mode sha name), blob (raw)."""
+def cat_file_pretty(repo: Repository, obj_ref: str, out: Optional[TextIO] = None) -> None:
+    """Pretty-print object: commit (headers + message), tree (mode sha name), blob (raw). Writes to out (default sys.stdout)."""
     repo.require_repo()
+    if out is None:
+        out = sys.stdout
     sha = rev_parse(repo, obj_ref)
     obj = repo.load_object(sha)
     if obj.type == OBJ_COMMIT:
         commit = Commit.from_content(obj.content)
-        print(f"tree {commit.tree_hash}")
+        print(f"tree {commit.tree_hash}", file=out)
         for p in commit.parent_hashes:
-            print(f"parent {p}")
-        print(f"author {commit.author} {commit._timestamp} {commit._tz_offset}")
-        print(f"committer {commit.committer} {commit._timestamp} {commit._tz_offset}")
-        print()
-        print(commit.message, end="" if commit.message.endswith("\n") else "\n")
+            print(f"parent {p}", file=out)
+        print(f"author {commit.author} {commit._timestamp} {commit._tz_offset}", file=out)
+        print(f"committer {commit.committer} {commit._timestamp} {commit._tz_offset}", file=out)
+        print(file=out)
+        print(commit.message, end="" if commit.message.endswith("\n") else "\n", file=out)
     elif obj.type == OBJ_TREE:
         tree = Tree.from_content(obj.content)
         for mode, name, ent_sha in tree.entries:
-            print(f"{mode} {ent_sha} {name}")
+            print(f"{mode} {ent_sha} {name}", file=out)
     elif obj.type == OBJ_TAG:
         tag = Tag.from_content(obj.content)
-        print(f"object {tag.object_hash}")
-        print(f"type {tag.object_type}")
-        print(f"tag {tag.tag_name}")
-        print(f"tagger {tag.tagger} {tag._timestamp} {tag._tz_offset}")
-        print()
-        print(tag.message, end="" if tag.message.endswith("\n") else "\n")
+        print(f"object {tag.object_hash}", file=out)
+        print(f"type {tag.object_type}", file=out)
+        print(f"tag {tag.tag_name}", file=out)
+        print(f"tagger {tag.tagger} {tag._timestamp} {tag._tz_offset}", file=out)
+        print(file=out)
+        print(tag.message, end="" if tag.message.endswith("\n") else "\n", file=out)
     else:
-        sys.stdout.buffer.write(obj.content)
+        buf = getattr(out, "buffer", None)
+        if buf is not None:
+            buf.write(obj.content)
+        else:
+            out.write(obj.content.decode("utf-8", errors="replace"))
 
 
 def _ls_tree_rec(
@@ -344,12 +348,15 @@ def rev_list(
     max_count: Optional[int] = None,
     parents: bool = False,
     all_refs: bool = False,
+    out: Optional[TextIO] = None,
 ) -> None:
     """List commit hashes reachable from rev (or from all refs/heads when --all).
     Traversal: all parents (not first-parent only), DFS with parents in reverse order for determinism.
-    Output: one hash per line; with --parents: 'hash parent1 parent2 ...' per line.
+    Output: one hash per line to out (default sys.stdout); with --parents: 'hash parent1 parent2 ...' per line.
     """
     repo.require_repo()
+    if out is None:
+        out = sys.stdout
     tips: List[str] = []
     if all_refs:
         for name in sorted(list_branches(repo.git_dir)):
@@ -388,9 +395,9 @@ def rev_list(
                     stack.append(p)
             if parents:
                 line = f"{h} " + " ".join(par) if par else h
-                print(line)
+                print(line, file=out)
             else:
-                print(h)
+                print(h, file=out)
             count += 1
             if max_count is not None and count >= max_count:
                 return
@@ -3,10 +3,23 @@
 from __future__ import annotations
 
 import difflib
+import json
+import os
+import stat
+import sys
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, TextIO, TypeVar
+
+try:
+    from cdifflib import CSequenceMatcher as _SequenceMatcher
+except ImportError:  # optional: pip install pygit[diff]
+    _SequenceMatcher = difflib.SequenceMatcher
+
+
+_V = TypeVar("_V")
 
 
 @dataclass
@@ -18,10 +31,10 @@ class MergeResult:
     updated_paths: List[str]
     deleted_paths: List[str]
 
-from .constants import DEFAULT_BRANCH, MODE_DIR, MODE_FILE, MODE_FILE_EXECUTABLE, OBJ_COMMIT, REF_HEADS_PREFIX, REF_TAGS_PREFIX
+from .constants import DEFAULT_BRANCH, MODE_DIR, MODE_FILE, MODE_FILE_EXECUTABLE, OBJ_BLOB, OBJ_COMMIT, REF_HEADS_PREFIX, REF_TAGS_PREFIX
 from .errors import InvalidConfigKeyError, InvalidRefError, NotARepositoryError, PygitError
 from .index import index_entry_for_file, index_entries_unchanged, load_index, save_index
-from .objects import Blob, Commit, Tag, Tree
+from .objects import Blob, Commit, Tag, Tree, hash_buffer
 from .plumbing import merge_base, rev_parse
 from .refs import (
     current_branch_name,
@@ -46,7 +59,15 @@ from .repo import (
     read_blob_from_tree,
     tree_hash_for_commit,
 )
-from .util import is_binary, is_executable, read_bytes, read_text_safe, write_bytes_atomic, write_text_atomic
+from .util import (
+    is_binary,
+    is_executable,
+    map_file,
+    read_text_safe,
+    write_bytes_atomic,
+    write_file_direct,
+    write_text_atomic,
+)
 
 
 def add_path(repo: Repository, path: str, force: bool = False) -> None:
@@ -72,9 +93,7 @@ def add_path(repo: Repository, path: str, force: bool = False) -> None:
 
 def _add_file(repo: Repository, path: str) -> None:
     full = repo.path / path
-    content = read_bytes(full)
-    blob = Blob(content)
-    sha = repo.store_object(blob)
+    sha = repo.store_file_blob(full)
     entries = repo.load_index()
     entries[path] = index_entry_for_file(full, sha)
     repo.save_index(entries)
@@ -89,16 +108,37 @@ def _add_directory(
     full = repo.path / path
     entries = repo.load_index()
     count = 0
-    for f in full.rglob("*"):
-        if f.is_file() and ".git" not in f.parts:
-            rel = str(f.relative_to(repo.path)).replace("\\", "/")
-            if not force and ign.is_ignored(rel, is_dir=False):
-                continue
-            content = f.read_bytes()
-            blob = Blob(content)
-            sha = repo.store_object(blob)
-            entries[rel] = index_entry_for_file(f, sha)
-            count += 1
+    start = str(full.relative_to(repo.path)).replace("\\", "/")
+    if ".git" in start.split("/"):
+        return 0
+    # scandir walk: file types come from the listing and each file is stat'ed once, for its index entry
+    stack = [(str(full), "" if start == "." else start + "/")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            it = os.scandir(dir_path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name == ".git":
+                    continue
+                rel = rel_dir + entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel + "/"))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if not force and ign.is_ignored(rel, is_dir=False):
+                    continue
+                f = Path(entry.path)
+                sha = repo.store_file_blob(f)
+                entries[rel] = index_entry_for_file(f, sha, st)
+                count += 1
     repo.save_index(entries)
     return count
 
@@ -191,40 +231,35 @@ def status(repo: Repository) -> None:
             if ign.is_ignored(rel, is_dir=False):
                 continue
             try:
-                blob = Blob(f.read_bytes())
-                working[rel] = blob.hash_id()
+                working[rel] = repo.hash_file_blob(f)
             except Exception:
                 pass
 
-    staged_new = []
-    staged_modified = []
-    for path in set(index) | set(head_index):
-        ent = index.get(path)
-        idx_sha = ent.get("sha1", "") if isinstance(ent, dict) else (ent or "")
-        head_sha = head_index.get(path, "")
+    # One pass over the index (staged/unstaged/deleted) and one over the working tree
+    # (untracked). Paths only in HEAD have no index sha, so they never count as staged.
+    staged_new: List[str] = []
+    staged_modified: List[str] = []
+    unstaged: List[str] = []
+    untracked: List[str] = []
+    deleted: List[str] = []
+    head_get = head_index.get
+    work_get = working.get
+    for path, ent in index.items():
+        idx_sha = ent.get("sha1", "") if isinstance(ent, dict) else str(ent or "")
+        head_sha = head_get(path, "")
         if idx_sha and not head_sha:
             staged_new.append(path)
         elif idx_sha and head_sha and idx_sha != head_sha:
             staged_modified.append(path)
-
-    unstaged = []
-    for path in working:
-        if path in index:
-            ent = index[path]
-            sha = ent.get("sha1", "") if isinstance(ent, dict) else str(ent)
-            if working[path] != sha:
-                unstaged.append(path)
-
-    untracked = []
+        work_sha = work_get(path)
+        if work_sha is None:
+            deleted.append(path)
+        elif work_sha != idx_sha:
+            unstaged.append(path)
     for path in working:
         if path not in index and path not in head_index:
             untracked.append(path)
 
-    deleted = []
-    for path in index:
-        if path not in working:
-            deleted.append(path)
-
     if staged_new or staged_modified:
         print("\nChanges to be committed:")
         for p in sorted(staged_new):
@@ -276,8 +311,7 @@ def is_dirty(repo: Repository) -> bool:
             if ign.is_ignored(rel, is_dir=False):
                 continue
             try:
-                blob = Blob(f.read_bytes())
-                working[rel] = blob.hash_id()
+                working[rel] = repo.hash_file_blob(f)
             except Exception:
                 pass
     for path in set(index) | set(head_index):
@@ -414,18 +448,22 @@ def log(
     max_count: int = 10,
     oneline: bool = False,
     graph: bool = False,
+    out: Optional[TextIO] = None,
 ) -> None:
     """Show commit log from rev (default HEAD). First-parent only. -n limits count.
     --oneline: short hash (7) + first line of message.
     --graph: prefix '*' for normal commits, '*   ' for merge commits (2+ parents).
+    Writes to out (default sys.stdout).
     """
     repo.require_repo()
+    if out is None:
+        out = sys.stdout
     if rev is not None:
         h = rev_parse(repo, rev, peel=True)
     else:
         h = head_commit(repo.git_dir)
     if not h:
-        print("No commits yet!")
+        print("No commits yet!", file=out)
         return
     n = 0
     while h and n < max_count:
@@ -437,14 +475,14 @@ def log(
         if oneline:
             short = h[:7]
             first_line = commit.message.split("\n")[0].strip()
-            print(f"{prefix}{short} {first_line}")
+            print(f"{prefix}{short} {first_line}", file=out)
         else:
-            print(f"{prefix}commit {h}")
-            print(f"Author: {commit.author}")
-            print(f"Date:   {time.strftime('%a %b %d %H:%M:%S %Y', time.localtime(commit._timestamp))} {commit._tz_offset}")
-            print()
-            print(f"    {commit.message.strip()}")
-            print()
+            print(f"{prefix}commit {h}", file=out)
+            print(f"Author: {commit.author}", file=out)
+            print(f"Date:   {time.strftime('%a %b %d %H:%M:%S %Y', time.localtime(commit._timestamp))} {commit._tz_offset}", file=out)
+            print(file=out)
+            print(f"    {commit.message.strip()}", file=out)
+            print(file=out)
         h = commit.parent_hashes[0] if commit.parent_hashes else None
         n += 1
 
@@ -509,9 +547,12 @@ def reset_hard(repo: Repository, commit_ish: str) -> None:
 
 
 def _merge_file_content(
-    base: Optional[bytes], ours: Optional[bytes], theirs: Optional[bytes]
-) -> tuple[Optional[bytes], bool]:
-    """Compute merged content for one file. Returns (content or None for delete, conflict)."""
+    base: Optional[_V], ours: Optional[_V], theirs: Optional[_V]
+) -> tuple[Optional[_V], bool]:
+    """Compute merged content for one file. Returns (content or None for delete, conflict).
+
+    Only equality is used, so blob hashes can stand in for contents.
+    """
     if ours == theirs:
         return (ours, False)
     if base == ours and base != theirs:
@@ -562,6 +603,34 @@ def _apply_merge_result(
     repo.save_index(entries)
 
 
+def merge_trees_in_memory(
+    base: Dict[str, tuple[str, str]],
+    ours: Dict[str, tuple[str, str]],
+    theirs: Dict[str, tuple[str, str]],
+) -> Optional[Dict[str, tuple[str, str]]]:
+    """3-way merge of flat trees (path -> (mode, blob sha)) by blob hash, per-path rules as in three_way_apply.
+    Blob hash and mode are merged separately, so a mode-only change on either side is kept.
+
+    Returns the merged flat tree, or None if any path conflicts. Nothing is read from or written to disk.
+    """
+    result = dict(ours)
+    for path in base.keys() | theirs.keys():
+        b, o, t = base.get(path), ours.get(path), theirs.get(path)
+        if o == t or t == b:
+            continue
+        sha, conflict = _merge_file_content(b[1] if b else None, o[1] if o else None, t[1] if t else None)
+        if conflict:
+            return None
+        if sha is None:
+            result.pop(path, None)
+            continue
+        mode, conflict = _merge_file_content(b[0] if b else None, o[0] if o else None, t[0] if t else None)
+        if conflict or mode is None:
+            return None
+        result[path] = (mode, sha)
+    return result
+
+
 def three_way_apply(
     repo: Repository,
     base_tree: Optional[str],
@@ -574,15 +643,16 @@ def three_way_apply(
     update_index: bool = True,
 ) -> MergeResult:
     """Apply 3-way merge (base, ours, theirs) per path. Returns conflicts and path lists."""
+    tree_cache: Dict[str, Tree] = {}  # the three sides usually share most subtrees
     paths_base: Set[str] = set()
     if base_tree:
-        paths_base = list_tree_paths(repo, base_tree)
+        paths_base = list_tree_paths(repo, base_tree, tree_cache)
     paths_ours: Set[str] = set()
     if ours_tree:
-        paths_ours = list_tree_paths(repo, ours_tree)
+        paths_ours = list_tree_paths(repo, ours_tree, tree_cache)
     paths_theirs: Set[str] = set()
     if theirs_tree:
-        paths_theirs = list_tree_paths(repo, theirs_tree)
+        paths_theirs = list_tree_paths(repo, theirs_tree, tree_cache)
     all_paths = paths_base | paths_ours | paths_theirs
 
     def get_base(p: str) -> Optional[bytes]:
@@ -833,75 +903,158 @@ def diff_repo(repo: Repository, staged: bool) -> None:
             pass
 
     if staged:
-        # index vs HEAD
-        for path in sorted(set(index) | set(head_tree)):
-            idx_ent = index.get(path)
-            idx_sha = idx_ent.get("sha1", "") if isinstance(idx_ent, dict) else (idx_ent or "")
-            head_sha = head_tree.get(path, "")
-            if idx_sha == head_sha:
-                continue
-            if not head_sha:
-                try:
-                    blob = repo.load_object(idx_sha)
-                    _print_diff(path, b"", blob.content, "added")
-                except Exception:
-                    pass
-            elif not idx_sha:
-                try:
-                    blob = repo.load_object(head_sha)
-                    _print_diff(path, blob.content, b"", "deleted")
-                except Exception:
-                    pass
-            else:
-                try:
-                    a = repo.load_object(head_sha).content
-                    b = repo.load_object(idx_sha).content
-                    _print_diff(path, a, b, "modified")
-                except Exception:
-                    pass
+        # index vs HEAD: normalize index entries to path -> sha once, then compare as two flat trees
+        norm_index = {p: (e.get("sha1", "") if isinstance(e, dict) else (e or "")) for p, e in index.items()}
+        diff_trees(repo, head_tree, norm_index)
     else:
-        # working vs index
-        for path in sorted(index.keys()):
-            full = repo.path / path
-            idx_ent = index[path]
-            idx_sha = idx_ent.get("sha1", "") if isinstance(idx_ent, dict) else idx_ent
-            if not full.exists():
-                try:
-                    blob = repo.load_object(idx_sha)
-                    _print_diff(path, blob.content, b"", "deleted")
-                except Exception:
-                    pass
-                continue
-            if full.is_file():
-                try:
-                    disk = full.read_bytes()
-                    blob = Blob(disk)
-                    if blob.hash_id() == idx_sha:
-                        continue
-                    idx_blob = repo.load_object(idx_sha)
-                    _print_diff(path, idx_blob.content, disk, "modified")
-                except Exception:
-                    pass
+        load_blob = _blob_content_loader(repo)
+        # working vs index: files are stat'ed (and read if needed) on a thread pool, printed in path order
+        for path, kind, idx_sha, disk in _scan_worktree_changes(repo, index):
+            try:
+                if kind == "deleted":
+                    _print_diff(path, load_blob(idx_sha), b"", "deleted")
+                else:
+                    _print_diff(path, load_blob(idx_sha), disk, "modified")
+            except Exception:
+                pass
+
+
+# Upper bound on threads used to stat/read working-tree files for diff
+DIFF_SCAN_WORKERS = 8
+
+
+def _scan_worktree_changes(repo: Repository, index: Dict[str, Dict]) -> List[tuple[str, str, str, bytes]]:
+    """Return (path, "modified"|"deleted", index_sha, disk_content) for changed index entries, sorted by path.
+
+    One stat per entry; stat-clean files are not read and files whose size changed are not hashed.
+    Entries whose mtime is not older than the index file are "racily clean" and always re-hashed.
+    """
+    root = os.path.join(os.fspath(repo.path), "")
+    trust_stat = os.environ.get("PYGIT_PARANOID") != "1"
+    try:
+        index_mtime = os.stat(repo.index_file).st_mtime_ns
+    except OSError:
+        index_mtime = 0
+
+    def scan(path: str) -> Optional[tuple[str, str, str, bytes]]:
+        idx_ent = index[path]
+        if isinstance(idx_ent, dict):
+            idx_sha = idx_ent.get("sha1", "")
+            idx_size = idx_ent.get("size", 0)
+            idx_mtime = idx_ent.get("mtime_ns", 0)
+        else:
+            idx_sha, idx_size, idx_mtime = idx_ent, None, 0
+        full = root + path
+        try:
+            st = os.stat(full)
+        except OSError:
+            return (path, "deleted", idx_sha, b"")
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        if (
+            trust_stat
+            and idx_mtime
+            and idx_mtime < index_mtime
+            and st.st_size == idx_size
+            and st.st_mtime_ns == idx_mtime
+        ):
+            return None
+        try:
+            with map_file(full) as data:
+                if st.st_size == idx_size and hash_buffer(OBJ_BLOB, data) == idx_sha:
+                    return None
+                return (path, "modified", idx_sha, bytes(data))
+        except OSError:
+            return None
+
+    paths = sorted(index.keys())
+    workers = min(DIFF_SCAN_WORKERS, os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [r for r in map(scan, paths) if r is not None]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [r for r in pool.map(scan, paths) if r is not None]
+
+
+# Blobs larger than this are not kept in the per-diff content cache
+DIFF_CACHE_MAX_BLOB_SIZE = 256 * 1024
+
+
+def _blob_content_loader(repo: Repository) -> Callable[[str], bytes]:
+    """Return sha -> blob content loader that caches small blobs for the lifetime of one diff."""
+    cache: Dict[str, bytes] = {}
+
+    def load(sha: str) -> bytes:
+        content = cache.get(sha)
+        if content is None:
+            content = repo.load_object(sha).content
+            if len(content) <= DIFF_CACHE_MAX_BLOB_SIZE:
+                cache[sha] = content
+        return content
+
+    return load
 
 
 def _print_diff(path: str, old: bytes, new: bytes, kind: str) -> None:
-    if is_binary(old) or is_binary(new):
-        print(f"Binary files {path} differ")
+    if old == new:
         return
-    try:
-        a = old.decode("utf-8", errors="replace").splitlines(keepends=True)
-        b = new.decode("utf-8", errors="replace").splitlines(keepends=True)
-    except Exception:
+    if is_binary(old) or is_binary(new):
         print(f"Binary files {path} differ")
         return
-    print(f"diff --git a/{path} b/{path}")
+    # Diff raw byte lines; only emitted lines are decoded (in _unified_diff)
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    # Assemble the whole file diff and write it once (same text as one print() per line)
+    out = [f"diff --git a/{path} b/{path}"]
     if kind == "added":
-        print("new file")
+        out.append("new file")
     elif kind == "deleted":
-        print("deleted file")
-    for line in difflib.unified_diff(a, b, fromfile=f"a/{path}", tofile=f"b/{path}", lineterm=""):
-        print(line)
-    print()
+        out.append("deleted file")
+    out.extend(_unified_diff(a, b, f"a/{path}", f"b/{path}"))
+    out.append("\n")
+    sys.stdout.write("\n".join(out))
+
+
+def _format_range_unified(start: int, stop: int) -> str:
+    """Hunk range 'start,length' as in difflib (1-based; length 1 omitted; empty range starts one earlier)."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _line_text(line: str | bytes) -> str:
+    return line if isinstance(line, str) else line.decode("utf-8", errors="replace")
+
+
+def _unified_diff(
+    a: Sequence[str | bytes], b: Sequence[str | bytes], fromfile: str, tofile: str, n: int = 3
+) -> Iterator[str]:
+    """Same output as difflib.unified_diff(..., lineterm=''), using the C matcher when cdifflib is installed.
+
+    Lines may be str or bytes; bytes lines are decoded (UTF-8, replace) only when emitted.
+    """
+    started = False
+    for group in _SequenceMatcher(None, a, b).get_grouped_opcodes(n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}"
+            yield f"+++ {tofile}"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range_unified(first[1], last[2])} +{_format_range_unified(first[3], last[4])} @@"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + _line_text(line)
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + _line_text(line)
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + _line_text(line)
 
 
 def diff_trees(
@@ -909,31 +1062,121 @@ def diff_trees(
     tree_a: dict[str, str],
     tree_b: dict[str, str],
 ) -> None:
-    """Print unified diff between two trees (path -> blob sha)."""
-    for path in sorted(set(tree_a) | set(tree_b)):
+    """Print unified diff between two trees (path -> blob sha). Blobs are loaded concurrently, printed in path order."""
+    changes: List[tuple[str, str, str]] = []
+    for path in _merge_sorted_unique(sorted(tree_a), sorted(tree_b)):
         sha_a = tree_a.get(path, "")
         sha_b = tree_b.get(path, "")
+        if sha_a != sha_b:
+            changes.append((path, sha_a, sha_b))
+    _print_tree_changes(repo, changes)
+
+
+def _merge_sorted_unique(a: List[str], b: List[str]) -> Iterator[str]:
+    """Yield the union of two sorted lists in order, each value once (a linear merge, no set or re-sort)."""
+    i = j = 0
+    len_a, len_b = len(a), len(b)
+    while i < len_a and j < len_b:
+        x, y = a[i], b[j]
+        if x < y:
+            yield x
+            i += 1
+        elif y < x:
+            yield y
+            j += 1
+        else:
+            yield x
+            i += 1
+            j += 1
+    yield from a[i:]
+    yield from b[j:]
+
+
+def diff_trees_incremental(repo: Repository, tree_a_sha: Optional[str], tree_b_sha: Optional[str]) -> None:
+    """Print unified diff between two tree objects, walking them in tandem and skipping identical subtrees."""
+    changes: List[tuple[str, str, str]] = []
+    _changed_tree_entries(repo, tree_a_sha, tree_b_sha, "", changes)
+    changes.sort()
+    _print_tree_changes(repo, changes)
+
+
+def _is_tree_mode(mode: str) -> bool:
+    return mode.startswith("04") or mode == "40000"
+
+
+def _tree_entry_map(repo: Repository, tree_sha: Optional[str]) -> Dict[str, tuple[str, str]]:
+    """name -> (mode, sha) for one tree object; empty if tree_sha is None or cannot be loaded."""
+    if not tree_sha:
+        return {}
+    try:
+        tree = Tree.from_content(repo.load_object(tree_sha).content)
+    except Exception:
+        return {}
+    return {name: (mode, sha) for mode, name, sha in tree.entries}
+
+
+def _changed_tree_entries(
+    repo: Repository,
+    tree_a_sha: Optional[str],
+    tree_b_sha: Optional[str],
+    prefix: str,
+    out: List[tuple[str, str, str]],
+) -> None:
+    """Append (path, blob_sha_a, blob_sha_b) for blobs that differ between two trees; "" marks a missing side."""
+    if tree_a_sha == tree_b_sha:
+        return
+    entries_a = _tree_entry_map(repo, tree_a_sha)
+    entries_b = _tree_entry_map(repo, tree_b_sha)
+    for name in set(entries_a) | set(entries_b):
+        mode_a, sha_a = entries_a.get(name, ("", ""))
+        mode_b, sha_b = entries_b.get(name, ("", ""))
         if sha_a == sha_b:
             continue
-        if not sha_a:
-            try:
-                blob = repo.load_object(sha_b)
-                _print_diff(path, b"", blob.content, "added")
-            except Exception:
-                pass
-        elif not sha_b:
-            try:
-                blob = repo.load_object(sha_a)
-                _print_diff(path, blob.content, b"", "deleted")
-            except Exception:
-                pass
-        else:
-            try:
-                a = repo.load_object(sha_a).content
-                b = repo.load_object(sha_b).content
-                _print_diff(path, a, b, "modified")
-            except Exception:
-                pass
+        path = f"{prefix}{name}"
+        dir_a = bool(sha_a) and _is_tree_mode(mode_a)
+        dir_b = bool(sha_b) and _is_tree_mode(mode_b)
+        if dir_a or dir_b:
+            _changed_tree_entries(repo, sha_a if dir_a else None, sha_b if dir_b else None, f"{path}/", out)
+        blob_a = sha_a if sha_a and not dir_a else ""
+        blob_b = sha_b if sha_b and not dir_b else ""
+        if blob_a or blob_b:
+            out.append((path, blob_a, blob_b))
+
+
+def _print_tree_changes(repo: Repository, changes: List[tuple[str, str, str]]) -> None:
+    """Print diffs for (path, sha_a, sha_b) changes in the given order; blobs are loaded concurrently first."""
+    contents = _prefetch_blobs(repo, {sha for _, sha_a, sha_b in changes for sha in (sha_a, sha_b) if sha})
+    for path, sha_a, sha_b in changes:
+        old = contents.get(sha_a) if sha_a else b""
+        new = contents.get(sha_b) if sha_b else b""
+        if old is None or new is None:
+            continue  # missing object: skip path, as for any load failure
+        kind = "added" if not sha_a else "deleted" if not sha_b else "modified"
+        try:
+            _print_diff(path, old, new, kind)
+        except Exception:
+            pass
+
+
+# Upper bound on threads used to inflate blobs for a tree diff
+DIFF_PREFETCH_WORKERS = 8
+
+
+def _prefetch_blobs(repo: Repository, shas: Set[str]) -> Dict[str, Optional[bytes]]:
+    """Load blob contents for shas concurrently; sha -> content, or None if the object cannot be loaded."""
+
+    def load(sha: str) -> Optional[bytes]:
+        try:
+            return repo.load_object(sha).content
+        except Exception:
+            return None
+
+    ordered = sorted(shas)
+    workers = min(DIFF_PREFETCH_WORKERS, os.cpu_count() or 1, len(ordered))
+    if workers <= 1:
+        return {sha: load(sha) for sha in ordered}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(ordered, pool.map(load, ordered)))
 
 
 def show_commit(repo: Repository, commit_ish: str) -> None:
@@ -950,14 +1193,10 @@ def show_commit(repo: Repository, commit_ish: str) -> None:
     print()
     print(commit.message.strip())
     print()
-    tree_commit = repo.build_index_from_tree(commit.tree_hash)
+    parent_tree = None
     if commit.parent_hashes:
-        parent_tree = repo.build_index_from_tree(
-            Commit.from_content(repo.load_object(commit.parent_hashes[0]).content).tree_hash
-        )
-    else:
-        parent_tree = {}
-    diff_trees(repo, parent_tree, tree_commit)
+        parent_tree = Commit.from_content(repo.load_object(commit.parent_hashes[0]).content).tree_hash
+    diff_trees_incremental(repo, parent_tree, commit.tree_hash)
 
 
 def restore(
@@ -990,6 +1229,7 @@ def restore(
                 index.pop(path, None)
         repo.save_index(index)
         return
+    made: Set[Path] = set()
     for path in paths:
         p = repo.safe_path(path)
         if p.is_dir():
@@ -1004,8 +1244,10 @@ def restore(
             continue
         try:
             blob = repo.load_object(sha)
-            p.parent.mkdir(parents=True, exist_ok=True)
-            p.write_bytes(blob.content)
+            if p.parent not in made:
+                p.parent.mkdir(parents=True, exist_ok=True)
+                made.add(p.parent)
+            write_file_direct(p, blob.content)
         except Exception:
             pass
 
@@ -1123,29 +1365,37 @@ def reflog_show(repo: Repository, ref: Optional[str] = None, max_count: int = 10
         print(f"{short} {display_ref}@{{{idx}}}: {msg}")
 
 
-# Cherry-pick state under .git/pygit/
+# Cherry-pick state under .git/pygit/: one JSON file {"pick", "orig", "msg", "conflicts"}
 PYGIT_STATE_DIR = "pygit"
+CHERRY_PICK_STATE = "CHERRY_PICK_STATE.json"
+# Legacy one-file-per-field state (read for compatibility, removed on clear)
 CHERRY_PICK_HEAD = "CHERRY_PICK_HEAD"
 CHERRY_PICK_ORIG_HEAD = "CHERRY_PICK_ORIG_HEAD"
 CHERRY_PICK_MSG = "CHERRY_PICK_MSG"
 CHERRY_PICK_CONFLICTS = "CHERRY_PICK_CONFLICTS"
 
 
-def _cherry_pick_state_dir(repo: Repository) -> Path:
-    """Path to .git/pygit/ state directory."""
-    d = repo.git_dir / PYGIT_STATE_DIR
-    d.mkdir(parents=True, exist_ok=True)
-    return d
-
-
 def _cherry_pick_in_progress(repo: Repository) -> bool:
-    """True if CHERRY_PICK_HEAD exists."""
-    return (repo.git_dir / PYGIT_STATE_DIR / CHERRY_PICK_HEAD).exists()
+    """True if cherry-pick state (JSON or legacy CHERRY_PICK_HEAD) exists."""
+    d = repo.git_dir / PYGIT_STATE_DIR
+    return (d / CHERRY_PICK_STATE).exists() or (d / CHERRY_PICK_HEAD).exists()
 
 
 def _cherry_pick_read_state(repo: Repository) -> Optional[tuple[str, str, str, List[str]]]:
     """Read (pick_hash, orig_head, message, conflicts). None if no cherry-pick in progress."""
     d = repo.git_dir / PYGIT_STATE_DIR
+    raw = read_text_safe(d / CHERRY_PICK_STATE)
+    if raw is not None:
+        try:
+            state = json.loads(raw)
+            return (
+                state.get("pick", ""),
+                state.get("orig") or ZEROS,
+                state.get("msg", ""),
+                list(state.get("conflicts", [])),
+            )
+        except (json.JSONDecodeError, AttributeError):
+            pass
     head_f = d / CHERRY_PICK_HEAD
     if not head_f.exists():
         return None
@@ -1168,25 +1418,50 @@ def _cherry_pick_write_state(
     message: str,
     conflicts: Optional[List[str]] = None,
 ) -> None:
-    """Write cherry-pick state files atomically."""
-    d = _cherry_pick_state_dir(repo)
-    write_text_atomic(d / CHERRY_PICK_HEAD, pick_hash + "\n")
-    write_text_atomic(d / CHERRY_PICK_ORIG_HEAD, orig_head + "\n")
-    write_text_atomic(d / CHERRY_PICK_MSG, message.replace("\r", "\n"))
-    if conflicts:
-        write_text_atomic(d / CHERRY_PICK_CONFLICTS, "\n".join(conflicts) + "\n")
-    else:
-        (d / CHERRY_PICK_CONFLICTS).unlink(missing_ok=True)
+    """Write cherry-pick state atomically (single file)."""
+    state = {
+        "pick": pick_hash,
+        "orig": orig_head,
+        "msg": message.replace("\r", "\n"),
+        "conflicts": list(conflicts or []),
+    }
+    write_text_atomic(repo.git_dir / PYGIT_STATE_DIR / CHERRY_PICK_STATE, json.dumps(state) + "\n")
 
 
 def _cherry_pick_clear_state(repo: Repository) -> None:
-    """Remove cherry-pick state files."""
+    """Remove cherry-pick state: the JSON file and any legacy per-field files."""
     d = repo.git_dir / PYGIT_STATE_DIR
-    for name in (CHERRY_PICK_HEAD, CHERRY_PICK_ORIG_HEAD, CHERRY_PICK_MSG, CHERRY_PICK_CONFLICTS):
+    for name in (CHERRY_PICK_STATE, CHERRY_PICK_HEAD, CHERRY_PICK_ORIG_HEAD, CHERRY_PICK_MSG, CHERRY_PICK_CONFLICTS):
         (d / name).unlink(missing_ok=True)
 
 
-def cherry_pick(repo: Repository, rev: str) -> None:
+@dataclass
+class CherryPickContext:
+    """Memo shared by a run of cherry-picks (e.g. rebase): parsed commits, commit trees, HEAD, branch and identity."""
+
+    commits: Dict[str, Commit] = field(default_factory=dict)
+    trees: Dict[str, Optional[str]] = field(default_factory=dict)
+    head: Optional[str] = None
+    _identity: Optional[tuple[Optional[str], str]] = field(default=None, repr=False)
+
+    def tree_of(self, repo: Repository, commit_hash: str) -> Optional[str]:
+        """Tree hash of commit_hash, from parsed commits or loaded once."""
+        if commit_hash not in self.trees:
+            c = self.commits.get(commit_hash)
+            self.trees[commit_hash] = (c.tree_hash or None) if c is not None else tree_hash_for_commit(repo, commit_hash)
+        return self.trees[commit_hash]
+
+    def branch_and_author(self, repo: Repository) -> tuple[Optional[str], str]:
+        """(current branch or None, author identity), read once per context."""
+        if self._identity is None:
+            self._identity = (
+                current_branch_name(repo.git_dir),
+                get_user_identity(repo) or "PyGit User <user@pygit.com>",
+            )
+        return self._identity
+
+
+def cherry_pick(repo: Repository, rev: str, ctx: Optional[CherryPickContext] = None) -> None:
     """Apply changes introduced by commit onto current HEAD. Raises PygitError on conflict."""
     repo.require_repo()
     if _cherry_pick_in_progress(repo):
@@ -1197,16 +1472,23 @@ def cherry_pick(repo: Repository, rev: str) -> None:
     if is_dirty(repo):
         raise PygitError("Cannot cherry-pick: you have local changes.")
 
-    pick_hash = rev_parse(repo, rev, peel=True)
-    obj = repo.load_object(pick_hash)
-    if obj.type != OBJ_COMMIT:
-        raise PygitError(f"Object {pick_hash[:7]} is not a commit.")
-    pick_commit = Commit.from_content(obj.content)
+    if ctx is None:
+        ctx = CherryPickContext()
+    pick_commit = ctx.commits.get(rev)
+    if pick_commit is not None:
+        pick_hash = rev
+    else:
+        pick_hash = rev_parse(repo, rev, peel=True)
+        obj = repo.load_object(pick_hash)
+        if obj.type != OBJ_COMMIT:
+            raise PygitError(f"Object {pick_hash[:7]} is not a commit.")
+        pick_commit = Commit.from_content(obj.content)
+        ctx.commits[pick_hash] = pick_commit
     parent_hash = pick_commit.parent_hashes[0] if pick_commit.parent_hashes else None
 
-    head_hash = head_commit(repo.git_dir)
-    ours_tree = tree_hash_for_commit(repo, head_hash) if head_hash else None
-    base_tree = tree_hash_for_commit(repo, parent_hash) if parent_hash else None
+    head_hash = ctx.head or head_commit(repo.git_dir)
+    ours_tree = ctx.tree_of(repo, head_hash) if head_hash else None
+    base_tree = ctx.tree_of(repo, parent_hash) if parent_hash else None
     theirs_tree = pick_commit.tree_hash or None
 
     orig_head = head_hash or ZEROS
@@ -1237,8 +1519,7 @@ def cherry_pick(repo: Repository, rev: str) -> None:
     # No conflicts: create commit and clear state
     from .util import timestamp_with_tz
     tree_hash = repo.create_tree_from_index()
-    branch = current_branch_name(repo.git_dir)
-    author = get_user_identity(repo) or "PyGit User <user@pygit.com>"
+    branch, author = ctx.branch_and_author(repo)
     ts, tz = timestamp_with_tz(None)
     c = Commit(
         tree_hash=tree_hash,
@@ -1250,6 +1531,8 @@ def cherry_pick(repo: Repository, rev: str) -> None:
         tz_offset=tz,
     )
     new_hash = repo.store_object(c)
+    ctx.head = new_hash
+    ctx.trees[new_hash] = tree_hash
     refname = f"{REF_HEADS_PREFIX}{branch}" if branch else None
     old_head = head_hash or ZEROS
     reflog_msg = f"cherry-pick: {(message.split(chr(10))[0] or '').strip()}"
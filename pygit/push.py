@@ -2,50 +2,79 @@
 
 from __future__ import annotations
 
-import zlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Set, Tuple
 
 from .constants import OBJ_BLOB, OBJ_COMMIT, OBJ_TAG, OBJ_TREE
 from .errors import PygitError
-from .objects import Commit, GitObject, Tag, Tree
+from .objects import Tag, commit_tree_and_parents, tree_child_hashes
 from .refs import resolve_ref, update_ref_verify
 from .repo import Repository
 from .transport import LocalTransport, is_local_path
 
+PUSH_UPLOAD_WORKERS = 8
 
-def _reachable_from_tips_local(repo: Repository, tips: List[str]) -> Set[str]:
-    """Return set of object SHAs reachable from tip commits (local repo)."""
-    result: Set[str] = set()
-    stack = list(tips)
+
+def _reachable_from_tips_local(
+    repo: Repository,
+    tips: List[str],
+    exclude: Optional[Set[str]] = None,
+) -> Set[str]:
+    """Return set of object SHAs reachable from tip commits (local repo).
+
+    Tree entries that are not subtrees are recorded without loading them, so blobs are never read.
+    Objects in exclude (e.g. the remote's ref tips) are neither returned nor walked past.
+    """
+    result: Set[str] = set(exclude or ())
+    stack = [t for t in dict.fromkeys(tips) if t and t not in result]
+    result.update(stack)
     while stack:
         sha = stack.pop()
-        if sha in result:
-            continue
-        result.add(sha)
         try:
             obj = repo.load_object(sha)
         except Exception:
             continue
         if obj.type == OBJ_COMMIT:
-            commit = Commit.from_content(obj.content)
-            if commit.tree_hash:
-                stack.append(commit.tree_hash)
-            for p in commit.parent_hashes:
-                if p:
-                    stack.append(p)
+            tree_hash, parents = commit_tree_and_parents(obj.content)
+            children = [tree_hash, *parents]
         elif obj.type == OBJ_TREE:
-            tree = Tree.from_content(obj.content)
-            for _mode, _name, eh in tree.entries:
-                if eh:
-                    stack.append(eh)
+            children = []
+            for is_subtree, eh in tree_child_hashes(obj.content):
+                if eh in result:
+                    continue
+                if is_subtree:
+                    children.append(eh)
+                else:
+                    result.add(eh)
         elif obj.type == OBJ_TAG:
-            tag = Tag.from_content(obj.content)
-            if tag.object_hash:
-                stack.append(tag.object_hash)
+            children = [Tag.from_content(obj.content).object_hash]
+        else:
+            continue
+        for child in children:
+            if child and child not in result:
+                result.add(child)
+                stack.append(child)
+    if exclude:
+        result.difference_update(exclude)
     return result
 
 
+def _copy_objects(repo: Repository, remote_repo: Repository, shas: List[str]) -> None:
+    """Copy objects concurrently; each write is a hard link or temp-file + rename, so workers need no lock."""
+    if not shas:
+        return
+    workers = min(PUSH_UPLOAD_WORKERS, os.cpu_count() or 1, len(shas))
+    if workers <= 1:
+        for sha in shas:
+            repo.odb.copy_to(remote_repo.odb, sha)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(lambda sha: repo.odb.copy_to(remote_repo.odb, sha), shas):
+            pass
+
+
 def push(
     repo: Repository,
     remote_name: str,
@@ -83,14 +112,12 @@ def push(
                 f"non-fast-forward: ref {dst_ref} would be updated from {current_remote} to {src_sha}; use --force"
             )
 
-    need_shas = _reachable_from_tips_local(repo, [src_sha])
     transport = LocalTransport(path)
-    for sha in need_shas:
-        if transport.has_object(sha):
-            continue
-        raw = repo.odb.get_raw(sha)
-        obj = GitObject.deserialize(zlib.compress(raw))
-        remote_repo.odb.store(obj)
+    # Objects reachable from the remote's refs are complete there (refs move only after objects are copied)
+    remote_tips = {sha for _ref, sha in transport.list_refs()}
+    need_shas = _reachable_from_tips_local(repo, [src_sha], exclude=remote_tips)
+    missing = sorted(need_shas - transport.has_objects(need_shas))
+    _copy_objects(repo, remote_repo, missing)
 
     old = None if (force or current_remote is None) else current_remote
     update_ref_verify(remote_repo.git_dir, dst_ref, src_sha, old_hash=old)
@@ -2,39 +2,63 @@
 
 from __future__ import annotations
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
+from .constants import MODE_FILE_EXECUTABLE, OBJ_COMMIT
 from .errors import PygitError
 from .graph import get_commit_parents, is_ancestor
+from .index import index_entry_for_file
+from .objects import Commit, Tree
 from .plumbing import merge_base, rev_parse
-from .porcelain import cherry_pick, cherry_pick_continue
+from .porcelain import (
+    CherryPickContext,
+    _cherry_pick_clear_state,
+    cherry_pick,
+    cherry_pick_continue,
+    merge_trees_in_memory,
+)
 from .refs import current_branch_name, head_commit, update_ref, write_head_detached, write_head_ref
 from .reflog import append_reflog
 from .repo import Repository
-from .util import read_text_safe, write_text_atomic
+from .util import read_text_safe, timestamp_with_tz, write_bytes_atomic, write_text_atomic
 
+# Rebase state under .git/pygit/: one JSON file {"orig", "upstream", "branch", "todo"}
+REBASE_STATE = "REBASE_STATE.json"
+# Legacy one-file-per-field state (read for compatibility, removed on clear)
 REBASE_ORIG_HEAD = "REBASE_ORIG_HEAD"
 REBASE_UPSTREAM = "REBASE_UPSTREAM"
 REBASE_BRANCH = "REBASE_BRANCH"
 REBASE_TODO = "REBASE_TODO"
 PYGIT_STATE_DIR = "pygit"
 ZEROS = "0" * 40
-
-
-def _rebase_state_dir(repo: Repository) -> Path:
-    d = repo.git_dir / PYGIT_STATE_DIR
-    d.mkdir(parents=True, exist_ok=True)
-    return d
+REBASE_PREFETCH_WORKERS = 8
 
 
 def _rebase_in_progress(repo: Repository) -> bool:
-    return (repo.git_dir / PYGIT_STATE_DIR / REBASE_ORIG_HEAD).exists()
+    d = repo.git_dir / PYGIT_STATE_DIR
+    return (d / REBASE_STATE).exists() or (d / REBASE_ORIG_HEAD).exists()
 
 
 def _rebase_read_state(repo: Repository) -> Optional[tuple[str, str, str, List[str]]]:
     """Return (orig_head, upstream, branch, todo_list) or None."""
     d = repo.git_dir / PYGIT_STATE_DIR
+    raw = read_text_safe(d / REBASE_STATE)
+    if raw is not None:
+        try:
+            state = json.loads(raw)
+            todo_list = [h for h in state.get("todo", []) if isinstance(h, str) and len(h) == 40]
+            return (
+                state.get("orig") or ZEROS,
+                state.get("upstream") or ZEROS,
+                state.get("branch", ""),
+                todo_list,
+            )
+        except (json.JSONDecodeError, AttributeError):
+            pass
     if not (d / REBASE_ORIG_HEAD).exists():
         return None
     orig = (read_text_safe(d / REBASE_ORIG_HEAD) or "").strip() or ZEROS
@@ -52,16 +76,14 @@ def _rebase_write_state(
     branch: str,
     todo_list: List[str],
 ) -> None:
-    d = _rebase_state_dir(repo)
-    write_text_atomic(d / REBASE_ORIG_HEAD, orig_head + "\n")
-    write_text_atomic(d / REBASE_UPSTREAM, upstream + "\n")
-    write_text_atomic(d / REBASE_BRANCH, branch + "\n")
-    write_text_atomic(d / REBASE_TODO, "\n".join(todo_list) + ("\n" if todo_list else ""))
+    state = {"orig": orig_head, "upstream": upstream, "branch": branch, "todo": list(todo_list)}
+    write_text_atomic(repo.git_dir / PYGIT_STATE_DIR / REBASE_STATE, json.dumps(state) + "\n")
 
 
 def _rebase_clear_state(repo: Repository) -> None:
     d = repo.git_dir / PYGIT_STATE_DIR
-    for name in (REBASE_ORIG_HEAD, REBASE_UPSTREAM, REBASE_BRANCH, REBASE_TODO):
+    # Both forms: a rebase stopped under the legacy layout is continued with JSON state
+    for name in (REBASE_STATE, REBASE_ORIG_HEAD, REBASE_UPSTREAM, REBASE_BRANCH, REBASE_TODO):
         (d / name).unlink(missing_ok=True)
 
 
@@ -78,8 +100,136 @@ def _commits_to_replay(repo: Repository, head_sha: str, upstream_sha: str) -> Li
     return list(reversed(collected))
 
 
+def _rebase_context(repo: Repository, todo: List[str], head: Optional[str]) -> CherryPickContext:
+    """Cherry-pick context for replaying todo onto head, with all todo commits loaded up front."""
+    ctx = CherryPickContext(head=head)
+    if not todo:
+        return ctx
+    workers = max(1, min(REBASE_PREFETCH_WORKERS, os.cpu_count() or 1, len(todo)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for sha, obj in zip(todo, pool.map(repo.load_object, todo)):
+            if obj.type == OBJ_COMMIT:
+                ctx.commits[sha] = Commit.from_content(obj.content)
+    return ctx
+
+
+def _replay_todo(
+    repo: Repository,
+    ctx: CherryPickContext,
+    todo: List[str],
+    orig_head: str,
+    upstream_sha: str,
+    branch: str,
+) -> None:
+    """Apply todo onto ctx.head: the conflict-free prefix in memory, the rest with cherry_pick.
+
+    On a conflicting pick the remaining todo is saved to rebase state and PygitError propagates.
+    """
+    done = _replay_in_memory(repo, ctx, todo)
+    for i in range(done, len(todo)):
+        try:
+            cherry_pick(repo, todo[i], ctx)
+        except PygitError:
+            _rebase_write_state(repo, orig_head, upstream_sha, branch, todo[i + 1 :])
+            raise
+
+
+def _replay_in_memory(repo: Repository, ctx: CherryPickContext, todo: List[str]) -> int:
+    """Replay the longest conflict-free prefix of todo onto ctx.head by merging trees in memory.
+
+    Only tree and commit objects are written per pick; the working tree and index are updated once,
+    from the starting tree to the final one. Returns how many commits of todo were replayed.
+    """
+    start = ctx.head
+    if not start:
+        return 0
+    start_tree = ctx.tree_of(repo, start)
+    tree_cache: Dict[str, Tree] = {}
+    try:
+        ours = repo.flat_tree_entries(start_tree, tree_cache=tree_cache) if start_tree else {}
+    except Exception:
+        return 0
+    start_flat = ours
+    _branch, author = ctx.branch_and_author(repo)
+    last_tree: tuple[Optional[str], Dict[str, tuple[str, str]]] = (None, {})
+    head = start
+    created: List[tuple[str, str, str, str]] = []  # (old_head, new_head, pick, subject)
+    for pick_sha in todo:
+        pick = ctx.commits.get(pick_sha)
+        if pick is None:
+            break
+        parent = pick.parent_hashes[0] if pick.parent_hashes else None
+        base_tree = ctx.tree_of(repo, parent) if parent else None
+        theirs_tree = pick.tree_hash or None
+        try:
+            base = last_tree[1] if base_tree and base_tree == last_tree[0] else (
+                repo.flat_tree_entries(base_tree, tree_cache=tree_cache) if base_tree else {}
+            )
+            theirs = repo.flat_tree_entries(theirs_tree, tree_cache=tree_cache) if theirs_tree else {}
+        except Exception:
+            break
+        merged = merge_trees_in_memory(base, ours, theirs)
+        if merged is None:
+            break
+        tree_hash = repo.create_tree_from_entries({p: {"sha1": sha, "mode": mode} for p, (mode, sha) in merged.items()})
+        message = (pick.message or "").strip()
+        ts, tz = timestamp_with_tz(None)
+        new_head = repo.store_object(
+            Commit(
+                tree_hash=tree_hash,
+                parent_hashes=[head],
+                author=author,
+                committer=author,
+                message=message,
+                timestamp=ts,
+                tz_offset=tz,
+            )
+        )
+        ctx.trees[new_head] = tree_hash
+        created.append((head, new_head, pick_sha, (message.split("\n")[0] or "").strip()))
+        head, ours, last_tree = new_head, merged, (theirs_tree, theirs)
+
+    if not created:
+        return 0
+    _checkout_flat(repo, start_flat, ours)
+    write_head_detached(repo.git_dir, head)
+    ctx.head = head
+    for old_head, new_head, pick_sha, subject in created:
+        append_reflog(repo, "HEAD", old_head, new_head, f"cherry-pick: {subject}")
+        print(f"Created commit {new_head[:7]} (cherry-pick of {pick_sha[:7]})")
+    return len(created)
+
+
+def _checkout_flat(repo: Repository, old: Dict[str, tuple[str, str]], new: Dict[str, tuple[str, str]]) -> None:
+    """Move working tree and index from flat tree old to flat tree new, touching only paths that differ."""
+    entries = repo.load_index()
+    for path in old.keys() - new.keys():
+        full = repo.path / path
+        full.unlink(missing_ok=True)
+        entries.pop(path, None)
+        parent = full.parent
+        while parent != repo.path and parent.exists() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    made: Set[Path] = set()
+    for path, (mode, sha) in new.items():
+        if old.get(path) == (mode, sha) and path in entries:
+            continue
+        full = repo.path / path
+        if full.parent not in made:
+            full.parent.mkdir(parents=True, exist_ok=True)
+            made.add(full.parent)
+        write_bytes_atomic(full, repo.load_object(sha).content)
+        if mode == MODE_FILE_EXECUTABLE:
+            os.chmod(full, 0o755)
+        entry = index_entry_for_file(full, sha)
+        entry["mode"] = mode  # the tree's mode, not whatever the new file's permission bits say
+        entries[path] = entry
+    repo.save_index(entries)
+
+
 def rebase(repo: Repository, upstream: str) -> None:
-    """Rebase current branch onto upstream. Refuse if detached HEAD. Uses cherry-pick per commit."""
+    """Rebase current branch onto upstream. Refuse if detached HEAD. Replays in memory until a conflict, then cherry-picks."""
     repo.require_repo()
     if _rebase_in_progress(repo):
         raise PygitError(
@@ -114,12 +264,8 @@ def rebase(repo: Repository, upstream: str) -> None:
     reset_hard(repo, upstream_sha)
     _rebase_write_state(repo, head_sha, upstream_sha, branch, to_replay)
 
-    for i, commit_sha in enumerate(to_replay):
-        try:
-            cherry_pick(repo, commit_sha)
-        except PygitError:
-            _rebase_write_state(repo, head_sha, upstream_sha, branch, to_replay[i + 1 :])
-            raise
+    ctx = _rebase_context(repo, to_replay, upstream_sha)
+    _replay_todo(repo, ctx, to_replay, head_sha, upstream_sha, branch)
 
     new_head = head_commit(repo.git_dir)
     if new_head:
@@ -143,15 +289,8 @@ def rebase_continue(repo: Repository) -> None:
     orig_head, upstream_sha, branch, todo_list = state
 
     cherry_pick_continue(repo)
-    remaining = list(todo_list)
-    while remaining:
-        next_commit = remaining[0]
-        remaining = remaining[1:]
-        _rebase_write_state(repo, orig_head, upstream_sha, branch, remaining)
-        try:
-            cherry_pick(repo, next_commit)
-        except PygitError:
-            raise
+    ctx = _rebase_context(repo, todo_list, head_commit(repo.git_dir))
+    _replay_todo(repo, ctx, todo_list, orig_head, upstream_sha, branch)
     new_head = head_commit(repo.git_dir)
     if new_head and branch:
         refname = f"refs/heads/{branch}"
@@ -174,9 +313,7 @@ def rebase_abort(repo: Repository) -> None:
         raise PygitError("Cannot abort: ORIG_HEAD is missing.")
 
     from .porcelain import reset_hard
-    d = repo.git_dir / PYGIT_STATE_DIR
-    for name in ("CHERRY_PICK_HEAD", "CHERRY_PICK_ORIG_HEAD", "CHERRY_PICK_MSG", "CHERRY_PICK_CONFLICTS"):
-        (d / name).unlink(missing_ok=True)
+    _cherry_pick_clear_state(repo)
     pre_head = head_commit(repo.git_dir) or ZEROS
     reset_hard(repo, orig_head)
     if branch:
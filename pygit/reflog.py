@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import os
 import re
 import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
 from .config import get_user_identity
 from .util import read_text_safe, timezone_offset_utc
@@ -14,19 +15,24 @@ if TYPE_CHECKING:
     from .repo import Repository
 
 ZEROS = "0" * 40
-SHA1_HEX_LEN = 40
+# old new who timestamp tz<TAB>message; one pass over the whole log, malformed lines simply don't match.
+# Fields before the tab are split on any run of non-tab whitespace and timestamps are signed, as int() takes them.
+_REFLOG_LINE_RE = re.compile(
+    r"^[^\S\t\n]*([0-9a-f]{40})[^\S\t\n]+([0-9a-f]{40})[^\S\t\n]+(\S[^\t\n]*?)[^\S\t\n]+([-+]?\d+)[^\S\t\n]+(\S+)[^\S\t\n]*\t(.*?)\r?$",
+    re.IGNORECASE | re.MULTILINE | re.ASCII,
+)
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
 
 
 def reflog_path_for_ref(repo: "Repository", refname: str) -> Path:
     """Path to reflog file for ref. HEAD -> .git/logs/HEAD; refs/heads/X -> .git/logs/refs/heads/X."""
+    return Path(_reflog_path_str(repo, refname))
+
+
+def _reflog_path_str(repo: "Repository", refname: str) -> str:
+    """reflog_path_for_ref as a plain string; the hot paths below only hand it to os calls."""
     repo.require_repo()
-    if refname == "HEAD":
-        return repo.git_dir / "logs" / "HEAD"
-    if refname.startswith("refs/heads/"):
-        return repo.git_dir / "logs" / refname
-    if refname.startswith("refs/tags/"):
-        return repo.git_dir / "logs" / refname
-    return repo.git_dir / "logs" / refname
+    return os.path.join(repo.git_dir, "logs", refname)
 
 
 def append_reflog(
@@ -40,19 +46,24 @@ def append_reflog(
     tz: Optional[str] = None,
 ) -> None:
     """Append one reflog line. Creates log dir if missing. Line: old new who timestamp tz\\tmessage."""
-    repo.require_repo()
-    path = reflog_path_for_ref(repo, refname)
-    path.parent.mkdir(parents=True, exist_ok=True)
+    path = _reflog_path_str(repo, refname)
     who = who or get_user_identity(repo) or "PyGit User <user@pygit.com>"
     if timestamp is None:
         timestamp = int(time.time())
     if tz is None:
         tz = timezone_offset_utc()
     msg_line = message.replace("\n", " ").replace("\r", " ").strip()
-    line = f"{old} {new} {who} {timestamp} {tz}\t{msg_line}\n"
+    line = f"{old} {new} {who} {timestamp} {tz}\t{msg_line}\n".encode("utf-8")
     try:
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(line)
+        try:
+            fd = os.open(path, _APPEND_FLAGS, 0o644)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, _APPEND_FLAGS, 0o644)
+        try:
+            os.write(fd, line)  # one O_APPEND write: concurrent appenders never interleave a line
+        finally:
+            os.close(fd)
     except OSError:
         pass
 
@@ -61,29 +72,22 @@ def read_reflog(
     repo: "Repository", refname: str
 ) -> list[tuple[str, str, str, int, str, str]]:
     """Read reflog entries. Returns [(old, new, who, timestamp, tz, message), ...] file order (oldest first). Skips malformed lines."""
-    repo.require_repo()
-    path = reflog_path_for_ref(repo, refname)
+    path = _reflog_path_str(repo, refname)
     content = read_text_safe(path)
     if not content:
         return []
-    result: list[tuple[str, str, str, int, str, str]] = []
-    for raw in content.splitlines():
-        if "\t" not in raw:
-            continue
-        head, msg = raw.split("\t", 1)
-        parts = head.split()
-        if len(parts) < 5:
-            continue
-        old_h, new_h = parts[0], parts[1]
-        if len(old_h) != SHA1_HEX_LEN or len(new_h) != SHA1_HEX_LEN:
-            continue
-        if not re.fullmatch(r"[0-9a-fA-F]{40}", old_h) or not re.fullmatch(r"[0-9a-fA-F]{40}", new_h):
-            continue
-        try:
-            ts = int(parts[-2])
-        except (ValueError, IndexError):
-            continue
-        tz = parts[-1]
-        who = " ".join(parts[2:-2])
-        result.append((old_h.lower(), new_h.lower(), who, ts, tz, msg))
-    return result
+    return [
+        (old_h.lower(), new_h.lower(), " ".join(who.split()), int(ts), tz, msg)
+        for old_h, new_h, who, ts, tz, msg in _REFLOG_LINE_RE.findall(content)
+    ]
+
+
+def read_reflog_reversed(repo: "Repository", refname: str) -> Iterator[tuple[str, str]]:
+    """Yield (new, message) per reflog entry, newest first, parsing lazily. Skips the same malformed lines as read_reflog."""
+    content = read_text_safe(_reflog_path_str(repo, refname))
+    if not content:
+        return
+    for line in reversed(content.split("\n")):
+        m = _REFLOG_LINE_RE.match(line)
+        if m:
+            yield m.group(2).lower(), m.group(6)
@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
+import os
 import re
+import string
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal, Optional
 
 from .constants import DEFAULT_BRANCH, HEAD_FILE, REF_HEADS_PREFIX, REF_TAGS_PREFIX, SHA1_HEX_LEN
 from .errors import InvalidRefError
-from .util import read_text_safe, write_text_atomic
+from .util import MMAP_THRESHOLD, map_file, read_text_safe, write_text_atomic
 
 
-@dataclass
+@dataclass(frozen=True)
 class HeadState:
     """HEAD state: either symbolic ref or detached commit hash."""
     kind: Literal["ref", "detached"]
@@ -28,14 +30,40 @@ def _ref_path(repo_git: Path, refname: str) -> Path:
     return repo_git / refname
 
 
+def _ref_path_str(repo_git: Path, refname: str) -> str:
+    """_ref_path as a plain string, for lookups that only read the file."""
+    return os.path.join(repo_git, refname)
+
+
+_HEX_TRANS = str.maketrans("", "", string.hexdigits)
+
+
 def _is_hex_sha(s: str) -> bool:
-    return len(s) == SHA1_HEX_LEN and bool(re.fullmatch(r"[0-9a-fA-F]{40}", s))
+    # Deleting every hex digit leaves "" only for an all-hex string; cheaper than a regex match.
+    return len(s) == SHA1_HEX_LEN and not s.translate(_HEX_TRANS)
+
+
+_HEAD_CACHE: dict[Path, tuple[tuple[int, int, int], Optional[HeadState]]] = {}
 
 
 def read_head(repo_git: Path) -> Optional[HeadState]:
-    """Read HEAD; return HeadState or None if no HEAD file."""
+    """Read HEAD; return HeadState or None if no HEAD file. Reparsed only when HEAD's stat changes."""
     path = _head_file(repo_git)
-    raw = read_text_safe(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        _HEAD_CACHE.pop(path, None)
+        return None
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    hit = _HEAD_CACHE.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    state = _parse_head(read_text_safe(path))
+    _HEAD_CACHE[path] = (key, state)
+    return state
+
+
+def _parse_head(raw: Optional[str]) -> Optional[HeadState]:
     if raw is None:
         return None
     raw = raw.strip()
@@ -52,6 +80,7 @@ def write_head_ref(repo_git: Path, refname: str) -> None:
     if not refname.startswith(REF_HEADS_PREFIX):
         raise InvalidRefError(f"symbolic ref must be refs/heads/... (got {refname})")
     content = f"ref: {refname}\n"
+    _HEAD_CACHE.pop(_head_file(repo_git), None)
     write_text_atomic(_head_file(repo_git), content)
 
 
@@ -59,51 +88,127 @@ def write_head_detached(repo_git: Path, commit_hash: str) -> None:
     """Set HEAD to detached commit hash (40 hex chars)."""
     if not _is_hex_sha(commit_hash):
         raise InvalidRefError(f"invalid commit hash: {commit_hash}")
+    _HEAD_CACHE.pop(_head_file(repo_git), None)
     write_text_atomic(_head_file(repo_git), commit_hash.lower() + "\n")
 
 
+# "<sha> <refname>" lines; comments and peeled "^<sha>" lines never match, so one findall covers the file
+_PACKED_LINE_RE = re.compile(r"^[ \t]*([0-9a-fA-F]{40})[ \t]+(\S.*?)[ \t\r]*$", re.MULTILINE | re.ASCII)
+_PACKED_CACHE: dict[Path, tuple[tuple[int, int, int], dict[str, str]]] = {}
+
+
 def _read_packed_refs(repo_git: Path) -> dict[str, str]:
-    """Read .git/packed-refs; return dict refname -> sha (loose refs override, so we only use when loose missing)."""
+    """Read .git/packed-refs; return dict refname -> sha (loose refs override, so we only use when loose missing).
+
+    The parse is cached until the file's stat changes; callers must not mutate the result.
+    """
     packed = repo_git / "packed-refs"
-    if not packed.is_file():
+    try:
+        st = os.stat(packed)
+    except OSError:
+        _PACKED_CACHE.pop(packed, None)
         return {}
-    result: dict[str, str] = {}
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    hit = _PACKED_CACHE.get(packed)
+    if hit is not None and hit[0] == key:
+        return hit[1]
     try:
         raw = packed.read_text()
     except OSError:
         return {}
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if line.startswith("^"):
-            continue  # peeled tag line; previous line was the ref
-        parts = line.split(None, 1)
-        if len(parts) < 2:
-            continue
-        sha, refname = parts[0], parts[1]
-        if _is_hex_sha(sha):
-            result[refname] = sha.lower()
+    result = {refname: sha.lower() for sha, refname in _PACKED_LINE_RE.findall(raw)}
+    _PACKED_CACHE[packed] = (key, result)
     return result
 
 
+def _lookup_packed_ref(repo_git: Path, refname: str) -> Optional[str]:
+    """Look up one ref in packed-refs.
+
+    Files below MMAP_THRESHOLD would be read whole anyway, so they go through the cached parse. Only larger
+    files with the `sorted` trait are binary-searched in place, without parsing.
+    """
+    packed = repo_git / "packed-refs"
+    try:
+        st = os.stat(packed)
+    except OSError:
+        return None
+    hit = _PACKED_CACHE.get(packed)
+    if hit is not None and hit[0] == (st.st_ino, st.st_mtime_ns, st.st_size):
+        return hit[1].get(refname)
+    if st.st_size < MMAP_THRESHOLD:
+        return _read_packed_refs(repo_git).get(refname)
+    try:
+        with map_file(packed) as data:
+            found = _bisect_packed_refs(data, refname.encode("utf-8"))
+    except (OSError, ValueError):
+        found = None
+    if found is None:
+        return _read_packed_refs(repo_git).get(refname)
+    return found or None
+
+
+def _bisect_packed_refs(data: bytes, name: bytes) -> Optional[str]:
+    """Binary-search sorted packed-refs content for name. Return sha, "" if absent, or None if the file is not sorted."""
+    if data[:17] != b"# pack-refs with:":
+        return None
+    lo = data.find(b"\n") + 1 or len(data)
+    if b" sorted" not in data[:lo]:
+        return None
+    hi = len(data)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = data.rfind(b"\n", lo, mid) + 1 or lo
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = len(data)
+        line = data[start:end]
+        if line.startswith(b"^"):
+            # Peeled line belongs to the ref on the line before it.
+            rec_end = end
+            end = start - 1
+            start = data.rfind(b"\n", lo, end) + 1 or lo
+            line = data[start:end]
+        elif data[end + 1 : end + 2] == b"^":
+            rec_end = data.find(b"\n", end + 1)
+            if rec_end == -1:
+                rec_end = len(data)
+        else:
+            rec_end = end
+        sha, _, ref = line.rstrip(b"\r").partition(b" ")
+        if not ref:
+            return None
+        if ref == name:
+            sha_str = sha.decode("ascii", errors="replace")
+            return sha_str.lower() if _is_hex_sha(sha_str) else None
+        if ref < name:
+            lo = rec_end + 1
+        else:
+            hi = start
+    return ""
+
+
 def resolve_ref(repo_git: Path, refname: str, _packed: Optional[dict[str, str]] = None) -> Optional[str]:
-    """Resolve ref to commit hash; return None if ref or target doesn't exist. Checks loose then packed-refs."""
-    path = _ref_path(repo_git, refname)
-    content = read_text_safe(path)
-    if content is None:
-        if _packed is None:
-            _packed = _read_packed_refs(repo_git)
-        content = _packed.get(refname)
+    """Resolve ref to commit hash; return None if ref or target doesn't exist. Checks loose then packed-refs.
+
+    Symbolic refs are followed iteratively; a cycle raises InvalidRefError.
+    """
+    visited: set[str] = set()
+    while True:
+        content = read_text_safe(_ref_path_str(repo_git, refname))
         if content is None:
-            return None
-        # content is sha from packed-refs
-        return content.lower() if _is_hex_sha(content) else None
-    content = content.strip()
-    if _is_hex_sha(content):
-        return content.lower()
-    # symbolic ref: resolve recursively (we don't store symbolic refs in refs/ normally, only HEAD)
-    return resolve_ref(repo_git, content, _packed=_packed)
+            if _packed is None:
+                return _lookup_packed_ref(repo_git, refname)
+            sha = _packed.get(refname)
+            # sha from packed-refs
+            return sha.lower() if sha is not None and _is_hex_sha(sha) else None
+        content = content.strip()
+        if _is_hex_sha(content):
+            return content.lower()
+        # symbolic ref (we don't store these in refs/ normally, only HEAD)
+        visited.add(refname)
+        refname = content[5:].strip() if content.startswith("ref: ") else content
+        if refname in visited:
+            raise InvalidRefError(f"symbolic ref cycle at {refname}")
 
 
 def update_ref(repo_git: Path, refname: str, new_hash: str) -> None:
@@ -121,25 +226,40 @@ def update_ref_verify(
     new_hash: str,
     old_hash: Optional[str] = None,
 ) -> None:
-    """Update ref to new_hash; if old_hash given, update only if current value matches. Uses lock file."""
+    """Update ref to new_hash; if old_hash given, update only if current value matches. Uses lock file.
+
+    The lock is taken with O_CREAT|O_EXCL, so a concurrent updater fails instead of racing; old_hash is
+    checked while the lock is held.
+    """
     if not _is_hex_sha(new_hash):
         raise InvalidRefError(f"invalid hash: {new_hash}")
     path = _ref_path(repo_git, refname)
-    if old_hash is not None:
-        current = resolve_ref(repo_git, refname)
-        if current is None or current.lower() != old_hash.lower():
-            raise InvalidRefError(f"ref {refname} is not at expected value (expected {old_hash})")
     path.parent.mkdir(parents=True, exist_ok=True)
     lock_path = path.parent / (path.name + ".lock")
     try:
-        write_text_atomic(lock_path, new_hash.lower() + "\n")
-        lock_path.replace(path)
-    finally:
-        if lock_path.exists():
-            try:
-                lock_path.unlink()
-            except OSError:
-                pass
+        fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        raise InvalidRefError(f"unable to lock {refname}: {lock_path} exists") from None
+    try:
+        try:
+            os.write(fd, (new_hash.lower() + "\n").encode("ascii"))
+        finally:
+            os.close(fd)
+        if old_hash is not None:
+            raw = read_text_safe(path)
+            current = raw.strip() if raw is not None else None
+            if current is None or not _is_hex_sha(current):
+                # packed or symbolic ref: take the full lookup
+                current = resolve_ref(repo_git, refname)
+            if current is None or current.lower() != old_hash.lower():
+                raise InvalidRefError(f"ref {refname} is not at expected value (expected {old_hash})")
+        os.replace(lock_path, path)
+    except BaseException:
+        try:
+            lock_path.unlink()
+        except OSError:
+            pass
+        raise
 
 
 def current_branch_name(repo_git: Path) -> Optional[str]:
@@ -154,41 +274,72 @@ def current_branch_name(repo_git: Path) -> Optional[str]:
     return None
 
 
-def head_commit(repo_git: Path) -> Optional[str]:
+def head_commit(repo_git: Path, _packed: Optional[dict[str, str]] = None) -> Optional[str]:
     """Resolve HEAD to commit hash; return None if no HEAD or ref doesn't resolve."""
     state = read_head(repo_git)
     if state is None:
         return None
     if state.kind == "detached":
         return state.value
-    return resolve_ref(repo_git, state.value)
+    return resolve_ref(repo_git, state.value, _packed=_packed)
+
+
+def _loose_ref_names(refs_dir: str | Path) -> list[str]:
+    """Names of loose ref files directly under refs_dir (unsorted); [] if the directory is missing.
+
+    Uses os.scandir so the file-type check comes from the directory listing instead of a stat per entry;
+    symlinks are not followed (and not listed), since following one would cost that stat again.
+    """
+    try:
+        with os.scandir(refs_dir) as it:
+            return [e.name for e in it if not e.name.startswith(".") and e.is_file(follow_symlinks=False)]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
 
 
 def list_branches(repo_git: Path) -> list[str]:
     """List branch names (refs/heads/*) from loose refs only."""
-    heads_dir = repo_git / "refs" / "heads"
-    if not heads_dir.is_dir():
-        return []
-    return sorted(
-        p.name for p in heads_dir.iterdir() if p.is_file() and not p.name.startswith(".")
-    )
+    return sorted(_loose_ref_names(repo_git / "refs" / "heads"))
 
 
-def list_ref_names_with_prefix(repo_git: Path, prefix: str) -> list[str]:
+def list_ref_names_with_prefix(
+    repo_git: Path, prefix: str, _packed: Optional[dict[str, str]] = None
+) -> list[str]:
     """List full ref names (e.g. refs/heads/main) with given prefix, from loose + packed-refs."""
-    loose: list[str] = []
-    refs_dir = repo_git / prefix.rstrip("/")
-    if refs_dir.is_dir():
-        for p in refs_dir.iterdir():
-            if p.is_file() and not p.name.startswith("."):
-                loose.append(prefix + p.name)
-    packed = _read_packed_refs(repo_git)
-    packed_refs = [r for r in packed if r.startswith(prefix)]
-    return sorted(set(loose) | set(packed_refs))
+    names = {prefix + name for name in _loose_ref_names(repo_git / prefix.rstrip("/"))}
+    packed = _read_packed_refs(repo_git) if _packed is None else _packed
+    names.update(r for r in packed if r.startswith(prefix))
+    return sorted(names)
 
 
-# Characters disallowed in tag names (git refname rules)
-_TAG_FORBIDDEN = set(" ~^:?*[]\\")
+def ref_snapshot(
+    repo_git: Path, prefixes: tuple[str, ...] = ("refs/heads/", "refs/tags/")
+) -> dict[str, str]:
+    """Resolve every ref under prefixes in one pass: refname -> sha.
+
+    packed-refs is parsed once and each refs/<prefix> directory is scanned once; loose refs override
+    packed ones, and only loose files that are not a plain sha fall back to resolve_ref.
+    """
+    packed = _read_packed_refs(repo_git)
+    snap = {r: sha for r, sha in packed.items() if r.startswith(prefixes) and _is_hex_sha(sha)}
+    for prefix in prefixes:
+        ref_dir = _ref_path_str(repo_git, prefix.rstrip("/"))
+        for name in _loose_ref_names(ref_dir):
+            refname = prefix + name
+            content = read_text_safe(os.path.join(ref_dir, name))
+            sha = content.strip() if content is not None else ""
+            if not _is_hex_sha(sha):
+                sha = resolve_ref(repo_git, refname, _packed=packed) or ""
+            if sha:
+                snap[refname] = sha.lower()
+            else:
+                snap.pop(refname, None)
+    return snap
+
+
+# Characters disallowed in tag names (git refname rules); translate() with this table deletes them
+_TAG_REJECT_TABLE = dict.fromkeys(map(ord, " ~^:?*[]\\"), None)
+
 
 def validate_tag_name(name: str) -> None:
     """Raise InvalidRefError if tag name is invalid (spaces, .., leading /, ~^:?*[], etc.)."""
@@ -196,18 +347,12 @@ def validate_tag_name(name: str) -> None:
         raise InvalidRefError(f"invalid tag name: {name!r}")
     if ".." in name or "//" in name:
         raise InvalidRefError(f"invalid tag name: {name!r}")
-    for c in name:
-        if c in _TAG_FORBIDDEN:
-            raise InvalidRefError(f"invalid tag name: {name!r}")
+    if len(name.translate(_TAG_REJECT_TABLE)) != len(name):
+        raise InvalidRefError(f"invalid tag name: {name!r}")
     if name.startswith("."):
         raise InvalidRefError(f"invalid tag name: {name!r}")
 
 
 def list_tags(repo_git: Path) -> list[str]:
     """List tag names (refs/tags/*) from loose refs only."""
-    tags_dir = repo_git / "refs" / "tags"
-    if not tags_dir.is_dir():
-        return []
-    return sorted(
-        p.name for p in tags_dir.iterdir() if p.is_file() and not p.name.startswith(".")
-    )
+    return sorted(_loose_ref_names(repo_git / "refs" / "tags"))
@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from .repo import Repository
 
-from .config import read_config, write_config
+from .config import _read_config_cached, read_config, write_config
 from .constants import REF_HEADS_PREFIX, REF_REMOTES_PREFIX
 from .errors import InvalidRefError, PygitError
 
@@ -60,7 +60,7 @@ def remote_remove(repo: "Repository", name: str) -> None:
 def remote_list(repo: "Repository") -> List[Tuple[str, str, str]]:
     """List remotes. Returns [(name, fetch_url, push_url), ...]. push_url defaults to fetch url."""
     repo.require_repo()
-    cfg = read_config(repo)
+    cfg = _read_config_cached(repo)
     result: List[Tuple[str, str, str]] = []
     for section in cfg.sections():
         if not section.startswith(REMOTE_SECTION_PREFIX) or not section.endswith('"'):
@@ -75,7 +75,7 @@ def remote_list(repo: "Repository") -> List[Tuple[str, str, str]]:
 def get_remote_url(repo: "Repository", name: str) -> Optional[str]:
     """Return fetch URL for remote, or None if not configured."""
     repo.require_repo()
-    cfg = read_config(repo)
+    cfg = _read_config_cached(repo)
     section = _remote_section(name)
     if not cfg.has_section(section) or not cfg.has_option(section, "url"):
         return None
@@ -85,7 +85,7 @@ def get_remote_url(repo: "Repository", name: str) -> Optional[str]:
 def get_remote_fetch_refspecs(repo: "Repository", name: str) -> List[str]:
     """Return list of fetch refspecs for remote (e.g. +refs/heads/*:refs/remotes/origin/*)."""
     repo.require_repo()
-    cfg = read_config(repo)
+    cfg = _read_config_cached(repo)
     section = _remote_section(name)
     if not cfg.has_section(section):
         return []
@@ -109,6 +109,16 @@ class Refspec:
     src: str
     dst: str
     wildcard: bool  # True if src/dst contain *
+    # Text around the * in src/dst, split once here so refspec_expand only does startswith/endswith
+    _src_prefix: str = field(default="", init=False, repr=False, compare=False)
+    _src_suffix: str = field(default="", init=False, repr=False, compare=False)
+    _dst_prefix: str = field(default="", init=False, repr=False, compare=False)
+    _dst_suffix: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.wildcard:
+            self._src_prefix, _, self._src_suffix = self.src.partition("*")
+            self._dst_prefix, _, self._dst_suffix = self.dst.partition("*")
 
 
 def parse_refspec(refspec_str: str) -> "Refspec":
@@ -136,13 +146,11 @@ def parse_refspec(refspec_str: str) -> "Refspec":
 def refspec_expand(refspec: "Refspec", src_ref: str) -> Optional[str]:
     """Map source ref to destination ref using refspec. Returns None if src doesn't match."""
     if refspec.wildcard:
-        star = refspec.src.index("*")
-        prefix, suffix = refspec.src[:star], refspec.src[star + 1 :]
-        if not src_ref.startswith(prefix) or not src_ref.endswith(suffix):
+        prefix, suffix = refspec._src_prefix, refspec._src_suffix
+        end = len(src_ref) - len(suffix)
+        if end < len(prefix) or not src_ref.startswith(prefix) or not src_ref.endswith(suffix):
             return None
-        mid = src_ref[len(prefix) : -len(suffix)] if suffix else src_ref[len(prefix) :]
-        star_d = refspec.dst.index("*")
-        return refspec.dst[: star_d] + mid + refspec.dst[star_d + 1 :]
+        return refspec._dst_prefix + src_ref[len(prefix) : end] + refspec._dst_suffix
     if refspec.src == src_ref:
         return refspec.dst
     return None
@@ -150,6 +158,17 @@ def refspec_expand(refspec: "Refspec", src_ref: str) -> Optional[str]:
 
 def refspec_expand_src_list(refspec: "Refspec", src_refs: List[str]) -> List[Tuple[str, str]]:
     """For each src ref that matches refspec, return (src, dst)."""
+    if refspec.wildcard:
+        # Same rule as refspec_expand, inlined into one comprehension for long ref lists
+        p, s = refspec._src_prefix, refspec._src_suffix
+        dp, ds = refspec._dst_prefix, refspec._dst_suffix
+        plen, slen = len(p), len(s)
+        minlen = plen + slen
+        return [
+            (r, dp + r[plen : len(r) - slen] + ds)
+            for r in src_refs
+            if r.startswith(p) and r.endswith(s) and len(r) >= minlen
+        ]
     result: List[Tuple[str, str]] = []
     for src in src_refs:
         dst = refspec_expand(refspec, src)
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import os
+import stat
+import string
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set
 
-from .constants import DEFAULT_BRANCH, MODE_DIR, MODE_FILE, OBJ_COMMIT
+from .constants import DEFAULT_BRANCH, MODE_DIR, MODE_FILE, MODE_FILE_EXECUTABLE, OBJ_BLOB, OBJ_COMMIT
 from .errors import NotARepositoryError, PathOutsideRepoError
-from .index import index_entry_for_file, load_index as index_load, save_index as index_save
-from .objects import Blob, Commit, GitObject, Tree
+from .index import IndexEntry, load_index as index_load, save_index as index_save
+from .objects import Blob, GitObject, Tree, hash_buffer
 from .objectstore import ObjectStore
 from .refs import (
     current_branch_name,
@@ -17,7 +21,10 @@ from .refs import (
     update_ref,
     write_head_ref,
 )
-from .util import is_executable, normalize_path, read_bytes, write_bytes
+from .util import is_executable_mode, map_file, normalize_path, read_bytes, write_file_direct
+
+# Parsed trees kept per walk; shared subtrees are loaded once, memory stays bounded.
+TREE_CACHE_MAX = 1024
 
 
 class Repository:
@@ -33,11 +40,15 @@ class Repository:
         self.head_file = self.git_dir / "HEAD"
         self.index_file = self.git_dir / "index"
         self.odb = ObjectStore(self.objects_dir)
+        self._verified = False
 
     def require_repo(self) -> None:
-        """Raise NotARepositoryError if not a git repo."""
+        """Raise NotARepositoryError if not a git repo. Only the first successful check touches the filesystem."""
+        if self._verified:
+            return
         if not self.git_dir.is_dir():
             raise NotARepositoryError("not a git repository")
+        self._verified = True
 
     def safe_path(self, path: str) -> Path:
         """Resolve path relative to repo root; reject escaping."""
@@ -72,7 +83,7 @@ class Repository:
         """Load index (entries: path -> {sha1, mode, size, mtime_ns})."""
         return index_load(self.git_dir)
 
-    def save_index(self, entries: Dict[str, Dict]) -> None:
+    def save_index(self, entries: Dict[str, Dict] | Dict[str, IndexEntry]) -> None:
         """Save index."""
         index_save(self.git_dir, entries)
 
@@ -80,177 +91,184 @@ class Repository:
         """Store object in ODB; return full hash."""
         return self.odb.store(obj)
 
+    def store_object_from_buffer(self, obj_type: str, data: bytes) -> str:
+        """Store object content given as a buffer (e.g. mmap of a large file); return full hash."""
+        return self.odb.store_buffer(obj_type, data)
+
+    def store_file_blob(self, path: Path) -> str:
+        """Store file at path as a blob without holding extra copies of large files; return full hash."""
+        with map_file(path) as data:
+            return self.store_object_from_buffer(OBJ_BLOB, data)
+
+    def hash_file_blob(self, path: Path) -> str:
+        """Blob hash of file at path without storing it; large files are hashed straight from an mmap."""
+        with map_file(path) as data:
+            return hash_buffer(OBJ_BLOB, data)
+
     def load_object(self, sha: str) -> GitObject:
         """Load object by full hash."""
         return self.odb.load(sha)
 
-    def get_files_from_tree_recursive(self, tree_hash: str, prefix: str = "") -> Set[str]:
-        """Return set of file paths (not dirs) under tree."""
-        files: Set[str] = set()
-        try:
-            obj = self.load_object(tree_hash)
-            tree = Tree.from_content(obj.content)
-            for mode, name, obj_hash in tree.entries:
-                full = f"{prefix}{name}"
-                if mode.startswith("100"):
-                    files.add(full)
-                elif mode.startswith("04"):
-                    files.update(
-                        self.get_files_from_tree_recursive(obj_hash, f"{full}/")
-                    )
-        except Exception:
-            pass
-        return files
-
-    def build_index_from_tree(self, tree_hash: str, prefix: str = "") -> Dict[str, str]:
-        """Build path -> blob_hash from tree (for index compatibility)."""
-        result: Dict[str, str] = {}
-        try:
-            obj = self.load_object(tree_hash)
-            tree = Tree.from_content(obj.content)
+    def _load_tree(self, tree_hash: str, tree_cache: Optional[Dict[str, Tree]] = None) -> Tree:
+        """Load and parse a tree, reusing tree_cache (FIFO-bounded at TREE_CACHE_MAX) when given."""
+        if tree_cache is None:
+            return Tree.from_content(self.load_object(tree_hash).content)
+        tree = tree_cache.get(tree_hash)
+        if tree is None:
+            tree = Tree.from_content(self.load_object(tree_hash).content)
+            if len(tree_cache) >= TREE_CACHE_MAX:
+                del tree_cache[next(iter(tree_cache))]
+            tree_cache[tree_hash] = tree
+        return tree
+
+    def _walk_tree(
+        self,
+        tree_hash: str,
+        prefix: str = "",
+        skip_errors: bool = False,
+        tree_cache: Optional[Dict[str, Tree]] = None,
+    ) -> Iterator[tuple[str, str, str]]:
+        """Yield (path, mode, hash) for every non-tree entry under tree, using a worklist instead of recursion."""
+        if tree_cache is None:
+            tree_cache = {}
+        work = deque([(prefix, tree_hash)])
+        while work:
+            pre, th = work.popleft()
+            try:
+                tree = self._load_tree(th, tree_cache)
+            except Exception:
+                if skip_errors:
+                    continue
+                raise
             for mode, name, obj_hash in tree.entries:
-                full = f"{prefix}{name}"
-                if mode.startswith("100"):
-                    result[full] = obj_hash
-                elif mode.startswith("04"):
-                    result.update(self.build_index_from_tree(obj_hash, f"{full}/"))
-        except Exception:
-            pass
-        return result
+                full = f"{pre}{name}"
+                if mode.startswith("04") or mode == "40000":
+                    work.append((f"{full}/", obj_hash))
+                else:
+                    yield full, mode, obj_hash
+
+    def get_files_from_tree_recursive(
+        self, tree_hash: str, prefix: str = "", tree_cache: Optional[Dict[str, Tree]] = None
+    ) -> Set[str]:
+        """Return set of file paths (not dirs) under tree. Pass tree_cache to share parsed trees across walks."""
+        return {
+            path
+            for path, mode, _ in self._walk_tree(tree_hash, prefix, skip_errors=True, tree_cache=tree_cache)
+            if mode.startswith("100")
+        }
+
+    def build_index_from_tree(
+        self, tree_hash: str, prefix: str = "", tree_cache: Optional[Dict[str, Tree]] = None
+    ) -> Dict[str, str]:
+        """Build path -> blob_hash from tree (for index compatibility). Pass tree_cache to share parsed trees across walks."""
+        return {
+            path: obj_hash
+            for path, mode, obj_hash in self._walk_tree(tree_hash, prefix, skip_errors=True, tree_cache=tree_cache)
+            if mode.startswith("100")
+        }
 
     def restore_tree(self, tree_hash: str, base_path: Path) -> None:
         """Checkout tree into base_path (create files/dirs)."""
-        obj = self.load_object(tree_hash)
-        tree = Tree.from_content(obj.content)
-        for mode, name, obj_hash in tree.entries:
-            p = base_path / name
-            if mode.startswith("100"):
-                blob_obj = self.load_object(obj_hash)
-                p.parent.mkdir(parents=True, exist_ok=True)
-                p.write_bytes(blob_obj.content)
-            elif mode.startswith("04"):
-                p.mkdir(parents=True, exist_ok=True)
-                self.restore_tree(obj_hash, p)
-
-    def restore_index_from_tree(self, tree_hash: str) -> None:
-        """Set index to match tree (path -> entry with sha1, mode, size, mtime_ns, ctime_ns)."""
-        entries: Dict[str, Dict] = {}
+        made: Set[Path] = set()
+        tree_cache: Dict[str, Tree] = {}
+        work = deque([(base_path, tree_hash)])
+        while work:
+            base, th = work.popleft()
+            tree = self._load_tree(th, tree_cache)
+            for mode, name, obj_hash in tree.entries:
+                p = base / name
+                if mode.startswith("100"):
+                    blob_obj = self.load_object(obj_hash)
+                    if base not in made:
+                        base.mkdir(parents=True, exist_ok=True)
+                        made.add(base)
+                    write_file_direct(p, blob_obj.content)
+                elif mode.startswith("04") or mode == "40000":
+                    p.mkdir(parents=True, exist_ok=True)
+                    made.add(p)
+                    work.append((p, obj_hash))
 
-        def walk(prefix: str, th: str) -> None:
-            obj = self.load_object(th)
-            tree = Tree.from_content(obj.content)
-            for mode, name, ent_sha in tree.entries:
-                path = f"{prefix}{name}" if prefix else name
-                if mode.startswith("04"):
-                    walk(path + "/", ent_sha)
-                else:
-                    blob = self.load_object(ent_sha)
-                    size = len(blob.content) if hasattr(blob, "content") else 0
-                    entries[path] = {
-                        "sha1": ent_sha,
-                        "mode": mode,
-                        "size": size,
-                        "mtime_ns": 0,
-                        "ctime_ns": 0,
-                    }
-
-        walk("", tree_hash)
+    def restore_index_from_tree(self, tree_hash: str, tree_cache: Optional[Dict[str, Tree]] = None) -> None:
+        """Set index to match tree (path -> entry with sha1, mode, size, mtime_ns, ctime_ns)."""
+        entries: Dict[str, IndexEntry] = {}
+        sizes: Dict[str, int] = {}
+        for path, mode, ent_sha in self._walk_tree(tree_hash, tree_cache=tree_cache):
+            size = sizes.get(ent_sha)
+            if size is None:
+                blob = self.load_object(ent_sha)
+                size = sizes[ent_sha] = len(blob.content) if hasattr(blob, "content") else 0
+            entries[path] = IndexEntry(ent_sha, mode, size)
         self.save_index(entries)
 
+    def flat_tree_entries(
+        self, tree_hash: str, prefix: str = "", tree_cache: Optional[Dict[str, Tree]] = None
+    ) -> Dict[str, tuple[str, str]]:
+        """Return path -> (mode, blob_hash) for every file under tree."""
+        return {
+            path: (mode, obj_hash)
+            for path, mode, obj_hash in self._walk_tree(tree_hash, prefix, tree_cache=tree_cache)
+        }
+
     def create_tree_from_index(self) -> str:
         """Build tree from current index; return tree hash. Uses MODE_DIR 040000."""
-        from .constants import MODE_DIR
-        entries = self.load_index()
-        if not entries:
-            tree = Tree()
-            return self.store_object(tree)
-        # path -> (mode, sha) for files; dirs built as nested dict
-        dirs: Dict = {}
-        files: Dict[str, tuple[str, str]] = {}  # name -> (mode, sha)
-        for file_path, ent in entries.items():
-            sha = ent.get("sha1", "")
-            mode = ent.get("mode", MODE_FILE)
-            parts = file_path.split("/")
-            if len(parts) == 1:
-                files[parts[0]] = (mode, sha)
-            else:
-                current = dirs
-                for part in parts[:-1]:
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
-                current[parts[-1]] = (mode, sha)
-
-        def make_tree(entries_dict: Dict) -> str:
-            tree = Tree()
-            for name in sorted(entries_dict.keys()):
-                val = entries_dict[name]
-                if isinstance(val, tuple):
-                    mode, sha = val
-                    tree.add_entry(mode, name, sha)
-                else:
-                    sub_hash = make_tree(val)
-                    tree.add_entry(MODE_DIR, name, sub_hash)
-            return self.store_object(tree)
+        return self.create_tree_from_entries(self.load_index())
 
-        root: Dict = {}
-        for name, t in files.items():
-            root[name] = t
-        for d, content in dirs.items():
-            root[d] = content
-        return make_tree(root)
+    def create_tree_from_entries(self, entries: Dict[str, Dict]) -> str:
+        """Build and store tree objects for path -> {sha1, mode} entries; return root tree hash.
+
+        Paths are sorted once and streamed: every directory is contiguous in that order, so each
+        tree is stored as soon as the walk leaves it.
+        """
+        open_dirs: List[str] = []
+        stack: List[List[tuple[str, str, str]]] = [[]]
+
+        def close_dir() -> None:
+            tree_entries = stack.pop()
+            stack[-1].append((MODE_DIR, open_dirs.pop(), self.store_object(Tree(tree_entries))))
+
+        for file_path in sorted(entries):
+            ent = entries[file_path]
+            *dirs, leaf = file_path.split("/")
+            common = 0
+            limit = min(len(dirs), len(open_dirs))
+            while common < limit and dirs[common] == open_dirs[common]:
+                common += 1
+            while len(open_dirs) > common:
+                close_dir()
+            for d in dirs[common:]:
+                open_dirs.append(d)
+                stack.append([])
+            stack[-1].append((ent.get("mode", MODE_FILE), leaf, ent.get("sha1", "")))
+        while open_dirs:
+            close_dir()
+        return self.store_object(Tree(stack[0]))
 
     def create_tree_from_workdir(self) -> str:
         """Build tree from current working dir (paths from index). Missing files -> empty blob."""
         from .util import read_bytes
         entries = self.load_index()
-        if not entries:
-            tree = Tree()
-            return self.store_object(tree)
-        dirs: Dict = {}
-        files: Dict[str, tuple[str, str]] = {}
+        flat: Dict[str, Dict] = {}
         for file_path, ent in entries.items():
             full = self.path / file_path
             mode = ent.get("mode", MODE_FILE)
-            if full.is_file():
+            try:
+                st = os.stat(full)
+            except OSError:
+                st = None
+            if st is not None and stat.S_ISREG(st.st_mode):
                 content = read_bytes(full)
                 blob = Blob(content)
                 sha = self.store_object(blob)
-                mode = index_entry_for_file(full, sha).get("mode", mode)
+                mode = MODE_FILE_EXECUTABLE if is_executable_mode(st.st_mode) else MODE_FILE
             else:
                 sha = self.store_object(Blob(b""))
-            parts = file_path.split("/")
-            if len(parts) == 1:
-                files[parts[0]] = (mode, sha)
-            else:
-                current = dirs
-                for part in parts[:-1]:
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
-                current[parts[-1]] = (mode, sha)
-        def make_tree(entries_dict: Dict) -> str:
-            tree = Tree()
-            for name in sorted(entries_dict.keys()):
-                val = entries_dict[name]
-                if isinstance(val, tuple):
-                    mode, sha = val
-                    tree.add_entry(mode, name, sha)
-                else:
-                    sub_hash = make_tree(val)
-                    tree.add_entry(MODE_DIR, name, sub_hash)
-            return self.store_object(tree)
-        root = {}
-        for name, t in files.items():
-            root[name] = t
-        for d, content in dirs.items():
-            root[d] = content
-        return make_tree(root)
-
-
-def list_tree_paths(repo: Repository, tree_hash: str) -> Set[str]:
+            flat[file_path] = {"sha1": sha, "mode": mode}
+        return self.create_tree_from_entries(flat)
+
+
+def list_tree_paths(repo: Repository, tree_hash: str, tree_cache: Optional[Dict[str, Tree]] = None) -> Set[str]:
     """Recursively list all tracked file paths in the tree (not directories)."""
-    return repo.get_files_from_tree_recursive(tree_hash, "")
+    return repo.get_files_from_tree_recursive(tree_hash, "", tree_cache=tree_cache)
 
 
 def read_blob_from_tree(repo: Repository, tree_hash: str, rel_path: str) -> Optional[bytes]:
@@ -291,7 +309,12 @@ def tree_hash_for_commit(repo: Repository, commit_hash: str) -> Optional[str]:
         obj = repo.load_object(commit_hash)
         if obj.type != OBJ_COMMIT:
             return None
-        commit = Commit.from_content(obj.content)
-        return commit.tree_hash or None
+        # The tree header is always the first line; no need to parse the rest of the commit
+        data = obj.content
+        if not data.startswith(b"tree "):
+            return None
+        nl = data.find(b"\n", 5)
+        tree_hash = (data[5:] if nl == -1 else data[5:nl]).decode("ascii", errors="replace")
+        return tree_hash if len(tree_hash) == 40 and not tree_hash.strip(string.hexdigits) else None
     except Exception:
         return None
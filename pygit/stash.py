@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 
+import os
+import re
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from .errors import PygitError
+from .objects import Commit
 from .plumbing import commit_tree
 from .porcelain import reset_hard
-from .refs import head_commit, resolve_ref, update_ref
-from .reflog import ZEROS, append_reflog, read_reflog
+from .refs import _is_hex_sha, current_branch_name, head_commit, resolve_ref, update_ref
+from .reflog import _REFLOG_LINE_RE, ZEROS, append_reflog, read_reflog_reversed
 from .repo import Repository
 
 
 STASH_REF = "refs/stash"
+_TAIL_BLOCK = 4096
 
 
 def stash_save(repo: Repository, message: Optional[str] = None) -> None:
@@ -45,14 +50,16 @@ def stash_save(repo: Repository, message: Optional[str] = None) -> None:
     reset_hard(repo, head)
 
 
+def iter_stash(repo: Repository) -> Iterator[tuple[str, str]]:
+    """Yield (stash_ref, message) for stash@{0}, stash@{1}, ... (newest first), reading the reflog lazily."""
+    repo.require_repo()
+    for i, (_new_h, msg) in enumerate(read_reflog_reversed(repo, STASH_REF)):
+        yield f"stash@{{{i}}}", msg.strip()
+
+
 def stash_list(repo: Repository) -> list[tuple[str, str]]:
     """Return [(stash_ref, message), ...] for stash@{0}, stash@{1}, ... (newest first)."""
-    repo.require_repo()
-    entries = read_reflog(repo, STASH_REF)
-    result: list[tuple[str, str]] = []
-    for i, (old_h, new_h, _who, _ts, _tz, msg) in enumerate(reversed(entries)):
-        result.append((f"stash@{{{i}}}", msg.strip()))
-    return result
+    return list(iter_stash(repo))
 
 
 def _stash_commit_for_ref(repo: Repository, ref: str) -> Optional[str]:
@@ -64,12 +71,15 @@ def _stash_commit_for_ref(repo: Repository, ref: str) -> Optional[str]:
             n = int(ref[7:-1])
         except ValueError:
             return None
-        entries = read_reflog(repo, STASH_REF)
-        if n < 0 or n >= len(entries):
+        if n == 0:
+            # The stash ref always points at the newest entry; no need to parse the reflog
+            return resolve_ref(repo.git_dir, STASH_REF)
+        if n < 0:
             return None
-        # entries oldest first; stash@{0} = newest = last entry
-        _, new_h, _, _, _, _ = entries[-(1 + n)]
-        return new_h
+        # newest first, so stash@{n} is the n-th entry; stop reading there
+        for new_h, _msg in islice(read_reflog_reversed(repo, STASH_REF), n, None):
+            return new_h
+        return None
     return None
 
 
@@ -95,7 +105,6 @@ def stash_pop(repo: Repository, ref: Optional[str] = None) -> None:
 
 def _restore_stash(repo: Repository, stash_commit_sha: str) -> None:
     """Restore index and worktree from stash commit (2 parents: head, index commit)."""
-    from .objects import Commit
     obj = repo.load_object(stash_commit_sha)
     if obj.type != "commit":
         raise PygitError("stash entry is not a commit")
@@ -112,18 +121,43 @@ def _restore_stash(repo: Repository, stash_commit_sha: str) -> None:
 
 
 def _tree_hash_for_commit(repo: Repository, commit_sha: str) -> Optional[str]:
-    from .objects import Commit
     obj = repo.load_object(commit_sha)
     if obj.type != "commit":
         return None
     return Commit.from_content(obj.content).tree_hash
 
 
+def _line_start_before(f, end: int) -> int:
+    """Offset where the line ending at end starts, scanning backwards in 4 KiB blocks."""
+    pos = end
+    while pos > 0:
+        step = min(_TAIL_BLOCK, pos)
+        pos -= step
+        f.seek(pos)
+        nl = f.read(step).rfind(b"\n")
+        if nl != -1:
+            return pos + nl + 1
+    return 0
+
+
+def _entry_before(f, end: int) -> Optional[tuple[int, re.Match[str]]]:
+    """(start offset, match) of the last well-formed reflog line ending at or before end; None if there is none.
+    Blank and malformed lines are skipped, exactly as read_reflog skips them, so offsets agree with stash@{n}.
+    """
+    while end >= 0:
+        start = _line_start_before(f, end)
+        f.seek(start)
+        m = _REFLOG_LINE_RE.match(f.read(end - start).decode("utf-8", errors="replace"))
+        if m:
+            return start, m
+        if start == 0:
+            return None
+        end = start - 1
+    return None
+
+
 def _drop_stash_entry(repo: Repository, ref_key: str) -> None:
-    """Remove stash@{0} by updating ref and rewriting reflog."""
-    entries = read_reflog(repo, STASH_REF)
-    if not entries:
-        return
+    """Remove stash@{0}: truncate the last valid reflog entry in place (fsynced), then move the stash ref."""
     if ref_key != "stash@{0}" and ref_key != "stash":
         try:
             n = int(ref_key[7:-1])
@@ -131,25 +165,30 @@ def _drop_stash_entry(repo: Repository, ref_key: str) -> None:
                 raise PygitError("stash pop only supports stash@{0} for now")
         except ValueError:
             return
-    if len(entries) <= 1:
-        path = repo.git_dir / STASH_REF
-        if path.exists():
-            path.unlink()
-    else:
-        _, next_sha, _, _, _, _ = entries[-(1 + 1)]
-        update_ref(repo.git_dir, STASH_REF, next_sha)
     path = repo.git_dir / "logs" / STASH_REF
-    if not path.exists():
+    try:
+        f = open(path, "rb+")
+    except FileNotFoundError:
         return
-    new_lines: list[str] = []
-    for i, (old_h, new_h, who, ts, tz, msg) in enumerate(entries):
-        if i == len(entries) - 1:
-            continue
-        new_lines.append(f"{old_h} {new_h} {who} {ts} {tz}\t{msg}\n")
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text("".join(new_lines))
+    with f:
+        size = f.seek(0, 2)
+        last = _entry_before(f, size)
+        if last is None:
+            return
+        cut = last[0]
+        prev = _entry_before(f, cut - 1) if cut > 0 else None
+        next_sha = prev[1].group(2).lower() if prev is not None else None
+        # Drops the newest entry plus any malformed lines after it; older lines stay as they are
+        f.truncate(cut)
+        # The shortened log reaches disk before the ref is rewritten
+        os.fsync(f.fileno())
+    if next_sha and _is_hex_sha(next_sha):
+        update_ref(repo.git_dir, STASH_REF, next_sha)
+    else:
+        ref_path = repo.git_dir / STASH_REF
+        if ref_path.exists():
+            ref_path.unlink()
 
 
 def _current_branch_for_message(repo: Repository) -> Optional[str]:
-    from .refs import current_branch_name
     return current_branch_name(repo.git_dir)
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Set, Tuple
 
 from .constants import REF_HEADS_PREFIX, REF_TAGS_PREFIX
 from .objectstore import ObjectStore
-from .refs import list_ref_names_with_prefix, resolve_ref
+from .refs import ref_snapshot
 
 
 def is_local_path(url: str) -> bool:
@@ -42,13 +42,7 @@ class LocalTransport:
 
     def list_refs(self) -> List[Tuple[str, str]]:
         """Return [(refname, sha), ...] for refs/heads/* and refs/tags/* (resolved)."""
-        result: List[Tuple[str, str]] = []
-        for prefix in (REF_HEADS_PREFIX, REF_TAGS_PREFIX):
-            for refname in list_ref_names_with_prefix(self.git_dir, prefix):
-                sha = resolve_ref(self.git_dir, refname)
-                if sha:
-                    result.append((refname, sha))
-        return result
+        return sorted(ref_snapshot(self.git_dir, (REF_HEADS_PREFIX, REF_TAGS_PREFIX)).items())
 
     def get_object(self, sha: str) -> bytes:
         """Return raw object bytes (type size\\0content). Raises ObjectNotFoundError."""
@@ -58,6 +52,10 @@ class LocalTransport:
         """Return True if object exists in remote."""
         return self._store.exists(sha)
 
+    def has_objects(self, shas: Iterable[str]) -> Set[str]:
+        """Return the subset of shas that exist in remote (batched directory scan)."""
+        return self._store.has_objects(shas)
+
 
 # Dumb HTTP transport: implemented in http_dumb.py for clone/fetch over http(s).
 from .http_dumb import HttpDumbTransport as DumbHttpTransport
@@ -2,68 +2,140 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import socket
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Deque, List, Optional, Set, Tuple
 
 from .constants import SHA1_HEX_LEN
 from .errors import PygitError
 from .idx import write_idx
 from .pack import PACK_SIGNATURE, get_pack_sha_offsets
-from .pkt_line import pkt_encode_line, pkt_flush, pkt_parse_refs
-from .util import sha1_hash, write_bytes
+from .pkt_line import pkt_encode, pkt_encode_line, pkt_flush, pkt_parse_refs
+from .util import _write_all
 
 if TYPE_CHECKING:
     from .repo import Repository
 
+# Received pack chunks allowed to queue up for the writer thread before recv() waits for it
+_WRITE_AHEAD = 16
+# "<len>want <sha>\n" / "<len>have <sha>\n": fixed length once the sha is validated
+_WANT_LINE = b"%04xwant %%s\n" % (4 + 5 + SHA1_HEX_LEN + 1)
+_HAVE_LINE = b"%04xhave %%s\n" % (4 + 5 + SHA1_HEX_LEN + 1)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    """Receive up to n bytes, looping over short reads; fewer only if the peer closes."""
+    buf = bytearray()
+    while len(buf) < n:
+        part = sock.recv(min(65536, n - len(buf)))
+        if not part:
+            break
+        buf.extend(part)
+    return bytes(buf)
+
+
+_PKT_MORE, _PKT_FLUSH, _PKT_BAD = 0, 1, 2
+
 
 def _pkt_read_from_sock(sock: socket.socket, timeout: float = 30.0) -> bytes:
-    """Read pkt-line stream from socket until flush; return all bytes (including flush)."""
+    """Read pkt-line stream from socket until flush; return all bytes (including flush).
+
+    Data is peeked 64 KiB at a time and every complete pkt-line in the window is consumed with one recv,
+    so a long advertisement costs a few syscalls rather than two per line. Nothing past the flush is read.
+    """
     sock.settimeout(timeout)
-    chunks: List[bytes] = []
-    while True:
-        try:
-            head = sock.recv(4)
-        except (socket.timeout, OSError) as e:
-            raise PygitError(f"upload-pack read: {e}") from e
-        if len(head) < 4:
-            break
+    out = bytearray()
+    try:
+        while True:
+            window = sock.recv(65536, socket.MSG_PEEK)
+            if not window:
+                break
+            pos, state = _scan_pkts(window)
+            if state == _PKT_FLUSH:
+                out.extend(_recv_exact(sock, pos + 4))
+                break
+            if pos:
+                out.extend(_recv_exact(sock, pos))
+            if state == _PKT_BAD:
+                _recv_exact(sock, 4)  # drop the malformed length header and stop
+                break
+            if not pos:
+                # Only part of the next pkt-line has arrived: block on it directly
+                head = _recv_exact(sock, 4)
+                if len(head) < 4:
+                    break
+                try:
+                    length = int(head.decode("ascii"), 16)
+                except ValueError:
+                    break
+                out.extend(head)
+                if length == 0:
+                    break
+                if length > 4:
+                    out.extend(_recv_exact(sock, length - 4))
+    except (socket.timeout, OSError) as e:
+        raise PygitError(f"upload-pack read: {e}") from e
+    return bytes(out)
+
+
+def _scan_pkts(window: bytes) -> Tuple[int, int]:
+    """Length of the complete pkt-lines at the start of window, and what stopped the scan."""
+    pos = 0
+    n = len(window)
+    while pos + 4 <= n:
         try:
-            length = int(head.decode("ascii"), 16)
+            length = int(window[pos : pos + 4].decode("ascii"), 16)
         except ValueError:
-            break
+            return pos, _PKT_BAD
         if length == 0:
-            chunks.append(head)
+            return pos, _PKT_FLUSH
+        end = pos + max(length, 4)
+        if end > n:
             break
-        rest = length - 4
-        if rest > 0:
-            got = b""
-            while len(got) < rest:
-                part = sock.recv(min(65536, rest - len(got)))
-                if not part:
-                    break
-                got += part
-            chunks.append(head + got)
-        else:
-            chunks.append(head)
-    return b"".join(chunks)
-
-
-def _send_pkt(sock: socket.socket, data: bytes) -> None:
-    sock.sendall(data)
+        pos = end
+    return pos, _PKT_MORE
 
 
 def upload_pack_advertise(sock: socket.socket, path: str = "/", timeout: float = 30.0) -> List[Tuple[str, str]]:
     """Send upload-pack advertise request; read ref advertisement. Returns [(refname, sha), ...]."""
-    line = f"git-upload-pack {path}\0"
-    if len(line) + 4 > 65524:
-        raise PygitError("path too long")
-    pkt = f"{4 + len(line):04x}".encode() + line.encode("utf-8")
-    _send_pkt(sock, pkt + pkt_flush())
+    try:
+        pkt = pkt_encode(f"git-upload-pack {path}\0".encode("utf-8"))
+    except ValueError:
+        raise PygitError("path too long") from None
+    sock.sendall(pkt + pkt_flush())
     data = _pkt_read_from_sock(sock, timeout=timeout)
     return pkt_parse_refs(data)
 
 
+def _send_want_have_done(sock: socket.socket, want: List[str], have: Optional[Set[str]]) -> None:
+    """Send every want/have line plus done and flush with one sendall; nothing is sent if a want is invalid.
+
+    Inputs are validated once up front (wants raise, malformed haves are dropped), so every line has
+    the same length and is formatted from a fixed template without per-line pkt encoding.
+    """
+    for sha in want:
+        if len(sha) != SHA1_HEX_LEN or not sha.isascii():
+            raise PygitError(f"invalid want sha: {sha}")
+    haves = [sha for sha in have or () if len(sha) == SHA1_HEX_LEN and sha.isascii()]
+    lines = [_WANT_LINE % sha.encode("ascii") for sha in want]
+    lines += [_HAVE_LINE % sha.encode("ascii") for sha in haves]
+    lines.append(pkt_encode_line("done"))
+    lines.append(pkt_flush())
+    sock.sendall(b"".join(lines))
+
+
+def _extend_and_find_pack(preamble: bytearray, chunk: bytes) -> int:
+    """Append chunk to preamble; return where PACK_SIGNATURE starts, or -1. Only the new bytes (plus overlap) are scanned."""
+    scan_from = max(0, len(preamble) - len(PACK_SIGNATURE) + 1)
+    preamble.extend(chunk)
+    return preamble.find(PACK_SIGNATURE, scan_from)
+
+
 def upload_pack_fetch(
     sock: socket.socket,
     want: List[str],
@@ -71,34 +143,96 @@ def upload_pack_fetch(
     timeout: float = 30.0,
 ) -> bytes:
     """Send want/have/done; read pack data from socket. Returns raw pack bytes (with trailer)."""
-    have = have or set()
-    for sha in want:
-        if len(sha) != SHA1_HEX_LEN:
-            raise PygitError(f"invalid want sha: {sha}")
-        _send_pkt(sock, pkt_encode_line(f"want {sha}"))
-    for sha in have:
-        if len(sha) != SHA1_HEX_LEN:
-            continue
-        _send_pkt(sock, pkt_encode_line(f"have {sha}"))
-    _send_pkt(sock, pkt_encode_line("done"))
-    _send_pkt(sock, pkt_flush())
+    _send_want_have_done(sock, want, have)
     sock.settimeout(timeout)
-    buf = b""
+    preamble = bytearray()  # NAK etc. until PACK_SIGNATURE shows up; only this part is ever scanned
+    pack: Optional[bytearray] = None  # extend() is amortized O(1); bytes += would recopy the whole pack per chunk
     try:
         while True:
             chunk = sock.recv(65536)
             if not chunk:
                 break
-            buf += chunk
+            if pack is not None:
+                pack.extend(chunk)
+                continue
+            start = _extend_and_find_pack(preamble, chunk)
+            if start != -1:
+                pack = bytearray(memoryview(preamble)[start:])
     except socket.timeout:
         pass
-    pack_start = buf.find(PACK_SIGNATURE)
-    if pack_start == -1:
+    if pack is None:
         raise PygitError("upload-pack: no pack data received")
-    pack_bytes = buf[pack_start:]
-    if len(pack_bytes) < 12 + 20:
+    if len(pack) < 12 + 20:
         raise PygitError("upload-pack: pack too short")
-    return pack_bytes
+    return bytes(pack)
+
+
+def upload_pack_fetch_to_dir(
+    sock: socket.socket,
+    want: List[str],
+    pack_dir: Path,
+    have: Optional[Set[str]] = None,
+    timeout: float = 30.0,
+) -> Path:
+    """Like upload_pack_fetch, but stream the pack into pack_dir/pack-<sha>.pack and verify its trailing checksum.
+
+    A single writer thread writes and SHA-1s each chunk while the next recv() is in flight; both release
+    the GIL, so disk and hash work overlap the network. At most _WRITE_AHEAD chunks are queued.
+    """
+    _send_want_have_done(sock, want, have)
+    sock.settimeout(timeout)
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=pack_dir, prefix=".tmp_pack_")
+    hasher = hashlib.sha1(usedforsecurity=False)
+    held = [b""]  # last 20 bytes seen: the trailer is not part of its own checksum
+
+    def write_chunk(chunk: bytes) -> None:
+        _write_all(fd, chunk)
+        data = held[0] + chunk
+        hasher.update(data[:-20])
+        held[0] = data[-20:]
+
+    try:
+        try:
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                pending: Deque[Future] = deque()
+                before_pack = bytearray()  # NAK etc. until PACK_SIGNATURE shows up
+                in_pack = False
+                size = 0
+                try:
+                    while True:
+                        chunk = sock.recv(65536)
+                        if not chunk:
+                            break
+                        if not in_pack:
+                            start = _extend_and_find_pack(before_pack, chunk)
+                            if start == -1:
+                                continue
+                            in_pack = True
+                            chunk = bytes(before_pack[start:])
+                        pending.append(writer.submit(write_chunk, chunk))
+                        size += len(chunk)
+                        if len(pending) > _WRITE_AHEAD:
+                            pending.popleft().result()
+                except socket.timeout:
+                    pass
+                for fut in pending:
+                    fut.result()
+        finally:
+            os.close(fd)
+        if not in_pack:
+            raise PygitError("upload-pack: no pack data received")
+        if size < 12 + 20:
+            raise PygitError("upload-pack: pack too short")
+        if hasher.digest() != held[0]:
+            raise PygitError("upload-pack: pack checksum mismatch")
+        pack_path = pack_dir / f"pack-{held[0].hex()}.pack"
+        os.replace(tmp, pack_path)
+        return pack_path
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
 
 
 def fetch_via_upload_pack_tcp(
@@ -119,28 +253,21 @@ def fetch_via_upload_pack_tcp(
         raise PygitError(f"upload-pack connect: {e}") from e
     try:
         refs = upload_pack_advertise(sock, path=path, timeout=timeout)
-        want_shas = []
-        for ref in want_refs:
-            sha = next((s for r, s in refs if r == ref), None)
-            if sha:
-                want_shas.append(sha)
+        # First advertisement of a name wins, as with a linear scan
+        refs_map = dict(reversed(refs))
+        want_shas = [refs_map[ref] for ref in want_refs if refs_map.get(ref)]
         if not want_shas:
             return
-        have_shas: Set[str] = set()
-        from .refs import resolve_ref
-        for name in ["refs/heads/main", "HEAD"]:
-            sha = resolve_ref(repo.git_dir, name)
-            if sha:
-                have_shas.add(sha)
-        pack_bytes = upload_pack_fetch(sock, want=want_shas, have=have_shas, timeout=timeout)
+        from .refs import _read_packed_refs, head_commit, resolve_ref
+        packed = _read_packed_refs(repo.git_dir)
+        haves = (resolve_ref(repo.git_dir, "refs/heads/main", _packed=packed), head_commit(repo.git_dir, _packed=packed))
+        have_shas: Set[str] = {sha for sha in haves if sha}
+        pack_path = upload_pack_fetch_to_dir(
+            sock, want=want_shas, pack_dir=repo.git_dir / "objects" / "pack", have=have_shas, timeout=timeout
+        )
     finally:
         sock.close()
-    objects_dir = repo.git_dir / "objects"
-    pack_dir = objects_dir / "pack"
-    pack_dir.mkdir(parents=True, exist_ok=True)
-    pack_sha = pack_bytes[-20:].hex()
-    pack_path = pack_dir / f"pack-{pack_sha}.pack"
-    write_bytes(pack_path, pack_bytes)
+    pack_sha = pack_path.stem[len("pack-") :]
 
     def get_base(s: str) -> bytes:
         return repo.odb._raw_load(s)
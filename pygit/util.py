@@ -3,16 +3,40 @@
 from __future__ import annotations
 
 import hashlib
+import mmap
 import os
 import tempfile
 import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+# Files at least this large are memory-mapped instead of read into a bytes object
+MMAP_THRESHOLD = 1 << 20
+# Largest slice handed to a single os.write; big payloads are written in pieces of this size
+WRITE_CHUNK = 1 << 20
+# Fresh SHA-1 state; copying it is cheaper than constructing a hasher per call.
+# SHA-1 names content here, it is not a security control, so FIPS-restricted builds must still allow it.
+_SHA1_PROTO = hashlib.sha1(usedforsecurity=False)
+# Linux O_TMPFILE for atomic writes; switched off for the process after the first unsupported use
+_O_TMPFILE = getattr(os, "O_TMPFILE", 0)
+_TMPFILE_USABLE = bool(_O_TMPFILE)
 
 
 def sha1_hash(data: bytes) -> str:
     """Compute SHA-1 hex digest of data."""
-    return hashlib.sha1(data).hexdigest()
+    h = _SHA1_PROTO.copy()
+    h.update(data)
+    return h.hexdigest()
+
+
+def sha1_hash_parts(*chunks: bytes) -> str:
+    """SHA-1 hex digest of the concatenation of chunks, without building it."""
+    h = _SHA1_PROTO.copy()
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
 
 
 def read_bytes(path: Path) -> bytes:
@@ -20,49 +44,143 @@ def read_bytes(path: Path) -> bytes:
     return path.read_bytes()
 
 
+@contextmanager
+def map_file(path: Path) -> Iterator[bytes]:
+    """Yield file content as a read-only buffer. Files >= MMAP_THRESHOLD are mmapped (no copy); smaller ones are read."""
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            yield fh.read()
+            return
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
 def write_bytes_atomic(path: Path, data: bytes) -> None:
     """Write bytes to file atomically (temp then replace)."""
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+    write_chunks_atomic(path, (data,))
+
+
+def _write_all(fd: int, data: bytes | memoryview) -> None:
+    """Write all of data to fd in WRITE_CHUNK memoryview slices (no copies; short writes are resumed)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view[:WRITE_CHUNK]):]
+
+
+def _open_anonymous_tmp(directory: Path) -> Optional[int]:
+    """Open an unnamed O_TMPFILE in directory, or None where that is unavailable (non-Linux, unsupported fs)."""
+    global _TMPFILE_USABLE
+    if not _TMPFILE_USABLE:
+        return None
+    try:
+        return os.open(directory, _O_TMPFILE | os.O_RDWR, 0o600)
+    except OSError:
+        _TMPFILE_USABLE = False
+        return None
+
+
+def _link_anonymous_tmp(fd: int, path: Path) -> bool:
+    """Give the O_TMPFILE fd the name path, replacing any existing file. False if the kernel refuses the link."""
+    global _TMPFILE_USABLE
+    proc_path = f"/proc/self/fd/{fd}"
+    try:
+        os.link(proc_path, path)
+        return True
+    except FileExistsError:
+        pass
+    except OSError:
+        _TMPFILE_USABLE = False
+        return False
+    # path already exists: link under a private name, then rename over it atomically
+    tmp = path.parent / f".tmp_{os.urandom(6).hex()}"
+    try:
+        os.link(proc_path, tmp)
+    except OSError:
+        # EEXIST on path is reported before the link itself is attempted, so this can still be unsupported
+        _TMPFILE_USABLE = False
+        return False
     try:
-        os.write(fd, data)
-        os.close(fd)
         os.replace(tmp, path)
     except Exception:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def _write_chunks_named_tmp(path: Path, chunks: Iterable[bytes | memoryview]) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+    try:
         try:
+            for chunk in chunks:
+                _write_all(fd, chunk)
+        finally:
             os.close(fd)
-        except OSError:
-            pass
+        os.replace(tmp, path)
+    except Exception:
         if os.path.exists(tmp):
             os.unlink(tmp)
         raise
 
 
+def write_chunks_atomic(path: Path, chunks: Iterable[bytes | memoryview]) -> None:
+    """Write an iterable of byte chunks (bytes or memoryview) to file atomically (temp then replace).
+
+    On Linux the data goes to an unnamed O_TMPFILE that is linked in once complete; elsewhere, or if
+    linking it fails, a named mkstemp file is used.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = _open_anonymous_tmp(path.parent)
+    if fd is None:
+        _write_chunks_named_tmp(path, chunks)
+        return
+    try:
+        for chunk in chunks:
+            _write_all(fd, chunk)
+        if not _link_anonymous_tmp(fd, path):
+            # chunks may be a one-shot iterator: copy what was already written
+            os.lseek(fd, 0, os.SEEK_SET)
+            _write_chunks_named_tmp(path, iter(lambda: os.read(fd, WRITE_CHUNK), b""))
+    finally:
+        os.close(fd)
+
+
 def write_bytes(path: Path, data: bytes) -> None:
     """Write bytes to file. Uses atomic write (temp then rename). Alias for write_bytes_atomic."""
     write_bytes_atomic(path, data)
 
 
+def write_file_direct(path: str | Path, data: bytes) -> None:
+    """Create or truncate path and write data with raw os calls (not atomic); parent must exist. For checkout loops."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
 def write_text_atomic(path: Path, text: str) -> None:
     """Write text to file atomically."""
     write_bytes(path, text.encode("utf-8"))
 
 
-def read_text_safe(path: Path) -> Optional[str]:
-    """Read file as text; return None if not found or error."""
+def read_text_safe(path: str | Path) -> Optional[str]:
+    """Read file as text; return None if not found or error. Accepts a plain string path to skip Path building."""
     try:
-        return path.read_text(encoding="utf-8")
+        with open(path, encoding="utf-8") as f:
+            return f.read()
     except (FileNotFoundError, OSError):
         return None
 
 
-def timezone_offset_utc() -> str:
-    """Return local timezone offset as string e.g. +0530 or -0800."""
-    if time.daylight:
-        offset_sec = -time.altzone
-    else:
-        offset_sec = -time.timezone
+@lru_cache(maxsize=1)
+def _tz_cached(timezone: int, altzone: int, daylight: int) -> str:
+    """Format the offset for one (timezone, altzone, daylight) setting; cached since it rarely changes."""
+    offset_sec = -altzone if daylight else -timezone
     sign = "+" if offset_sec >= 0 else "-"
     abs_sec = abs(offset_sec)
     hours = abs_sec // 3600
@@ -70,6 +188,11 @@ def timezone_offset_utc() -> str:
     return f"{sign}{hours:02d}{minutes:02d}"
 
 
+def timezone_offset_utc() -> str:
+    """Return local timezone offset as string e.g. +0530 or -0800."""
+    return _tz_cached(time.timezone, time.altzone, time.daylight)
+
+
 def timestamp_with_tz(timestamp: Optional[int] = None) -> tuple[int, str]:
     """Return (timestamp, tz_offset). Uses current time if timestamp is None."""
     ts = int(time.time()) if timestamp is None else timestamp
@@ -94,9 +217,15 @@ def timestamp_from_env(kind: str) -> Optional[tuple[int, str]]:
         return None
 
 
+@lru_cache(maxsize=128)
+def _resolve_root(repo_root: Path) -> Path:
+    """repo_root.resolve(), cached: roots are resolved once per process instead of once per path."""
+    return repo_root.resolve()
+
+
 def normalize_path(repo_root: Path, path: str) -> Path:
     """Resolve path relative to repo root; reject paths escaping root."""
-    repo_root = repo_root.resolve()
+    repo_root = _resolve_root(repo_root)
     resolved = (repo_root / path).resolve()
     try:
         resolved.relative_to(repo_root)
@@ -105,18 +234,28 @@ def normalize_path(repo_root: Path, path: str) -> Path:
     return resolved
 
 
+def is_executable_mode(mode: int) -> bool:
+    """Return True if st_mode has an executable bit set; for callers that already hold a stat (e.g. DirEntry.stat())."""
+    return (mode & 0o111) != 0
+
+
 def is_executable(path: Path) -> bool:
     """Return True if file has executable bit set (for mode 100755)."""
     try:
-        st = path.stat()
-        return (st.st_mode & 0o111) != 0
+        return is_executable_mode(path.stat().st_mode)
     except OSError:
         return False
 
 
+# Like git, only the first few bytes of a blob are sniffed for binary content
+BINARY_SNIFF_LEN = 8000
+_PRINTABLE_BYTES = bytes([9, 10, 13]) + bytes(range(32, 256))
+
+
 def is_binary(data: bytes) -> bool:
-    """Heuristic: treat as binary if contains null or many non-printable bytes."""
-    if b"\0" in data:
+    """Heuristic on the first BINARY_SNIFF_LEN bytes: binary if they contain null or many non-printable bytes."""
+    head = data[:BINARY_SNIFF_LEN]
+    if b"\0" in head:
         return True
-    non_printable = sum(1 for b in data[:8000] if b < 32 and b not in (9, 10, 13))
-    return non_printable > len(data[:8000]) // 4
+    # Deleting every printable byte in C leaves exactly the control characters to count
+    return len(head.translate(None, _PRINTABLE_BYTES)) > len(head) // 4
@@ -0,0 +1,41 @@
+"""pytest setup: keep scratch repositories on tmpfs when the platform has one."""
+
+import os
+import shutil
+import sys
+import tempfile
+from typing import Optional
+
+_SHM_ROOT = "/dev/shm"
+_tmp: Optional[str] = None
+
+
+def _ram_tmpdir() -> Optional[str]:
+    """Create a private directory under /dev/shm for this process, or return None to keep the default temp dir."""
+    if not sys.platform.startswith("linux") or os.environ.get("TMPDIR"):
+        return None
+    if not os.path.isdir(_SHM_ROOT) or not os.access(_SHM_ROOT, os.W_OK):
+        return None
+    try:
+        return tempfile.mkdtemp(prefix="pygit-tests-", dir=_SHM_ROOT)
+    except OSError:
+        return None
+
+
+def pytest_configure(config) -> None:
+    """Point tempfile at tmpfs; every mkdtemp() in the suite follows. Setting TMPDIR opts out.
+    Each process (including pytest-xdist workers) gets its own directory.
+    """
+    global _tmp
+    _tmp = _ram_tmpdir()
+    if _tmp is not None:
+        tempfile.tempdir = _tmp
+
+
+def pytest_unconfigure(config) -> None:
+    """Drop the tmpfs directory so leftover test repos do not hold on to RAM."""
+    global _tmp
+    if _tmp is not None:
+        tempfile.tempdir = None
+        shutil.rmtree(_tmp, ignore_errors=True)
+        _tmp = None
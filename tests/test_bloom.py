@@ -0,0 +1,105 @@
+"""Tests for the SHA-1 Bloom filter and its use in ObjectStore pack lookups."""
+
+import hashlib
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pygit.bloom import ShaBloomFilter
+from pygit.objectstore import BLOOM_MIN_QUERIES
+from pygit.gc import gc, reachable_objects
+from pygit.porcelain import add_path, commit
+from pygit.repo import Repository
+
+
+def _shas(start: int, count: int) -> list[str]:
+    return [hashlib.sha1(str(i).encode()).hexdigest() for i in range(start, start + count)]
+
+
+class TestShaBloomFilter(unittest.TestCase):
+    def test_no_false_negatives_and_few_false_positives(self) -> None:
+        added = _shas(0, 2000)
+        bloom = ShaBloomFilter.from_shas(added, len(added))
+        self.assertTrue(all(sha in bloom for sha in added))
+        self.assertTrue(all(sha.upper() in bloom for sha in added[:50]))
+        false_hits = sum(sha in bloom for sha in _shas(10_000, 2000))
+        self.assertLess(false_hits, 100)
+
+    def test_empty_filter_rejects_everything(self) -> None:
+        bloom = ShaBloomFilter(0)
+        self.assertFalse(any(sha in bloom for sha in _shas(0, 100)))
+
+
+class TestObjectStorePackFilter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp(prefix="pygit_bloom_"))
+        self.repo = Repository(str(self.tmp))
+        self.repo.init()
+        (self.tmp / "f").write_text("hello\n")
+        add_path(self.repo, "f")
+        commit(self.repo, "first", "A <a@b.c>")
+
+    def test_packed_objects_found_through_filter(self) -> None:
+        odb = self.repo.odb
+        self.assertFalse(odb.is_in_any_pack("a" * 40))
+        gc(self.repo, prune_loose=True)
+        objs = reachable_objects(self.repo)
+        self.assertTrue(objs)
+        for sha in objs:
+            self.assertTrue(odb.is_in_any_pack(sha))
+            self.assertTrue(odb.exists(sha))
+        self.assertEqual(odb.has_objects(list(objs) + ["0" * 40]), set(objs))
+        self.assertFalse(odb.exists("0" * 40))
+        self.assertFalse(odb.is_in_any_pack("not-hex-" + "0" * 32))
+
+    def test_filter_built_only_for_batches_or_many_queries(self) -> None:
+        gc(self.repo, prune_loose=True)
+        odb = self.repo.odb
+        objs = sorted(reachable_objects(self.repo))
+        for sha in objs:
+            self.assertTrue(odb.exists(sha))
+            self.assertTrue(odb.is_in_any_pack(sha))
+        self.assertIsNone(odb._pack_bloom)
+        absent = _shas(0, BLOOM_MIN_QUERIES)
+        # Each pending sha counts once towards the threshold
+        self.assertEqual(odb.has_objects(absent[: BLOOM_MIN_QUERIES // 2 + 1]), set())
+        self.assertIsNone(odb._pack_bloom)
+        self.assertEqual(odb.has_objects(objs + absent), set(objs))
+        self.assertIsNotNone(odb._pack_bloom)
+        odb.rescan_packs()
+        self.assertIsNone(odb._pack_bloom)
+        for sha in absent:
+            self.assertFalse(odb.exists(sha))
+        self.assertIsNotNone(odb._pack_bloom)
+
+    def test_concurrent_batches_build_filter_once(self) -> None:
+        gc(self.repo, prune_loose=True)
+        odb = self.repo.odb
+        absent = _shas(0, BLOOM_MIN_QUERIES)
+        real = ShaBloomFilter.from_shas
+        calls = []
+        start = threading.Barrier(8)
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.05)  # widen the window for a second builder
+            return real(*args, **kwargs)
+
+        def query() -> None:
+            start.wait()
+            odb.has_objects(absent)
+
+        with mock.patch.object(ShaBloomFilter, "from_shas", side_effect=counting):
+            threads = [threading.Thread(target=query) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
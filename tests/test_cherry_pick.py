@@ -1,5 +1,6 @@
 """Tests for cherry-pick: clean apply, conflict, continue, abort."""
 
+import json
 import tempfile
 import unittest
 from pathlib import Path
@@ -8,6 +9,7 @@ from pygit.config import set_value
 from pygit.errors import PygitError
 from pygit.plumbing import rev_parse
 from pygit.porcelain import (
+    CherryPickContext,
     add_path,
     cherry_pick,
     cherry_pick_abort,
@@ -16,7 +18,7 @@ from pygit.porcelain import (
     commit,
 )
 from pygit.reflog import read_reflog
-from pygit.repo import Repository
+from pygit.repo import Repository, tree_hash_for_commit
 
 
 class TestCherryPickClean(unittest.TestCase):
@@ -57,6 +59,32 @@ class TestCherryPickClean(unittest.TestCase):
 
         self.assertEqual((self.repo_dir / "file.txt").read_text(), "feature\n")
 
+    def test_shared_context_chains_picks(self) -> None:
+        (self.repo_dir / "file.txt").write_text("base\n")
+        add_path(self.repo, "file.txt")
+        commit(self.repo, "commit A", author="Alice <alice@example.com>")
+
+        checkout_branch(self.repo, "feature", create=True)
+        picks = []
+        for name in ("b.txt", "c.txt"):
+            (self.repo_dir / name).write_text(name + "\n")
+            add_path(self.repo, name)
+            commit(self.repo, f"add {name}", author="Alice <alice@example.com>")
+            picks.append(rev_parse(self.repo, "HEAD"))
+
+        checkout_branch(self.repo, "main", create=False)
+        for name in ("b.txt", "c.txt"):
+            (self.repo_dir / name).unlink(missing_ok=True)
+        ctx = CherryPickContext()
+        for sha in picks:
+            cherry_pick(self.repo, sha, ctx)
+
+        head = rev_parse(self.repo, "HEAD")
+        self.assertEqual(ctx.head, head)
+        self.assertEqual(ctx.tree_of(self.repo, head), tree_hash_for_commit(self.repo, head))
+        self.assertEqual((self.repo_dir / "c.txt").read_text(), "c.txt\n")
+        self.assertEqual(ctx.branch_and_author(self.repo), ("main", "Alice <alice@example.com>"))
+
         reflog = read_reflog(self.repo, "HEAD")
         messages = [e[5] for e in reflog]
         self.assertTrue(any("cherry-pick" in m for m in messages))
@@ -103,9 +131,9 @@ class TestCherryPickConflict(unittest.TestCase):
         self.assertIn("theirs", content)
 
         pygit_dir = self.repo.git_dir / "pygit"
-        self.assertTrue((pygit_dir / "CHERRY_PICK_HEAD").exists())
-        self.assertTrue((pygit_dir / "CHERRY_PICK_ORIG_HEAD").exists())
-        self.assertTrue((pygit_dir / "CHERRY_PICK_MSG").exists())
+        state = json.loads((pygit_dir / "CHERRY_PICK_STATE.json").read_text())
+        self.assertEqual(set(state), {"pick", "orig", "msg", "conflicts"})
+        self.assertFalse((pygit_dir / "CHERRY_PICK_HEAD").exists())
 
 
 class TestCherryPickContinue(unittest.TestCase):
@@ -148,7 +176,7 @@ class TestCherryPickContinue(unittest.TestCase):
         self.assertEqual((self.repo_dir / "conflict.txt").read_text(), "resolved\n")
 
         pygit_dir = self.repo.git_dir / "pygit"
-        self.assertFalse((pygit_dir / "CHERRY_PICK_HEAD").exists())
+        self.assertFalse((pygit_dir / "CHERRY_PICK_STATE.json").exists())
 
         reflog = read_reflog(self.repo, "HEAD")
         messages = [e[5] for e in reflog]
@@ -192,7 +220,7 @@ class TestCherryPickAbort(unittest.TestCase):
         self.assertEqual((self.repo_dir / "conflict.txt").read_text(), "ours\n")
 
         pygit_dir = self.repo.git_dir / "pygit"
-        self.assertFalse((pygit_dir / "CHERRY_PICK_HEAD").exists())
+        self.assertFalse((pygit_dir / "CHERRY_PICK_STATE.json").exists())
 
         reflog = read_reflog(self.repo, "HEAD")
         messages = [e[5] for e in reflog]
@@ -1,21 +1,21 @@
 """Tests for compat harness: compare helpers and runner smoke."""
 
-import sys
+import io
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
 
-# Ensure repo root is on path for compat import
-_repo_root = Path(__file__).resolve().parent.parent
-if str(_repo_root) not in sys.path:
-    sys.path.insert(0, str(_repo_root))
-
+from compat.backends import git_available
 from compat.compare import (
     compare_clean,
     compare_refs,
     compare_rev_list,
     compare_tree_maps,
 )
-from compat.runner import load_scenario
+from compat.runner import load_scenario, run_scenario
+
+# compat/ is importable from the repo root: pytest adds it via pythonpath, unittest via PYTHONPATH=.
+_repo_root = Path(__file__).resolve().parent.parent
 
 
 class TestCompareRefs(unittest.TestCase):
@@ -95,26 +95,49 @@ class TestLoadScenario(unittest.TestCase):
         self.assertIsNotNone(ops)
         self.assertEqual(ops[0].get("op"), "init")
 
+    def test_cached_ops_not_shared(self) -> None:
+        ops = load_scenario("S1_linear_commits")
+        ops[0]["op"] = "mutated"
+        ops.clear()
+        again = load_scenario("S1_linear_commits")
+        self.assertEqual(again[0].get("op"), "init")
+
     def test_unknown_returns_none(self) -> None:
         self.assertIsNone(load_scenario("nonexistent_scenario_xyz"))
 
 
-class TestRunnerSmoke(unittest.TestCase):
-    """Smoke test: run S1 if system git is available."""
+# Scenarios that currently match system git step for step; S2/S3/S7/S8 still diverge (checkout leaves
+# stale files, tag -m, stash ref), so they are left out until those are fixed.
+SMOKE_SCENARIOS = ("S1_linear_commits", "S4_reset", "S5_restore", "S6_status")
 
-    def test_run_s1_linear_commits(self) -> None:
-        from compat.backends import git_available
-        from compat.runner import run_scenario
+_HAS_GIT = git_available()
 
-        if not git_available():
-            self.skipTest("system git not found")
-        ops = load_scenario("S1_linear_commits")
+
+@unittest.skipUnless(_HAS_GIT, "system git not found")
+class TestRunnerSmoke(unittest.TestCase):
+    """Smoke tests: run scenarios against system git if available. One test per scenario so pytest -n can spread them."""
+
+    def _run_scenario(self, name: str) -> None:
+        ops = load_scenario(name)
         self.assertIsNotNone(ops)
-        code = run_scenario(
-            ops,
-            _repo_root,
-            keep=False,
-            verbose=False,
-            failfast=True,
-        )
-        self.assertEqual(code, 0, "S1_linear_commits should pass git vs pygit")
+        with redirect_stdout(io.StringIO()):
+            code = run_scenario(
+                ops,
+                _repo_root,
+                keep=False,
+                verbose=False,
+                failfast=True,
+            )
+        self.assertEqual(code, 0, f"{name} should pass git vs pygit")
+
+
+def _smoke_test(name: str):
+    def test(self: TestRunnerSmoke) -> None:
+        self._run_scenario(name)
+
+    test.__doc__ = f"Run {name} in git and pygit and compare after every step."
+    return test
+
+
+for _name in SMOKE_SCENARIOS:
+    setattr(TestRunnerSmoke, f"test_run_{_name.lower()}", _smoke_test(_name))
@@ -1,12 +1,11 @@
 """Tests for config: get/set/list/unset, commit and tag use config identity."""
 
 import io
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 
-from pygit.config import get_user_identity, get_value, list_values, set_value, unset_value
+from pygit.config import get_user_identity, get_value, list_values, set_value, set_values, unset_value
 from pygit.errors import InvalidConfigKeyError, PygitError
 from pygit.plumbing import cat_file_pretty
 from pygit.porcelain import (
@@ -37,8 +36,7 @@ class TestConfigGetSetListUnset(unittest.TestCase):
         self.assertEqual(get_value(self.repo, "user.email"), "alice@example.com")
 
     def test_config_list_contains_both(self) -> None:
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
         pairs = list_values(self.repo)
         keys = [k for k, _ in pairs]
         self.assertIn("user.name", keys)
@@ -48,8 +46,7 @@ class TestConfigGetSetListUnset(unittest.TestCase):
         self.assertEqual(d.get("user.email"), "alice@example.com")
 
     def test_config_unset_removes(self) -> None:
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
         ok = unset_value(self.repo, "user.email")
         self.assertTrue(ok)
         self.assertIsNone(get_value(self.repo, "user.email"))
@@ -66,6 +63,18 @@ class TestConfigGetSetListUnset(unittest.TestCase):
         keys = [k for k, _ in pairs]
         self.assertEqual(keys, sorted(keys))
 
+    def test_config_get_sees_external_edit(self) -> None:
+        set_value(self.repo, "user.name", "Alice")
+        self.assertEqual(get_value(self.repo, "user.name"), "Alice")
+        cfg_path = self.repo.git_dir / "config"
+        cfg_path.write_text(cfg_path.read_text().replace("Alice", "Carol-Ann"))
+        self.assertEqual(get_value(self.repo, "user.name"), "Carol-Ann")
+
+    def test_config_set_values_rejects_batch_with_invalid_key(self) -> None:
+        with self.assertRaises(InvalidConfigKeyError):
+            set_values(self.repo, {"user.name": "Alice", "invalid": "x"})
+        self.assertIsNone(get_value(self.repo, "user.name"))
+
     def test_config_invalid_key_raises(self) -> None:
         with self.assertRaises(InvalidConfigKeyError):
             set_value(self.repo, "invalid", "x")
@@ -81,8 +90,7 @@ class TestCommitUsesConfigIdentity(unittest.TestCase):
         self.repo_dir = Path(d)
         self.repo = Repository(str(self.repo_dir))
         self.repo.init()
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
         (self.repo_dir / "f").write_text("x")
         add_path(self.repo, "f")
         self.commit_hash = commit(
@@ -92,12 +100,7 @@ class TestCommitUsesConfigIdentity(unittest.TestCase):
 
     def test_commit_author_from_config(self) -> None:
         out = io.StringIO()
-        old = sys.stdout
-        sys.stdout = out
-        try:
-            cat_file_pretty(self.repo, self.commit_hash or "")
-        finally:
-            sys.stdout = old
+        cat_file_pretty(self.repo, self.commit_hash or "", out=out)
         text = out.getvalue()
         self.assertIn("Alice <alice@example.com>", text)
 
@@ -110,8 +113,7 @@ class TestAnnotatedTagUsesConfigIdentity(unittest.TestCase):
         self.repo_dir = Path(d)
         self.repo = Repository(str(self.repo_dir))
         self.repo.init()
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
         (self.repo_dir / "f").write_text("x")
         add_path(self.repo, "f")
         commit(self.repo, "First", author="PyGit <p@x.com>")
@@ -125,11 +127,6 @@ class TestAnnotatedTagUsesConfigIdentity(unittest.TestCase):
 
     def test_tag_tagger_from_config(self) -> None:
         out = io.StringIO()
-        old = sys.stdout
-        sys.stdout = out
-        try:
-            cat_file_pretty(self.repo, "v1")
-        finally:
-            sys.stdout = old
+        cat_file_pretty(self.repo, "v1", out=out)
         text = out.getvalue()
         self.assertIn("tagger Alice <alice@example.com>", text)
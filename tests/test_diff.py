@@ -0,0 +1,157 @@
+"""Tests for diff: unified diff output matches difflib, binary detection, working-tree diff."""
+
+import difflib
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from pygit.porcelain import _merge_sorted_unique, _print_diff, _unified_diff, add_path, commit, diff_repo
+from pygit.repo import Repository
+from pygit.util import BINARY_SNIFF_LEN, is_binary
+
+
+class TestUnifiedDiff(unittest.TestCase):
+    def assert_matches_difflib(self, a: list[str], b: list[str]) -> None:
+        expected = list(difflib.unified_diff(a, b, fromfile="a/f", tofile="b/f", lineterm=""))
+        self.assertEqual(list(_unified_diff(a, b, "a/f", "b/f")), expected)
+
+    def test_modified_lines(self) -> None:
+        a = [f"line {i}\n" for i in range(20)]
+        b = list(a)
+        b[2] = "changed\n"
+        b[15:17] = ["x\n"]
+        self.assert_matches_difflib(a, b)
+
+    def test_added_and_deleted_files(self) -> None:
+        self.assert_matches_difflib([], ["a\n", "b\n"])
+        self.assert_matches_difflib(["a\n"], [])
+
+    def test_bytes_lines_match_decoded_str_lines(self) -> None:
+        old = "a\nb\nc\n".encode()
+        new = "a\nb\u00e9\nc\nd\n".encode() + b"\xff\n"
+        expected = list(_unified_diff(
+            old.decode("utf-8", errors="replace").splitlines(keepends=True),
+            new.decode("utf-8", errors="replace").splitlines(keepends=True),
+            "a/f",
+            "b/f",
+        ))
+        got = list(_unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True), "a/f", "b/f"))
+        self.assertEqual(got, expected)
+
+    def test_print_diff_output_matches_line_by_line_print(self) -> None:
+        old, new = b"a\nb\n", b"a\nc\n"
+        expected = io.StringIO()
+        with redirect_stdout(expected):
+            print("diff --git a/f b/f")
+            print("new file")
+            for line in _unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True), "a/f", "b/f"):
+                print(line)
+            print()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            _print_diff("f", old, new, "added")
+        self.assertEqual(out.getvalue(), expected.getvalue())
+
+    def test_identical_is_empty(self) -> None:
+        self.assertEqual(list(_unified_diff(["a\n"], ["a\n"], "a/f", "b/f")), [])
+
+
+class TestMergeSortedUnique(unittest.TestCase):
+    def test_matches_sorted_set_union(self) -> None:
+        a = sorted(["a", "b/c", "b/d", "x"])
+        b = sorted(["b", "b/c", "c", "z/y"])
+        self.assertEqual(list(_merge_sorted_unique(a, b)), sorted(set(a) | set(b)))
+        self.assertEqual(list(_merge_sorted_unique([], b)), b)
+        self.assertEqual(list(_merge_sorted_unique(a, [])), a)
+
+
+class TestIsBinary(unittest.TestCase):
+    def test_null_in_head_is_binary(self) -> None:
+        self.assertTrue(is_binary(b"abc\0def"))
+
+    def test_only_head_is_sniffed(self) -> None:
+        data = b"text line\n" * 1000 + b"\0"
+        self.assertGreater(len(data), BINARY_SNIFF_LEN)
+        self.assertFalse(is_binary(data))
+
+    def test_plain_text(self) -> None:
+        self.assertFalse(is_binary(b"hello\nworld\n"))
+        self.assertFalse(is_binary(b""))
+
+    def test_control_character_threshold(self) -> None:
+        self.assertFalse(is_binary(b"\x01" * 2 + b"abcdef"))
+        self.assertTrue(is_binary(b"\x01" * 3 + b"abcdef"))
+        self.assertFalse(is_binary(b"\t\r\n" * 10))
+        self.assertFalse(is_binary("héllo wörld".encode("utf-8") * 10))
+
+
+class TestDiffWorkingTree(unittest.TestCase):
+    """diff (working vs index) reports modified and deleted files, skips unchanged ones."""
+
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp(prefix="pygit_diff_"))
+        self.repo = Repository(str(self.tmp))
+        self.repo.init()
+        for name in ("same", "grown", "samesize", "gone"):
+            (self.tmp / name).write_text(f"{name}\n")
+            add_path(self.repo, name)
+        commit(self.repo, "base", "X <x@x>")
+
+    def run_diff(self) -> str:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            diff_repo(self.repo, staged=False)
+        return out.getvalue()
+
+    def test_working_tree_changes(self) -> None:
+        (self.tmp / "grown").write_text("grown\nmore\n")
+        st = (self.tmp / "samesize").stat()
+        (self.tmp / "samesize").write_text("SAMESIZE\n")
+        os.utime(self.tmp / "samesize", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        (self.tmp / "gone").unlink()
+
+        out = self.run_diff()
+        self.assertIn("+more", out)
+        self.assertIn("+SAMESIZE", out)
+        self.assertIn("-gone", out)
+        self.assertNotIn("a/same\n", out)
+
+    def test_staged_diff_against_head(self) -> None:
+        (self.tmp / "grown").write_text("grown\nmore\n")
+        add_path(self.repo, "grown")
+        (self.tmp / "new").write_text("new\n")
+        add_path(self.repo, "new")
+        out = io.StringIO()
+        with redirect_stdout(out):
+            diff_repo(self.repo, staged=True)
+        headers = [l for l in out.getvalue().splitlines() if l.startswith("diff --git")]
+        self.assertEqual(headers, ["diff --git a/grown b/grown", "diff --git a/new b/new"])
+        self.assertIn("+more", out.getvalue())
+
+    def test_blob_shared_between_paths_loaded_once(self) -> None:
+        for name in ("dup1", "dup2"):
+            (self.tmp / name).write_text("dup\n")
+            add_path(self.repo, name)
+        commit(self.repo, "dups", "X <x@x>")
+        dup_sha = self.repo.load_index()["dup1"]["sha1"]
+        for name in ("dup1", "dup2"):
+            (self.tmp / name).write_text("dup\nchanged\n")
+        with mock.patch.object(self.repo, "load_object", wraps=self.repo.load_object) as load:
+            out = self.run_diff()
+        self.assertEqual(out.count("+changed"), 2)
+        self.assertEqual([c.args for c in load.call_args_list].count((dup_sha,)), 1)
+
+    def test_clean_tree_prints_nothing(self) -> None:
+        self.assertEqual(self.run_diff(), "")
+
+    def test_racily_clean_entry_is_rehashed(self) -> None:
+        path = self.tmp / "samesize"
+        st = path.stat()
+        path.write_text("SAMESIZE\n")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.utime(self.repo.index_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertIn("+SAMESIZE", self.run_diff())
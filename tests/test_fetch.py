@@ -15,37 +15,30 @@ from pygit.repo import Repository
 class TestFetchLocal(unittest.TestCase):
     """Fetch from local path: two repos A and B, commit in B, fetch into A."""
 
-    def setUp(self) -> None:
-        self.tmp = Path(tempfile.mkdtemp(prefix="pygit_fetch_"))
-        (self.tmp / "A").mkdir()
-        (self.tmp / "B").mkdir()
-        self.repo_a = Repository(str(self.tmp / "A"))
-        self.repo_a.init()
-        self.repo_b = Repository(str(self.tmp / "B"))
-        self.repo_b.init()
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Both tests only inspect the result of one fetch, so it runs once for the class."""
+        cls.tmp = Path(tempfile.mkdtemp(prefix="pygit_fetch_"))
+        (cls.tmp / "A").mkdir()
+        (cls.tmp / "B").mkdir()
+        cls.repo_a = Repository(str(cls.tmp / "A"))
+        cls.repo_a.init()
+        cls.repo_b = Repository(str(cls.tmp / "B"))
+        cls.repo_b.init()
+        (cls.tmp / "B" / "f").write_text("hello\n")
+        add_path(cls.repo_b, "f")
+        commit(cls.repo_b, "first", "B <b@b.c>")
+        cls.head_b = rev_parse(cls.repo_b, "HEAD")
+
+        remote_add(cls.repo_a, "origin", str(cls.tmp / "B"))
+        fetch(cls.repo_a, "origin")
 
     def test_fetch_updates_remote_tracking_refs(self) -> None:
-        (self.tmp / "B" / "f").write_text("hello\n")
-        add_path(self.repo_b, "f")
-        commit(self.repo_b, "first", "B <b@b.c>")
-        head_b = rev_parse(self.repo_b, "HEAD")
-
-        remote_add(self.repo_a, "origin", str(self.tmp / "B"))
-        fetch(self.repo_a, "origin")
-
         remote_ref = resolve_ref(self.repo_a.git_dir, "refs/remotes/origin/main")
         self.assertIsNotNone(remote_ref)
-        self.assertEqual(remote_ref, head_b)
+        self.assertEqual(remote_ref, self.head_b)
 
     def test_fetch_copies_objects(self) -> None:
-        (self.tmp / "B" / "f").write_text("hello\n")
-        add_path(self.repo_b, "f")
-        commit(self.repo_b, "first", "B <b@b.c>")
-        head_b = rev_parse(self.repo_b, "HEAD")
-
-        remote_add(self.repo_a, "origin", str(self.tmp / "B"))
-        fetch(self.repo_a, "origin")
-
-        self.assertTrue(self.repo_a.odb.exists(head_b))
-        obj = self.repo_a.load_object(head_b)
+        self.assertTrue(self.repo_a.odb.exists(self.head_b))
+        obj = self.repo_a.load_object(self.head_b)
         self.assertEqual(obj.type, "commit")
@@ -1,10 +1,15 @@
 """Tests for gc / repack / prune (Phase 2)."""
 
 import tempfile
+import threading
 import unittest
 from pathlib import Path
+from unittest import mock
+
+import pygit.objectstore
 
 from pygit.gc import gc, reachable_objects, repack
+from pygit.objects import Blob
 from pygit.plumbing import cat_file_type, rev_parse
 from pygit.porcelain import add_path, commit
 from pygit.repo import Repository
@@ -37,6 +42,67 @@ class TestGcRepack(unittest.TestCase):
         self.assertTrue((pack_dir / f"pack-{pack_sha}.pack").exists())
         self.assertTrue((pack_dir / f"pack-{pack_sha}.idx").exists())
 
+    def test_concurrent_loads_parse_pack_once(self) -> None:
+        for i in range(3):
+            (self.tmp / f"f{i}").write_text(f"{i}\n")
+            add_path(self.repo, f"f{i}")
+            commit(self.repo, f"c{i}", "A <a@b.c>")
+        objs = sorted(reachable_objects(self.repo))
+        gc(self.repo, prune_loose=True)
+        repo = Repository(str(self.tmp))
+        real = pygit.objectstore.read_pack_entries_with_bases
+        calls = []
+        start = threading.Barrier(8)
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return real(*args, **kwargs)
+
+        def load() -> None:
+            start.wait()
+            for sha in objs:
+                repo.load_object(sha)
+
+        with mock.patch.object(pygit.objectstore, "read_pack_entries_with_bases", counting):
+            threads = [threading.Thread(target=load) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(len(calls), 1)
+
+    def test_cross_pack_base_lookups_do_not_deadlock(self) -> None:
+        sha_a = self.repo.store_object(Blob(b"a\n"))
+        sha_b = self.repo.store_object(Blob(b"b\n"))
+        repack(self.repo, [sha_a], prune_loose=True)
+        repack(self.repo, [sha_b], prune_loose=True)
+        repo = Repository(str(self.tmp))
+        real = pygit.objectstore.read_pack_entries_with_bases
+        other = {sha_a: sha_b, sha_b: sha_a}
+        crossed = set()
+        both_parsing = threading.Barrier(2, timeout=0.5)
+
+        def thin(pack_path, get_base_content):
+            # Each pack needs a base from the other one, as fetched thin packs can
+            mine = next(s for s in other for p, idx in repo.odb._packs if p == pack_path and idx.lookup(s) is not None)
+            if pack_path not in crossed:
+                crossed.add(pack_path)
+                try:
+                    both_parsing.wait()
+                except threading.BrokenBarrierError:
+                    pass
+                get_base_content(other[mine])
+            return real(pack_path, get_base_content=get_base_content)
+
+        with mock.patch.object(pygit.objectstore, "read_pack_entries_with_bases", thin):
+            threads = [threading.Thread(target=repo.load_object, args=(sha,), daemon=True) for sha in other]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=10)
+        self.assertFalse(any(t.is_alive() for t in threads))
+        self.assertEqual(repo.load_object(sha_b).content, b"b\n")
+
     def test_objects_load_after_gc(self) -> None:
         (self.tmp / "f").write_text("hello\n")
         add_path(self.repo, "f")
@@ -45,9 +111,9 @@ class TestGcRepack(unittest.TestCase):
         head_before = rev_parse(self.repo, "HEAD")
         gc(self.repo, prune_loose=False)
 
-        self.assertEqual(rev_parse(self.repo, "HEAD"), head_before)
-        self.assertEqual(cat_file_type(self.repo, head_before), "commit")
-        self.assertEqual(cat_file_type(self.repo, rev_parse(self.repo, "HEAD")), "commit")
+        head = rev_parse(self.repo, "HEAD")
+        self.assertEqual(head, head_before)
+        self.assertEqual(cat_file_type(self.repo, head), "commit")
 
     def test_reachable_objects_includes_commits_trees_blobs(self) -> None:
         (self.tmp / "a").write_text("a\n")
@@ -70,4 +136,4 @@ class TestGcRepack(unittest.TestCase):
         pack_dir = self.tmp / ".git" / "objects" / "pack"
         self.assertTrue((pack_dir / f"pack-{pack_sha}.pack").is_file())
         self.assertTrue((pack_dir / f"pack-{pack_sha}.idx").is_file())
-        self.assertEqual(cat_file_type(self.repo, rev_parse(self.repo, "HEAD")), "commit")
+        self.assertEqual(cat_file_type(self.repo, "HEAD"), "commit")
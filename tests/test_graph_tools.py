@@ -17,24 +17,24 @@ from pygit.repo import Repository
 
 
 class TestMergeBase(unittest.TestCase):
-    def setUp(self) -> None:
+    @classmethod
+    def setUpClass(cls) -> None:
+        """The tests only read the graph, so the history is built once and shared."""
         d = tempfile.mkdtemp(prefix="pygit_graph_")
-        self.repo_dir = Path(d)
-        self.repo = Repository(str(self.repo_dir))
-        self.repo.init()
-        (self.repo_dir / "f").write_text("a")
-        add_path(self.repo, "f")
-        self.hash_a = commit(self.repo, "Commit A", author="PyGit <p@x.com>")
-        self.assertIsNotNone(self.hash_a)
-        self.hash_a = self.hash_a or ""
-        branch_create(self.repo, "feature")
-        (self.repo_dir / "f").write_text("b")
-        add_path(self.repo, "f")
-        self.hash_b = commit(self.repo, "Commit B", author="PyGit <p@x.com>") or ""
-        checkout_branch(self.repo, "feature", create=False)
-        (self.repo_dir / "f").write_text("c")
-        add_path(self.repo, "f")
-        self.hash_c = commit(self.repo, "Commit C", author="PyGit <p@x.com>") or ""
+        cls.repo_dir = Path(d)
+        cls.repo = Repository(str(cls.repo_dir))
+        cls.repo.init()
+        (cls.repo_dir / "f").write_text("a")
+        add_path(cls.repo, "f")
+        cls.hash_a = commit(cls.repo, "Commit A", author="PyGit <p@x.com>") or ""
+        branch_create(cls.repo, "feature")
+        (cls.repo_dir / "f").write_text("b")
+        add_path(cls.repo, "f")
+        cls.hash_b = commit(cls.repo, "Commit B", author="PyGit <p@x.com>") or ""
+        checkout_branch(cls.repo, "feature", create=False)
+        (cls.repo_dir / "f").write_text("c")
+        add_path(cls.repo, "f")
+        cls.hash_c = commit(cls.repo, "Commit C", author="PyGit <p@x.com>") or ""
 
     def test_merge_base_main_feature_equals_a(self) -> None:
         result = merge_base(self.repo, "main", "feature")
@@ -52,40 +52,29 @@ class TestMergeBase(unittest.TestCase):
 
 
 class TestRevList(unittest.TestCase):
-    def setUp(self) -> None:
+    @classmethod
+    def setUpClass(cls) -> None:
         d = tempfile.mkdtemp(prefix="pygit_rl_")
-        self.repo_dir = Path(d)
-        self.repo = Repository(str(self.repo_dir))
-        self.repo.init()
-        (self.repo_dir / "f").write_text("x")
-        add_path(self.repo, "f")
-        self.hash_a = commit(self.repo, "First", author="PyGit <p@x.com>") or ""
-        (self.repo_dir / "f").write_text("y")
-        add_path(self.repo, "f")
-        self.hash_b = commit(self.repo, "Second", author="PyGit <p@x.com>") or ""
+        cls.repo_dir = Path(d)
+        cls.repo = Repository(str(cls.repo_dir))
+        cls.repo.init()
+        (cls.repo_dir / "f").write_text("x")
+        add_path(cls.repo, "f")
+        cls.hash_a = commit(cls.repo, "First", author="PyGit <p@x.com>") or ""
+        (cls.repo_dir / "f").write_text("y")
+        add_path(cls.repo, "f")
+        cls.hash_b = commit(cls.repo, "Second", author="PyGit <p@x.com>") or ""
 
     def test_rev_list_head_max_count_2(self) -> None:
         out = io.StringIO()
-        import sys
-        old = sys.stdout
-        sys.stdout = out
-        try:
-            rev_list(self.repo, rev="HEAD", max_count=2)
-        finally:
-            sys.stdout = old
+        rev_list(self.repo, rev="HEAD", max_count=2, out=out)
         lines = [l for l in out.getvalue().strip().split("\n") if l.strip()]
         self.assertEqual(len(lines), 2)
         self.assertEqual(lines[0], self.hash_b)
 
     def test_rev_list_parents_one_parent(self) -> None:
         out = io.StringIO()
-        import sys
-        old = sys.stdout
-        sys.stdout = out
-        try:
-            rev_list(self.repo, rev="HEAD", max_count=1, parents=True)
-        finally:
-            sys.stdout = old
+        rev_list(self.repo, rev="HEAD", max_count=1, parents=True, out=out)
         line = out.getvalue().strip()
         parts = line.split()
         self.assertGreaterEqual(len(parts), 2)
@@ -94,40 +83,29 @@ class TestRevList(unittest.TestCase):
 
 
 class TestLogRevOneline(unittest.TestCase):
-    def setUp(self) -> None:
+    @classmethod
+    def setUpClass(cls) -> None:
         d = tempfile.mkdtemp(prefix="pygit_log_")
-        self.repo_dir = Path(d)
-        self.repo = Repository(str(self.repo_dir))
-        self.repo.init()
-        (self.repo_dir / "f").write_text("a")
-        add_path(self.repo, "f")
-        self.hash_a = commit(self.repo, "Commit A message", author="PyGit <p@x.com>") or ""
-        (self.repo_dir / "f").write_text("b")
-        add_path(self.repo, "f")
-        self.hash_b = commit(self.repo, "Commit B message", author="PyGit <p@x.com>") or ""
+        cls.repo_dir = Path(d)
+        cls.repo = Repository(str(cls.repo_dir))
+        cls.repo.init()
+        (cls.repo_dir / "f").write_text("a")
+        add_path(cls.repo, "f")
+        cls.hash_a = commit(cls.repo, "Commit A message", author="PyGit <p@x.com>") or ""
+        (cls.repo_dir / "f").write_text("b")
+        add_path(cls.repo, "f")
+        cls.hash_b = commit(cls.repo, "Commit B message", author="PyGit <p@x.com>") or ""
 
     def test_log_rev_oneline_shows_commit_at_top(self) -> None:
         out = io.StringIO()
-        import sys
-        old = sys.stdout
-        sys.stdout = out
-        try:
-            log(self.repo, rev=self.hash_a, max_count=1, oneline=True)
-        finally:
-            sys.stdout = old
+        log(self.repo, rev=self.hash_a, max_count=1, oneline=True, out=out)
         text = out.getvalue().strip()
         self.assertIn(self.hash_a[:7], text)
         self.assertIn("Commit A message", text)
 
     def test_log_head_oneline(self) -> None:
         out = io.StringIO()
-        import sys
-        old = sys.stdout
-        sys.stdout = out
-        try:
-            log(self.repo, rev="HEAD", max_count=1, oneline=True)
-        finally:
-            sys.stdout = old
+        log(self.repo, rev="HEAD", max_count=1, oneline=True, out=out)
         text = out.getvalue().strip()
         self.assertIn(self.hash_b[:7], text)
         self.assertIn("Commit B message", text)
@@ -4,7 +4,11 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from pygit.ignore import IgnoreMatcher, load_ignore_patterns, _parse_patterns
+from pygit.ignore import IgnoreMatcher, _parse_patterns
+
+# Read-only matchers shared by the pure pattern tests
+_NEG_PATTERNS = _parse_patterns("*.log\n!important.log\n")
+_EMPTY_IGN = IgnoreMatcher([])
 
 
 def make_temp_repo() -> tuple[Path, Path]:
@@ -21,8 +25,7 @@ class TestIgnore(unittest.TestCase):
         self.repo_root, self.repo_git = make_temp_repo()
 
     def test_ignored_file_not_untracked(self) -> None:
-        (self.repo_root / ".gitignore").write_text("ignore_me.txt\n")
-        ign = load_ignore_patterns(self.repo_root)
+        ign = IgnoreMatcher(_parse_patterns("ignore_me.txt\n"))
         self.assertTrue(ign.is_ignored("ignore_me.txt", is_dir=False))
         self.assertFalse(ign.is_ignored("other.txt", is_dir=False))
 
@@ -43,13 +46,36 @@ class TestIgnore(unittest.TestCase):
         index = repo.load_index()
         self.assertIn("skip.txt", index)
 
+    def test_add_directory_walks_tree_skipping_ignored_and_git(self) -> None:
+        import contextlib
+        import io
+        import os
+        from pygit.porcelain import add_path
+        from pygit.repo import Repository
+        repo = Repository(str(self.repo_root))
+        (self.repo_root / ".gitignore").write_text("*.log\n")
+        (self.repo_root / "src" / "pkg").mkdir(parents=True)
+        (self.repo_root / "src" / "a.py").write_text("a\n")
+        (self.repo_root / "src" / "debug.log").write_text("x\n")
+        (self.repo_root / "src" / "pkg" / "run.sh").write_text("#!/bin/sh\n")
+        os.chmod(self.repo_root / "src" / "pkg" / "run.sh", 0o755)
+        (self.repo_root / "src" / "pkg" / ".git").mkdir()
+        (self.repo_root / "src" / "pkg" / ".git" / "HEAD").write_text("nested\n")
+        with contextlib.redirect_stdout(io.StringIO()):
+            add_path(repo, "src")
+        index = repo.load_index()
+        self.assertEqual(sorted(index), ["src/a.py", "src/pkg/run.sh"])
+        self.assertEqual(index["src/pkg/run.sh"]["mode"], "100755")
+        self.assertEqual(index["src/a.py"]["mode"], "100644")
+        with contextlib.redirect_stdout(io.StringIO()):
+            add_path(repo, ".", force=True)
+        self.assertEqual(sorted(repo.load_index()), [".gitignore", "src/a.py", "src/debug.log", "src/pkg/run.sh"])
+
     def test_negation(self) -> None:
-        patterns = _parse_patterns("*.log\n!important.log\n")
-        ign = IgnoreMatcher(patterns)
+        ign = IgnoreMatcher(_NEG_PATTERNS)
         self.assertTrue(ign.is_ignored("a.log", is_dir=False))
         self.assertFalse(ign.is_ignored("important.log", is_dir=False))
 
     def test_git_always_excluded(self) -> None:
-        ign = IgnoreMatcher([])
-        self.assertTrue(ign.is_ignored(".git", is_dir=True))
-        self.assertTrue(ign.is_ignored(".git/HEAD", is_dir=False))
+        self.assertTrue(_EMPTY_IGN.is_ignored(".git", is_dir=True))
+        self.assertTrue(_EMPTY_IGN.is_ignored(".git/HEAD", is_dir=False))
@@ -13,6 +13,7 @@ from pygit.index import (
     DIRC_SIGNATURE,
     INDEX_CHECKSUM_LEN,
     INDEX_VERSION_BINARY,
+    IndexEntry,
     index_entry_for_file,
     index_entries_unchanged,
     load_index,
@@ -29,23 +30,59 @@ def make_temp_repo() -> tuple[Path, Path]:
     return root, git
 
 
+# Two one-letter paths: each entry is 62 fixed bytes + name + NUL, padded to exactly 64.
+CANONICAL_ENTRIES = {
+    "a": {"sha1": "a" * 40, "mode": "100644", "size": 5, "mtime_ns": 1700000000000000000, "ctime_ns": 0},
+    "b": {"sha1": "b" * 40, "mode": "100644", "size": 0, "mtime_ns": 0, "ctime_ns": 0},
+}
+CANONICAL_ENTRY_LEN = 64
+
+
 class TestIndex(unittest.TestCase):
+    canonical: bytes = b""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Serialize CANONICAL_ENTRIES once; tests copy or tamper with the bytes instead of re-saving."""
+        _, repo_git = make_temp_repo()
+        save_index(repo_git, CANONICAL_ENTRIES)
+        cls.canonical = (repo_git / "index").read_bytes()
+
     def setUp(self) -> None:
         self.repo_root, self.repo_git = make_temp_repo()
 
+    def _write_index(self, raw: bytes) -> None:
+        (self.repo_git / "index").write_bytes(raw)
+
     def test_binary_roundtrip(self) -> None:
         """Write binary -> read -> equals."""
-        entries = {
-            "a.txt": {"sha1": "a" * 40, "mode": "100644", "size": 5, "mtime_ns": 1700000000000000000},
+        self.assertEqual(self.canonical[:4], DIRC_SIGNATURE)
+        self._write_index(self.canonical)
+        self.assertEqual(load_index(self.repo_git), CANONICAL_ENTRIES)
+
+    def test_index_entry_tuples_match_dicts(self) -> None:
+        """IndexEntry tuples serialize exactly like the equivalent dicts."""
+        as_dicts = {
+            "a.txt": {"sha1": "a" * 40, "mode": "100644", "size": 5, "mtime_ns": 0, "ctime_ns": 0},
+            "bin/run": {"sha1": "b" * 40, "mode": "100755", "size": 7, "mtime_ns": 0, "ctime_ns": 0},
         }
-        save_index(self.repo_git, entries)
-        raw = (self.repo_git / "index").read_bytes()
-        self.assertEqual(raw[:4], DIRC_SIGNATURE)
-        loaded = load_index(self.repo_git)
-        self.assertEqual(loaded["a.txt"]["sha1"], "a" * 40)
-        self.assertEqual(loaded["a.txt"]["mode"], "100644")
-        self.assertEqual(loaded["a.txt"]["size"], 5)
-        self.assertEqual(loaded["a.txt"]["mtime_ns"], 1700000000000000000)
+        save_index(self.repo_git, as_dicts)
+        expected = (self.repo_git / "index").read_bytes()
+        save_index(self.repo_git, {"bin/run": IndexEntry("b" * 40, "100755", 7), "a.txt": IndexEntry("a" * 40, "100644", 5)})
+        self.assertEqual((self.repo_git / "index").read_bytes(), expected)
+        self.assertEqual(load_index(self.repo_git), as_dicts)
+
+    def test_index_entry_for_file_reuses_given_stat(self) -> None:
+        run = self.repo_root / "run.sh"
+        run.write_text("#!/bin/sh\n")
+        os.chmod(run, 0o755)
+        st = os.stat(run)
+        ent = index_entry_for_file(run, "c" * 40, st)
+        self.assertEqual(ent, index_entry_for_file(run, "c" * 40))
+        self.assertEqual(ent["mode"], "100755")
+        self.assertEqual(ent["size"], st.st_size)
+        run.unlink()
+        self.assertEqual(index_entry_for_file(run, "c" * 40, st)["mode"], "100755")
 
     def test_migration_json_to_binary(self) -> None:
         """Create JSON index on disk -> load_index -> migrated to binary (file begins with DIRC)."""
@@ -107,54 +144,32 @@ class TestIndex(unittest.TestCase):
                 f.unlink()
 
     def test_index_checksum_roundtrip(self) -> None:
-        """After save_index, file ends with SHA-1 of preceding content; load_index succeeds."""
-        entries = {
-            "a.txt": {"sha1": "a" * 40, "mode": "100644", "size": 5, "mtime_ns": 0, "ctime_ns": 0},
-        }
-        save_index(self.repo_git, entries)
-        raw = (self.repo_git / "index").read_bytes()
+        """save_index output ends with SHA-1 of preceding content; load_index succeeds."""
+        raw = self.canonical
         self.assertGreaterEqual(len(raw), 32)
         body = raw[:-INDEX_CHECKSUM_LEN]
         stored = raw[-INDEX_CHECKSUM_LEN:]
-        self.assertEqual(hashlib.sha1(body).digest(), stored)
-        loaded = load_index(self.repo_git)
-        self.assertEqual(loaded["a.txt"]["sha1"], "a" * 40)
+        self.assertEqual(hashlib.sha1(body, usedforsecurity=False).digest(), stored)
+        self._write_index(raw)
+        self.assertEqual(load_index(self.repo_git)["a"]["sha1"], "a" * 40)
 
     def test_index_checksum_mismatch_raises(self) -> None:
         """Corrupting one byte in index causes load_index to raise IndexChecksumError."""
-        entries = {
-            "f": {"sha1": "b" * 40, "mode": "100644", "size": 1, "mtime_ns": 0, "ctime_ns": 0},
-        }
-        save_index(self.repo_git, entries)
-        index_path = self.repo_git / "index"
-        raw = index_path.read_bytes()
         # Tamper one byte in the middle (not the checksum)
-        tampered = bytearray(raw)
-        tampered[20] = tampered[20] ^ 0xFF
-        index_path.write_bytes(bytes(tampered))
+        tampered = bytearray(self.canonical)
+        tampered[20] ^= 0xFF
+        self._write_index(bytes(tampered))
         with self.assertRaises(IndexChecksumError):
             load_index(self.repo_git)
 
     def test_index_unsorted_entries_raises(self) -> None:
         """Index with entries not sorted by path raises IndexCorruptError on load."""
-        # Write valid index with sorted entries a, b
-        entries = {
-            "a": {"sha1": "a" * 40, "mode": "100644", "size": 0, "mtime_ns": 0, "ctime_ns": 0},
-            "b": {"sha1": "b" * 40, "mode": "100644", "size": 0, "mtime_ns": 0, "ctime_ns": 0},
-        }
-        save_index(self.repo_git, entries)
-        raw = (self.repo_git / "index").read_bytes()
-        body = raw[:-INDEX_CHECKSUM_LEN]
+        body = self.canonical[:-INDEX_CHECKSUM_LEN]
         header = body[:12]
-        rest = body[12:]
-        # Each entry is 8-byte aligned; find boundary by parsing first entry length
-        # Entry: 62 fixed + path+null + pad. Min path "a" = 1+1 = 2, so 62+2=64, pad to 64.
-        # So first entry (a) is 64 bytes, second (b) is 64 bytes.
-        entry_a_blob = rest[:64]
-        entry_b_blob = rest[64:128]
-        # Swap so body has b then a (unsorted)
+        entry_a_blob = body[12 : 12 + CANONICAL_ENTRY_LEN]
+        entry_b_blob = body[12 + CANONICAL_ENTRY_LEN : 12 + 2 * CANONICAL_ENTRY_LEN]
+        # Swap so body has b then a (unsorted), with a valid checksum
         unsorted_body = header + entry_b_blob + entry_a_blob
-        path = self.repo_git / "index"
-        path.write_bytes(unsorted_body + hashlib.sha1(unsorted_body).digest())
+        self._write_index(unsorted_body + hashlib.sha1(unsorted_body, usedforsecurity=False).digest())
         with self.assertRaises(IndexCorruptError):
             load_index(self.repo_git)
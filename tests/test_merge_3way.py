@@ -1,9 +1,9 @@
 """Tests for 3-way merge: clean merge commit, text conflict, delete/modify, binary conflict."""
 
 import io
-import sys
 import tempfile
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
 
 from pygit.constants import REF_HEADS_PREFIX
@@ -67,23 +67,14 @@ class TestMerge3WayClean(unittest.TestCase):
     def test_merge_status_clean_after(self) -> None:
         merge(self.repo, "feature")
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
+        with redirect_stdout(out):
             status(self.repo)
-        finally:
-            sys.stdout = old_stdout
         self.assertIn("nothing to commit, working tree clean", out.getvalue())
 
     def test_merge_log_shows_merge_message(self) -> None:
         merge(self.repo, "feature")
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
-            log(self.repo, rev="HEAD", max_count=1, oneline=True)
-        finally:
-            sys.stdout = old_stdout
+        log(self.repo, rev="HEAD", max_count=1, oneline=True, out=out)
         self.assertIn("Merge", out.getvalue())
 
 
@@ -134,14 +125,11 @@ class TestMerge3WayTextConflict(unittest.TestCase):
 
     def test_merge_prints_conflict_message(self) -> None:
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
-            merge(self.repo, "feature")
-        except PygitError:
-            pass
-        finally:
-            sys.stdout = old_stdout
+        with redirect_stdout(out):
+            try:
+                merge(self.repo, "feature")
+            except PygitError:
+                pass
         self.assertIn("Automatic merge failed", out.getvalue())
         self.assertIn("conflict.txt", out.getvalue())
 
@@ -204,12 +192,9 @@ class TestMergeBinaryConflict(unittest.TestCase):
 
     def test_merge_binary_conflict_prints_binary_message(self) -> None:
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
-            merge(self.repo, "feature")
-        except PygitError:
-            pass
-        finally:
-            sys.stdout = old_stdout
+        with redirect_stdout(out):
+            try:
+                merge(self.repo, "feature")
+            except PygitError:
+                pass
         self.assertIn("Binary file conflict", out.getvalue())
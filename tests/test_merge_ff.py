@@ -1,9 +1,9 @@
 """Tests for fast-forward merge: merge on branch, already up to date, non-FF refused, dirty refused."""
 
 import io
-import sys
 import tempfile
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
 
 from pygit.errors import PygitError
@@ -60,12 +60,8 @@ class TestMergeFastForwardOnBranch(unittest.TestCase):
 
     def test_merge_fast_forward_prints_fast_forward(self) -> None:
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
+        with redirect_stdout(out):
             merge(self.repo, "feature")
-        finally:
-            sys.stdout = old_stdout
         self.assertIn("Fast-forward", out.getvalue())
 
 
@@ -108,35 +104,22 @@ class TestMergeNoFF(unittest.TestCase):
     def test_merge_no_ff_log_shows_merge_message(self) -> None:
         merge(self.repo, "feature", no_ff=True, message="Merge feature into main")
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
-            log(self.repo, rev="HEAD", max_count=3, oneline=True)
-        finally:
-            sys.stdout = old_stdout
+        log(self.repo, rev="HEAD", max_count=3, oneline=True, out=out)
         self.assertIn("Merge", out.getvalue(), "log should show merge commit message")
         self.assertIn("Merge feature into main", out.getvalue())
 
     def test_merge_no_ff_prints_merge_made(self) -> None:
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
+        with redirect_stdout(out):
             merge(self.repo, "feature", no_ff=True, message="Merge feature into main")
-        finally:
-            sys.stdout = old_stdout
         self.assertIn("Merge made by 3-way merge", out.getvalue())
         self.assertIn("New commit", out.getvalue())
 
     def test_merge_no_ff_status_clean_after(self) -> None:
         merge(self.repo, "feature", no_ff=True, message="Merge feature into main")
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
+        with redirect_stdout(out):
             status(self.repo)
-        finally:
-            sys.stdout = old_stdout
         self.assertIn("nothing to commit, working tree clean", out.getvalue())
 
 
@@ -158,12 +141,8 @@ class TestMergeAlreadyUpToDate(unittest.TestCase):
 
     def test_merge_already_up_to_date_prints_message(self) -> None:
         out = io.StringIO()
-        old_stdout = sys.stdout
-        sys.stdout = out
-        try:
+        with redirect_stdout(out):
             merge(self.repo, "other")
-        finally:
-            sys.stdout = old_stdout
         self.assertIn("Already up to date", out.getvalue())
 
     def test_merge_already_up_to_date_ref_unchanged(self) -> None:
@@ -1,10 +1,36 @@
 """Tests for objects: blob/tree/commit serialize/deserialize and hash correctness."""
 
+import os
+import shutil
+import tempfile
 import unittest
 import zlib
+from pathlib import Path
+from unittest import mock
 
-from pygit.objects import Blob, Commit, GitObject, Tree
-from pygit.util import sha1_hash
+from pygit import util
+from pygit.objects import (
+    Blob,
+    Commit,
+    GitObject,
+    Tree,
+    commit_tree_and_parents,
+    compress_buffer,
+    hash_buffer,
+    tree_child_hashes,
+)
+from pygit.repo import Repository
+from pygit.util import (
+    MMAP_THRESHOLD,
+    WRITE_CHUNK,
+    _resolve_root,
+    normalize_path,
+    sha1_hash,
+    sha1_hash_parts,
+    timezone_offset_utc,
+    write_bytes_atomic,
+    write_chunks_atomic,
+)
 
 
 class TestBlob(unittest.TestCase):
@@ -26,12 +52,138 @@ class TestBlob(unittest.TestCase):
         self.assertEqual(blob2.content, content)
         self.assertEqual(blob2.hash_id(), h)
 
+    def test_from_raw_header_handling(self) -> None:
+        obj = GitObject.from_raw(b"note 3\0abc")
+        self.assertEqual((type(obj), obj.type, obj.content), (GitObject, "note", b"abc"))
+        with self.assertRaises(ValueError):
+            GitObject.from_raw(b"blob\0abc")
+        with self.assertRaises(ValueError):
+            GitObject.from_raw(b"blob 3 abc")
+
     def test_blob_hash_format(self) -> None:
         blob = Blob(b"x")
         header = b"blob 1\0"
         expected = sha1_hash(header + b"x")
         self.assertEqual(blob.hash_id(), expected)
 
+    def test_hash_and_compress_buffer_match_blob(self) -> None:
+        content = b"line\n" * 1000
+        blob = Blob(content)
+        self.assertEqual(hash_buffer("blob", content), blob.hash_id())
+        compressed = b"".join(compress_buffer("blob", content, chunk_size=100))
+        self.assertEqual(zlib.decompress(compressed), zlib.decompress(blob.serialize()))
+
+
+class TestObjectStore(unittest.TestCase):
+    def test_store_file_blob_large_file_mmapped(self) -> None:
+        tmp = Path(tempfile.mkdtemp(prefix="pygit_objects_"))
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        repo = Repository(str(tmp))
+        repo.init()
+        content = bytes(range(256)) * (MMAP_THRESHOLD // 256 + 1)
+        (tmp / "big.bin").write_bytes(content)
+        sha = repo.store_file_blob(tmp / "big.bin")
+        self.assertEqual(sha, Blob(content).hash_id())
+        self.assertEqual(repo.load_object(sha).content, content)
+
+    def test_hash_file_blob_matches_stored_blob(self) -> None:
+        tmp = Path(tempfile.mkdtemp(prefix="pygit_objects_"))
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        repo = Repository(str(tmp))
+        repo.init()
+        for name, content in (("small", b"small\n"), ("big", b"x" * (MMAP_THRESHOLD + 1))):
+            (tmp / name).write_bytes(content)
+            self.assertEqual(repo.hash_file_blob(tmp / name), Blob(content).hash_id())
+            self.assertFalse(repo.odb.exists(repo.hash_file_blob(tmp / name)))
+
+    def test_has_objects_returns_present_subset(self) -> None:
+        tmp = Path(tempfile.mkdtemp(prefix="pygit_objects_"))
+        repo = Repository(str(tmp))
+        repo.init()
+        present = [repo.store_object(Blob(f"{i}\n".encode())) for i in range(5)]
+        absent = ["0" * 40, "f" * 40, "not-a-sha"]
+        self.assertEqual(repo.odb.has_objects(present + absent), set(present))
+
+
+class TestUtil(unittest.TestCase):
+    def test_write_bytes_atomic_chunks_and_resumes_short_writes(self) -> None:
+        tmp = Path(tempfile.mkdtemp(prefix="pygit_objects_"))
+        content = bytes(range(256)) * (WRITE_CHUNK // 128 + 3)
+        real_write = os.write
+        sizes = []
+
+        def short_write(fd: int, data: memoryview) -> int:
+            sizes.append(len(data))
+            return real_write(fd, data[: max(1, len(data) - 7)])
+
+        with mock.patch("pygit.util.os.write", side_effect=short_write):
+            write_bytes_atomic(tmp / "out.bin", content)
+        self.assertEqual((tmp / "out.bin").read_bytes(), content)
+        self.assertLessEqual(max(sizes), WRITE_CHUNK)
+        self.assertEqual([p.name for p in tmp.iterdir()], ["out.bin"])
+
+    def test_timezone_offset_follows_time_settings(self) -> None:
+        with mock.patch("pygit.util.time.timezone", -19800), mock.patch("pygit.util.time.daylight", 0):
+            self.assertEqual(timezone_offset_utc(), "+0530")
+            self.assertEqual(timezone_offset_utc(), "+0530")
+        with mock.patch("pygit.util.time.altzone", 25200), mock.patch("pygit.util.time.daylight", 1):
+            self.assertEqual(timezone_offset_utc(), "-0700")
+
+    def test_sha1_hash_parts_matches_concatenation(self) -> None:
+        parts = (b"blob 5\0", b"", b"hello")
+        self.assertEqual(sha1_hash_parts(*parts), sha1_hash(b"".join(parts)))
+        self.assertEqual(sha1_hash(b"blob 5\0hello"), Blob(b"hello").hash_id())
+        self.assertEqual(sha1_hash(b""), sha1_hash_parts())
+
+    def test_normalize_path_resolves_root_once(self) -> None:
+        tmp = Path(tempfile.mkdtemp(prefix="pygit_objects_"))
+        root = tmp / "sub" / ".."
+        (tmp / "a").mkdir()
+        before = _resolve_root.cache_info()
+        self.assertEqual(normalize_path(root, "a/f"), tmp.resolve() / "a" / "f")
+        self.assertEqual(normalize_path(root, "a/../g"), tmp.resolve() / "g")
+        with self.assertRaises(ValueError):
+            normalize_path(root, "../outside")
+        after = _resolve_root.cache_info()
+        self.assertEqual(after.misses - before.misses, 1)
+        self.assertEqual(after.hits - before.hits, 2)
+
+    def test_write_chunks_atomic_with_and_without_tmpfile(self) -> None:
+        tmp = Path(tempfile.mkdtemp(prefix="pygit_objects_"))
+        target = tmp / "d" / "out"
+        with mock.patch("pygit.util._TMPFILE_USABLE", False):
+            write_chunks_atomic(target, (b"one", b"two"))
+            write_chunks_atomic(target, iter([b"three"]))
+        self.assertEqual(target.read_bytes(), b"three")
+        self.assertEqual(os.listdir(target.parent), ["out"])
+        if not util._O_TMPFILE:
+            self.skipTest("O_TMPFILE not available")
+
+        def fake_linkat(src: str, dst: Path) -> None:
+            # Emulates linkat(AT_SYMLINK_FOLLOW) on /proc/self/fd/N for sandboxes that refuse it
+            if os.path.exists(dst):
+                raise FileExistsError(dst)
+            with open(src, "rb") as f_in, open(dst, "xb") as f_out:
+                f_out.write(f_in.read())
+
+        with mock.patch("pygit.util._TMPFILE_USABLE", True), mock.patch("pygit.util.os.link", side_effect=fake_linkat):
+            write_chunks_atomic(tmp / "d" / "new", (b"fresh",))
+            write_chunks_atomic(target, (b"four", b"five"))
+        self.assertEqual((tmp / "d" / "new").read_bytes(), b"fresh")
+        self.assertEqual(target.read_bytes(), b"fourfive")
+        with mock.patch("pygit.util._TMPFILE_USABLE", True), mock.patch(
+            "pygit.util.os.link", side_effect=OSError(18, "Invalid cross-device link")
+        ):
+            write_chunks_atomic(target, iter([b"six", b"seven"]))
+            self.assertFalse(util._TMPFILE_USABLE)
+        self.assertEqual(target.read_bytes(), b"sixseven")
+        with mock.patch("pygit.util._TMPFILE_USABLE", True), mock.patch(
+            "pygit.util.os.link", side_effect=[FileExistsError(17, "File exists"), OSError(18, "Invalid cross-device link")]
+        ):
+            write_chunks_atomic(target, (b"eight",))
+        self.assertEqual(target.read_bytes(), b"eight")
+        self.assertEqual(sorted(os.listdir(target.parent)), ["new", "out"])
+
 
 class TestTree(unittest.TestCase):
     def test_tree_roundtrip(self) -> None:
@@ -57,6 +209,22 @@ class TestTree(unittest.TestCase):
         self.assertEqual(tree.content, content)
         self.assertEqual(tree.hash_id(), sha1_hash(b"tree " + str(len(content)).encode() + b"\0" + content))
 
+    def test_tree_from_content_stops_at_truncated_entry(self) -> None:
+        # Names with spaces and shas containing NUL bytes parse; a truncated last entry is dropped
+        good = b"100644 my file\0" + bytes(20) + b"040000 d\0" + b"\x00\xff" * 10
+        tree = Tree.from_content(good + b"100644 cut\0" + b"\x01" * 5)
+        self.assertEqual(tree.entries, [("100644", "my file", "0" * 40), ("040000", "d", "00ff" * 10)])
+        self.assertEqual(Tree.from_content(good).entries, tree.entries)
+
+    def test_tree_child_hashes_matches_from_content(self) -> None:
+        tree = Tree([("100644", "a.txt", "a" * 40), ("040000", "dir", "b" * 40), ("100755", "x", "c" * 40)])
+        parsed = Tree.from_content(tree.content).entries
+        self.assertEqual(
+            tree_child_hashes(tree.content),
+            [(mode.startswith("04"), sha) for mode, _name, sha in parsed],
+        )
+        self.assertEqual(tree_child_hashes(b"40000 d\0" + bytes(20)), [(True, "0" * 40)])
+
 
 class TestCommit(unittest.TestCase):
     def test_commit_roundtrip(self) -> None:
@@ -97,3 +265,16 @@ class TestCommit(unittest.TestCase):
         header = b"commit " + str(len(content)).encode() + b"\0"
         expected_hash = sha1_hash(header + content)
         self.assertEqual(commit.hash_id(), expected_hash)
+
+    def test_commit_tree_and_parents_reads_header_only(self) -> None:
+        content = (
+            b"tree " + b"e" * 40 + b"\n"
+            b"parent " + b"f" * 40 + b"\n"
+            b"parent " + b"1" * 40 + b"\n"
+            b"author Author <a@b.com> 1700000000 +0530\n"
+            b"committer Author <a@b.com> 1700000000 +0530\n"
+            b"\n"
+            b"parent " + b"2" * 40 + b" in message\n"
+        )
+        self.assertEqual(commit_tree_and_parents(content), ("e" * 40, ["f" * 40, "1" * 40]))
+        self.assertEqual(commit_tree_and_parents(b"tree " + b"e" * 40), ("e" * 40, []))
@@ -4,11 +4,12 @@ import tempfile
 import unittest
 from pathlib import Path
 
+from pygit.gc import gc, reachable_objects
 from pygit.plumbing import rev_parse
 from pygit.porcelain import add_path, commit, log
-from pygit.push import push
+from pygit.push import _reachable_from_tips_local, push
 from pygit.remote import remote_add
-from pygit.repo import Repository
+from pygit.repo import Repository, read_blob_from_tree, tree_hash_for_commit
 
 
 class TestPushLocal(unittest.TestCase):
@@ -55,3 +56,50 @@ class TestPushLocal(unittest.TestCase):
         with self.assertRaises(PygitError) as ctx:
             push(self.repo_a, "origin", "HEAD", "refs/heads/main", force=False)
         self.assertIn("non-fast-forward", str(ctx.exception))
+
+    def test_push_copies_nested_trees_and_blobs(self) -> None:
+        (self.tmp / "A" / "d" / "e").mkdir(parents=True)
+        (self.tmp / "A" / "d" / "e" / "x").write_text("same\n")
+        (self.tmp / "A" / "y").write_text("same\n")
+        add_path(self.repo_a, "d")
+        add_path(self.repo_a, "y")
+        commit(self.repo_a, "first", "A <a@b.c>")
+        (self.tmp / "A" / "y").write_text("changed\n")
+        add_path(self.repo_a, "y")
+        commit(self.repo_a, "second", "A <a@b.c>")
+
+        remote_add(self.repo_a, "origin", str(self.tmp / "B"))
+        push(self.repo_a, "origin", "HEAD", "refs/heads/main")
+
+        self.assertEqual(reachable_objects(self.repo_b), reachable_objects(self.repo_a))
+        tree = tree_hash_for_commit(self.repo_b, rev_parse(self.repo_b, "HEAD"))
+        self.assertEqual(read_blob_from_tree(self.repo_b, tree, "d/e/x"), b"same\n")
+
+    def test_push_from_packed_objects(self) -> None:
+        (self.tmp / "A" / "f").write_text("packed\n")
+        add_path(self.repo_a, "f")
+        commit(self.repo_a, "first", "A <a@b.c>")
+        gc(self.repo_a, prune_loose=True)
+
+        remote_add(self.repo_a, "origin", str(self.tmp / "B"))
+        push(self.repo_a, "origin", "HEAD", "refs/heads/main")
+
+        tree = tree_hash_for_commit(self.repo_b, rev_parse(self.repo_b, "HEAD"))
+        self.assertEqual(read_blob_from_tree(self.repo_b, tree, "f"), b"packed\n")
+
+    def test_reachable_walk_stops_at_excluded_tips(self) -> None:
+        (self.tmp / "A" / "f").write_text("one\n")
+        add_path(self.repo_a, "f")
+        commit(self.repo_a, "first", "A <a@b.c>")
+        first = rev_parse(self.repo_a, "HEAD")
+        (self.tmp / "A" / "g").write_text("two\n")
+        add_path(self.repo_a, "g")
+        commit(self.repo_a, "second", "A <a@b.c>")
+        second = rev_parse(self.repo_a, "HEAD")
+
+        need = _reachable_from_tips_local(self.repo_a, [second], exclude={first})
+        self.assertIn(second, need)
+        self.assertNotIn(first, need)
+        # new commit, its root tree, and both blobs listed by that tree
+        self.assertEqual(len(need), 4)
+        self.assertEqual(_reachable_from_tips_local(self.repo_a, [first], exclude={first}), set())
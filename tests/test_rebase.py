@@ -1,12 +1,14 @@
 """Tests for rebase: linear history, conflict and abort (Phase D)."""
 
+import json
+import os
 import tempfile
 import unittest
 from pathlib import Path
 
 from pygit.errors import PygitError
 from pygit.plumbing import rev_parse
-from pygit.porcelain import add_path, checkout_branch, commit
+from pygit.porcelain import add_path, checkout_branch, commit, is_dirty, merge_trees_in_memory, rm_paths
 from pygit.rebase import rebase, rebase_abort, rebase_continue
 from pygit.refs import head_commit
 from pygit.repo import Repository
@@ -59,6 +61,61 @@ class TestRebaseLinear(unittest.TestCase):
         self.assertEqual((self.tmp / "f").read_text(), "c\n")
         self.assertEqual((self.tmp / "d").read_text(), "d\n")
 
+    def test_rebase_replays_deletions_and_new_dirs(self) -> None:
+        (self.tmp / "f").write_text("a\n")
+        (self.tmp / "gone").write_text("bye\n")
+        add_path(self.repo, "f")
+        add_path(self.repo, "gone")
+        commit(self.repo, "A", "X <x@x>")
+
+        checkout_branch(self.repo, "upstream", create=True)
+        (self.tmp / "u").write_text("u\n")
+        add_path(self.repo, "u")
+        commit(self.repo, "U", "X <x@x>")
+
+        checkout_branch(self.repo, "main", create=False)
+        (self.tmp / "u").unlink(missing_ok=True)
+        rm_paths(self.repo, ["gone"])
+        commit(self.repo, "drop gone", "X <x@x>")
+        (self.tmp / "dir" / "deep").mkdir(parents=True)
+        (self.tmp / "dir" / "deep" / "x").write_text("x\n")
+        add_path(self.repo, "dir")
+        commit(self.repo, "add dir", "X <x@x>")
+
+        rebase(self.repo, "upstream")
+
+        self.assertFalse((self.tmp / "gone").exists())
+        self.assertEqual((self.tmp / "dir" / "deep" / "x").read_text(), "x\n")
+        self.assertEqual((self.tmp / "u").read_text(), "u\n")
+        self.assertEqual(sorted(self.repo.load_index()), ["dir/deep/x", "f", "u"])
+        self.assertFalse(is_dirty(self.repo))
+
+    def test_rebase_keeps_executable_mode(self) -> None:
+        (self.tmp / "f").write_text("a\n")
+        add_path(self.repo, "f")
+        commit(self.repo, "A", "X <x@x>")
+        checkout_branch(self.repo, "upstream", create=True)
+        (self.tmp / "d").write_text("d\n")
+        add_path(self.repo, "d")
+        commit(self.repo, "D", "X <x@x>")
+        checkout_branch(self.repo, "main", create=False)
+        (self.tmp / "d").unlink(missing_ok=True)
+        run = self.tmp / "run.sh"
+        run.write_text("#!/bin/sh\n")
+        os.chmod(run, 0o755)
+        add_path(self.repo, "run.sh")
+        commit(self.repo, "add run.sh", "X <x@x>")
+
+        rebase(self.repo, "upstream")
+
+        from pygit.objects import Commit, Tree
+        head = Commit.from_content(self.repo.load_object(head_commit(self.repo.git_dir)).content)
+        modes = {name: mode for mode, name, _sha in Tree.from_content(self.repo.load_object(head.tree_hash).content).entries}
+        self.assertEqual(modes["run.sh"], "100755")
+        self.assertEqual(self.repo.load_index()["run.sh"]["mode"], "100755")
+        self.assertTrue(os.access(run, os.X_OK))
+        self.assertFalse(is_dirty(self.repo))
+
 
 class TestRebaseAbort(unittest.TestCase):
     """Rebase --abort restores original HEAD and tree."""
@@ -92,10 +149,134 @@ class TestRebaseAbort(unittest.TestCase):
             rebase(self.repo, "other")
         except PygitError:
             pass
-        if (self.repo.git_dir / "pygit" / "REBASE_ORIG_HEAD").exists():
+        if (self.repo.git_dir / "pygit" / "REBASE_STATE.json").exists():
             rebase_abort(self.repo)
             head = head_commit(self.repo.git_dir)
             self.assertEqual(head, orig_head)
             self.assertEqual((self.tmp / "g").read_text(), orig_content)
         else:
-            self.skipTest("rebase did not conflict (no REBASE_ORIG_HEAD)")
+            self.skipTest("rebase did not conflict (no REBASE_STATE.json)")
+
+
+class TestRebaseConflictState(unittest.TestCase):
+    """A conflicted rebase keeps its state in one file per operation under .git/pygit."""
+
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp(prefix="pygit_rebase_state_"))
+        self.repo = Repository(str(self.tmp))
+        self.repo.init()
+
+    def test_conflict_writes_single_state_files(self) -> None:
+        (self.tmp / "g").write_text("one\n")
+        add_path(self.repo, "g")
+        commit(self.repo, "base", "Y <y@y>")
+
+        checkout_branch(self.repo, "other", create=True)
+        (self.tmp / "g").write_text("other\n")
+        add_path(self.repo, "g")
+        commit(self.repo, "other", "Y <y@y>")
+
+        checkout_branch(self.repo, "main", create=False)
+        (self.tmp / "g").write_text("two\n")
+        add_path(self.repo, "g")
+        commit(self.repo, "main1", "Y <y@y>")
+
+        with self.assertRaises(PygitError):
+            rebase(self.repo, "other")
+        state_dir = self.repo.git_dir / "pygit"
+        self.assertEqual(
+            sorted(p.name for p in state_dir.iterdir()),
+            ["CHERRY_PICK_STATE.json", "REBASE_STATE.json"],
+        )
+        rebase_abort(self.repo)
+        self.assertEqual(list(state_dir.iterdir()), [])
+
+    def test_continue_from_legacy_state_clears_all_state(self) -> None:
+        for name in ("g", "h"):
+            (self.tmp / name).write_text("one\n")
+            add_path(self.repo, name)
+        commit(self.repo, "base", "Y <y@y>")
+
+        checkout_branch(self.repo, "other", create=True)
+        for name in ("g", "h"):
+            (self.tmp / name).write_text("other\n")
+            add_path(self.repo, name)
+        commit(self.repo, "other", "Y <y@y>")
+
+        checkout_branch(self.repo, "main", create=False)
+        for name in ("g", "h"):
+            (self.tmp / name).write_text("two\n")
+            add_path(self.repo, name)
+            commit(self.repo, f"main {name}", "Y <y@y>")
+
+        with self.assertRaises(PygitError):
+            rebase(self.repo, "other")
+        # Rewrite the stopped rebase in the legacy one-file-per-field layout
+        state_dir = self.repo.git_dir / "pygit"
+        rb = json.loads((state_dir / "REBASE_STATE.json").read_text())
+        cp = json.loads((state_dir / "CHERRY_PICK_STATE.json").read_text())
+        (state_dir / "REBASE_STATE.json").unlink()
+        (state_dir / "CHERRY_PICK_STATE.json").unlink()
+        (state_dir / "REBASE_ORIG_HEAD").write_text(rb["orig"] + "\n")
+        (state_dir / "REBASE_UPSTREAM").write_text(rb["upstream"] + "\n")
+        (state_dir / "REBASE_BRANCH").write_text(rb["branch"] + "\n")
+        (state_dir / "REBASE_TODO").write_text("".join(h + "\n" for h in rb["todo"]))
+        (state_dir / "CHERRY_PICK_HEAD").write_text(cp["pick"] + "\n")
+        (state_dir / "CHERRY_PICK_ORIG_HEAD").write_text(cp["orig"] + "\n")
+        (state_dir / "CHERRY_PICK_MSG").write_text(cp["msg"])
+
+        (self.tmp / "g").write_text("resolved\n")
+        add_path(self.repo, "g")
+        with self.assertRaises(PygitError):
+            rebase_continue(self.repo)
+        (self.tmp / "h").write_text("resolved\n")
+        add_path(self.repo, "h")
+        rebase_continue(self.repo)
+        self.assertEqual(list(state_dir.iterdir()), [])
+        with self.assertRaises(PygitError):
+            rebase_continue(self.repo)
+
+    def test_clean_prefix_replayed_before_conflict(self) -> None:
+        (self.tmp / "g").write_text("one\n")
+        (self.tmp / "old").write_text("old\n")
+        add_path(self.repo, "g")
+        add_path(self.repo, "old")
+        commit(self.repo, "base", "Y <y@y>")
+
+        checkout_branch(self.repo, "other", create=True)
+        (self.tmp / "g").write_text("other\n")
+        add_path(self.repo, "g")
+        commit(self.repo, "other", "Y <y@y>")
+
+        checkout_branch(self.repo, "main", create=False)
+        (self.tmp / "sub").mkdir()
+        (self.tmp / "sub" / "n").write_text("n\n")
+        add_path(self.repo, "sub")
+        commit(self.repo, "add sub/n", "Y <y@y>")
+        clean = rev_parse(self.repo, "HEAD")
+        (self.tmp / "g").write_text("two\n")
+        add_path(self.repo, "g")
+        commit(self.repo, "conflicting", "Y <y@y>")
+
+        with self.assertRaises(PygitError):
+            rebase(self.repo, "other")
+        # first commit was replayed onto other; the second stopped with conflict markers
+        from pygit.objects import Commit
+        head = Commit.from_content(self.repo.load_object(head_commit(self.repo.git_dir)).content)
+        self.assertIn("add sub/n", head.message)
+        self.assertEqual(head.parent_hashes, [rev_parse(self.repo, "other")])
+        self.assertNotEqual(head_commit(self.repo.git_dir), clean)
+        self.assertEqual((self.tmp / "sub" / "n").read_text(), "n\n")
+        self.assertIn("<<<<<<<", (self.tmp / "g").read_text())
+        self.assertIn("sub/n", self.repo.load_index())
+
+
+class TestMergeTreesInMemory(unittest.TestCase):
+    def test_mode_only_change_on_either_side_is_kept(self) -> None:
+        base = {"run.sh": ("100644", "a" * 40)}
+        exe = {"run.sh": ("100755", "a" * 40)}
+        edited = {"run.sh": ("100644", "b" * 40)}
+        self.assertEqual(merge_trees_in_memory(base, base, exe), exe)
+        self.assertEqual(merge_trees_in_memory(base, exe, base), exe)
+        self.assertEqual(merge_trees_in_memory(base, edited, exe), {"run.sh": ("100755", "b" * 40)})
+        self.assertIsNone(merge_trees_in_memory(exe, base, {"run.sh": ("120000", "a" * 40)}))
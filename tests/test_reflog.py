@@ -1,12 +1,13 @@
 """Tests for reflog: commit/checkout/reset/merge write reflog; reflog command output."""
 
 import io
-import sys
 import tempfile
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
 
-from pygit.config import set_value
+from pygit.config import set_values
+from pygit.errors import NotARepositoryError
 from pygit.porcelain import (
     add_path,
     checkout_branch,
@@ -15,7 +16,7 @@ from pygit.porcelain import (
     reflog_show,
     reset_hard,
 )
-from pygit.reflog import read_reflog
+from pygit.reflog import append_reflog, read_reflog, read_reflog_reversed, reflog_path_for_ref
 from pygit.repo import Repository
 
 
@@ -27,8 +28,59 @@ class TestCommitWritesReflog(unittest.TestCase):
         self.repo_dir = Path(d)
         self.repo = Repository(str(self.repo_dir))
         self.repo.init()
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
+
+    def test_require_repo_checked_until_repo_exists(self) -> None:
+        repo = Repository(tempfile.mkdtemp(prefix="pygit_reflog_norepo_"))
+        with self.assertRaises(NotARepositoryError):
+            read_reflog(repo, "HEAD")
+        with redirect_stdout(io.StringIO()):
+            repo.init()
+        self.assertEqual(read_reflog(repo, "HEAD"), [])
+
+    def test_append_reflog_creates_dirs_and_appends_lines(self) -> None:
+        a, b = "a" * 40, "b" * 40
+        append_reflog(self.repo, "refs/heads/topic/x", a, b, "first\nline", who="A <a@b>", timestamp=1, tz="+0000")
+        append_reflog(self.repo, "refs/heads/topic/x", b, a, "second", who="A <a@b>", timestamp=2, tz="+0000")
+        log = self.repo.git_dir / "logs" / "refs" / "heads" / "topic" / "x"
+        self.assertEqual(
+            log.read_bytes(),
+            f"{a} {b} A <a@b> 1 +0000\tfirst line\n{b} {a} A <a@b> 2 +0000\tsecond\n".encode(),
+        )
+        self.assertEqual([e[5] for e in read_reflog(self.repo, "refs/heads/topic/x")], ["first line", "second"])
+        self.assertEqual(reflog_path_for_ref(self.repo, "refs/heads/topic/x"), log)
+        self.assertEqual(reflog_path_for_ref(self.repo, "HEAD"), self.repo.git_dir / "logs" / "HEAD")
+
+    def test_read_reflog_skips_malformed_lines(self) -> None:
+        a, b = "a" * 40, "B" * 40
+        log = self.repo.git_dir / "logs" / "HEAD"
+        log.parent.mkdir(parents=True, exist_ok=True)
+        log.write_bytes(
+            (
+                f"{a} {b} A U <a@b> 10 +0100\tcommit: x\twith tab\r\n"
+                f"{a} {b} 10 +0100\tno identity\n"
+                f"{a[:39]} {b} A <a@b> 11 +0000\tshort sha\n"
+                f"{a} {b} A <a@b> 12 +0000 no tab\n"
+                f"{a} {b} A <a@b> xx +0000\tbad timestamp\n"
+                f"{b} {a} A <a@b> 13 -0500\t\n"
+                f"{a}  {b} A <a@b>  -7 +0000\tnegative timestamp\n"
+                f"{a} {b} A  <a@b> 0042 +0000 \tpadded\n"
+            ).encode()
+        )
+        self.assertEqual(
+            read_reflog(self.repo, "HEAD"),
+            [
+                (a, b.lower(), "A U <a@b>", 10, "+0100", "commit: x\twith tab"),
+                (b.lower(), a, "A <a@b>", 13, "-0500", ""),
+                (a, b.lower(), "A <a@b>", -7, "+0000", "negative timestamp"),
+                (a, b.lower(), "A <a@b>", 42, "+0000", "padded"),
+            ],
+        )
+        self.assertEqual(
+            list(read_reflog_reversed(self.repo, "HEAD")),
+            [(new, msg) for _old, new, _who, _ts, _tz, msg in reversed(read_reflog(self.repo, "HEAD"))],
+        )
+        self.assertEqual(list(read_reflog_reversed(self.repo, "refs/heads/none")), [])
 
     def test_commit_writes_head_and_branch_reflog(self) -> None:
         (self.repo_dir / "f").write_text("x")
@@ -56,8 +108,7 @@ class TestCheckoutWritesReflog(unittest.TestCase):
         self.repo_dir = Path(d)
         self.repo = Repository(str(self.repo_dir))
         self.repo.init()
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
         (self.repo_dir / "f").write_text("x")
         add_path(self.repo, "f")
         commit(self.repo, "first", author="Alice <alice@example.com>")
@@ -82,8 +133,7 @@ class TestResetWritesReflog(unittest.TestCase):
         self.repo_dir = Path(d)
         self.repo = Repository(str(self.repo_dir))
         self.repo.init()
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
         (self.repo_dir / "f").write_text("1")
         add_path(self.repo, "f")
         commit(self.repo, "first", author="Alice <alice@example.com>")
@@ -113,8 +163,7 @@ class TestMergeWritesReflog(unittest.TestCase):
         self.repo_dir = Path(d)
         self.repo = Repository(str(self.repo_dir))
         self.repo.init()
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
         (self.repo_dir / "a").write_text("1")
         add_path(self.repo, "a")
         commit(self.repo, "first", author="Alice <alice@example.com>")
@@ -143,8 +192,7 @@ class TestReflogCommandOutput(unittest.TestCase):
         self.repo_dir = Path(d)
         self.repo = Repository(str(self.repo_dir))
         self.repo.init()
-        set_value(self.repo, "user.name", "Alice")
-        set_value(self.repo, "user.email", "alice@example.com")
+        set_values(self.repo, {"user.name": "Alice", "user.email": "alice@example.com"})
         (self.repo_dir / "f").write_text("1")
         add_path(self.repo, "f")
         commit(self.repo, "first", author="Alice <alice@example.com>")
@@ -154,12 +202,8 @@ class TestReflogCommandOutput(unittest.TestCase):
 
     def test_reflog_prints_reverse_order_and_at_idx(self) -> None:
         out = io.StringIO()
-        old = sys.stdout
-        sys.stdout = out
-        try:
+        with redirect_stdout(out):
             reflog_show(self.repo, ref="HEAD", max_count=5)
-        finally:
-            sys.stdout = old
         lines = out.getvalue().strip().splitlines()
         self.assertGreaterEqual(len(lines), 2)
         self.assertIn("@{0}", lines[0], "Most recent should be @{0}")
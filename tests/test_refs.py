@@ -3,14 +3,24 @@
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from pygit.errors import InvalidRefError
 from pygit.refs import (
     HeadState,
+    _PACKED_CACHE,
+    _is_hex_sha,
+    _read_packed_refs,
     current_branch_name,
     head_commit,
+    list_branches,
+    list_ref_names_with_prefix,
+    list_tags,
     read_head,
+    ref_snapshot,
     resolve_ref,
     update_ref,
+    update_ref_verify,
     write_head_detached,
     write_head_ref,
 )
@@ -57,3 +67,144 @@ class TestRefs(unittest.TestCase):
 
     def test_resolve_ref_missing(self) -> None:
         self.assertIsNone(resolve_ref(self.repo_git, "refs/heads/nonexistent"))
+
+    def test_packed_refs_cache_follows_file_changes(self) -> None:
+        sha_a, sha_b = "a" * 40, "b" * 40
+        packed = self.repo_git / "packed-refs"
+        packed.write_text(f"# pack-refs with: peeled\n{sha_a} refs/heads/main\n")
+        first = _read_packed_refs(self.repo_git)
+        self.assertIs(_read_packed_refs(self.repo_git), first)
+        self.assertEqual(resolve_ref(self.repo_git, "refs/heads/main"), sha_a)
+        packed.write_text(f"{sha_b} refs/heads/main\n{sha_a} refs/tags/v1\n")
+        self.assertEqual(resolve_ref(self.repo_git, "refs/heads/main"), sha_b)
+        self.assertEqual(resolve_ref(self.repo_git, "refs/tags/v1"), sha_a)
+        packed.unlink()
+        self.assertIsNone(resolve_ref(self.repo_git, "refs/heads/main"))
+
+    def test_sorted_packed_refs_are_searched_without_parsing(self) -> None:
+        refs = {f"refs/tags/v{i:03d}": f"{i:040x}" for i in range(50)}
+        lines = ["# pack-refs with: peeled fully-peeled sorted "]
+        for name in sorted(refs):
+            lines.append(f"{refs[name]} {name}")
+            if name.endswith("7"):
+                lines.append("^" + "f" * 40)
+        (self.repo_git / "packed-refs").write_text("\n".join(lines) + "\n")
+        _PACKED_CACHE.clear()
+        # Pretend the file is large enough to be memory-mapped; only then is it bisected
+        with mock.patch("pygit.refs.MMAP_THRESHOLD", 0):
+            for name, sha in refs.items():
+                self.assertEqual(resolve_ref(self.repo_git, name), sha)
+            self.assertIsNone(resolve_ref(self.repo_git, "refs/tags/v999"))
+            self.assertIsNone(resolve_ref(self.repo_git, "refs/heads/main"))
+        self.assertEqual(_PACKED_CACHE, {})
+
+    def test_small_sorted_packed_refs_use_cached_parse(self) -> None:
+        sha = "a" * 40
+        (self.repo_git / "packed-refs").write_text(f"# pack-refs with: peeled fully-peeled sorted \n{sha} refs/tags/v1\n")
+        _PACKED_CACHE.clear()
+        self.assertEqual(resolve_ref(self.repo_git, "refs/tags/v1"), sha)
+        self.assertIn(self.repo_git / "packed-refs", _PACKED_CACHE)
+        with mock.patch("pygit.refs.map_file", side_effect=AssertionError("re-read")):
+            self.assertEqual(resolve_ref(self.repo_git, "refs/tags/v1"), sha)
+
+    def test_list_loose_refs_skips_dirs_dotfiles_and_symlinks(self) -> None:
+        for name in ("main", "dev"):
+            update_ref(self.repo_git, f"refs/heads/{name}", "a" * 40)
+        (self.repo_git / "refs" / "heads" / ".hidden").write_text("a" * 40 + "\n")
+        (self.repo_git / "refs" / "heads" / "feature").mkdir()
+        (self.repo_git / "refs" / "heads" / "link").symlink_to("main")
+        update_ref(self.repo_git, "refs/tags/v1", "b" * 40)
+        self.assertEqual(list_branches(self.repo_git), ["dev", "main"])
+        self.assertEqual(list_tags(self.repo_git), ["v1"])
+        self.assertEqual(
+            list_ref_names_with_prefix(self.repo_git, "refs/heads/"), ["refs/heads/dev", "refs/heads/main"]
+        )
+        self.assertEqual(list_ref_names_with_prefix(self.repo_git, "refs/remotes/origin/"), [])
+        (self.repo_git / "packed-refs").write_text(f"{'c' * 40} refs/heads/main\n{'c' * 40} refs/heads/old\n")
+        self.assertEqual(
+            list_ref_names_with_prefix(self.repo_git, "refs/heads/"),
+            ["refs/heads/dev", "refs/heads/main", "refs/heads/old"],
+        )
+
+    def test_ref_snapshot_matches_per_ref_resolution(self) -> None:
+        update_ref(self.repo_git, "refs/heads/main", "A" * 40)
+        (self.repo_git / "refs" / "heads" / "alias").write_text("ref: refs/heads/main\n")
+        (self.repo_git / "refs" / "heads" / "broken").write_text("ref: refs/heads/missing\n")
+        update_ref(self.repo_git, "refs/tags/v1", "b" * 40)
+        (self.repo_git / "packed-refs").write_text(
+            f"{'c' * 40} refs/heads/main\n{'d' * 40} refs/heads/old\n{'e' * 40} refs/remotes/origin/main\n"
+        )
+        snap = ref_snapshot(self.repo_git)
+        expected = {}
+        for prefix in ("refs/heads/", "refs/tags/"):
+            for name in list_ref_names_with_prefix(self.repo_git, prefix):
+                sha = resolve_ref(self.repo_git, name)
+                if sha:
+                    expected[name] = sha
+        self.assertEqual(snap, expected)
+        self.assertEqual(snap["refs/heads/main"], "a" * 40)
+        self.assertEqual(snap["refs/heads/old"], "d" * 40)
+        self.assertNotIn("refs/heads/broken", snap)
+
+    def test_read_head_follows_head_writes(self) -> None:
+        write_head_ref(self.repo_git, "refs/heads/main")
+        self.assertIs(read_head(self.repo_git), read_head(self.repo_git))
+        write_head_detached(self.repo_git, "c" * 40)
+        self.assertEqual(read_head(self.repo_git), HeadState("detached", "c" * 40))
+        write_head_detached(self.repo_git, "d" * 40)
+        self.assertEqual(read_head(self.repo_git), HeadState("detached", "d" * 40))
+        write_head_ref(self.repo_git, "refs/heads/dev")
+        self.assertEqual(current_branch_name(self.repo_git), "dev")
+        (self.repo_git / "HEAD").unlink()
+        self.assertIsNone(read_head(self.repo_git))
+
+    def test_resolve_symbolic_refs_and_cycles(self) -> None:
+        update_ref(self.repo_git, "refs/heads/main", "e" * 40)
+        (self.repo_git / "refs" / "heads" / "alias").write_text("ref: refs/heads/main\n")
+        (self.repo_git / "refs" / "heads" / "alias2").write_text("refs/heads/alias\n")
+        self.assertEqual(resolve_ref(self.repo_git, "refs/heads/alias2"), "e" * 40)
+        (self.repo_git / "refs" / "heads" / "loop-a").write_text("ref: refs/heads/loop-b\n")
+        (self.repo_git / "refs" / "heads" / "loop-b").write_text("ref: refs/heads/loop-a\n")
+        with self.assertRaises(InvalidRefError):
+            resolve_ref(self.repo_git, "refs/heads/loop-a")
+
+    def test_update_ref_verify_checks_old_value_and_lock(self) -> None:
+        a, b = "a" * 40, "b" * 40
+        update_ref_verify(self.repo_git, "refs/heads/main", a)
+        with self.assertRaises(InvalidRefError):
+            update_ref_verify(self.repo_git, "refs/heads/main", b, old_hash=b)
+        self.assertEqual(resolve_ref(self.repo_git, "refs/heads/main"), a)
+        lock = self.repo_git / "refs" / "heads" / "main.lock"
+        self.assertFalse(lock.exists())
+        lock.write_text("held\n")
+        with self.assertRaises(InvalidRefError):
+            update_ref_verify(self.repo_git, "refs/heads/main", b, old_hash=a)
+        self.assertEqual(lock.read_text(), "held\n")
+        lock.unlink()
+        update_ref_verify(self.repo_git, "refs/heads/main", b, old_hash=a.upper())
+        self.assertEqual(resolve_ref(self.repo_git, "refs/heads/main"), b)
+        (self.repo_git / "packed-refs").write_text(f"{a} refs/heads/packed\n")
+        update_ref_verify(self.repo_git, "refs/heads/packed", b, old_hash=a)
+        self.assertEqual(resolve_ref(self.repo_git, "refs/heads/packed"), b)
+
+    def test_read_packed_refs_skips_comments_and_peeled_lines(self) -> None:
+        (self.repo_git / "packed-refs").write_text(
+            "# pack-refs with: peeled\n"
+            f"{'A' * 40} refs/tags/v1\n"
+            f"^{'b' * 40}\n"
+            f"{'c' * 40}\trefs/heads/tabbed  \n"
+            f"{'d' * 41} refs/heads/too-long\n"
+            f"{'e' * 40}\n"
+        )
+        self.assertEqual(
+            _read_packed_refs(self.repo_git),
+            {"refs/tags/v1": "a" * 40, "refs/heads/tabbed": "c" * 40},
+        )
+
+    def test_is_hex_sha(self) -> None:
+        self.assertTrue(_is_hex_sha("a" * 40))
+        self.assertTrue(_is_hex_sha("0123456789abcdefABCDEF" + "0" * 18))
+        self.assertFalse(_is_hex_sha("a" * 39))
+        self.assertFalse(_is_hex_sha("a" * 39 + "g"))
+        self.assertFalse(_is_hex_sha("a" * 39 + " "))
+        self.assertFalse(_is_hex_sha("ref: refs/heads/main"))
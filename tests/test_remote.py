@@ -3,7 +3,9 @@
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from pygit import config
 from pygit.remote import (
     get_remote_fetch_refspecs,
     get_remote_url,
@@ -53,6 +55,17 @@ class TestRemoteConfig(unittest.TestCase):
         self.assertEqual(get_remote_url(self.repo, "origin"), "/path/to/repo")
         self.assertIsNone(get_remote_url(self.repo, "nonexistent"))
 
+    def test_remote_lookups_parse_config_once(self) -> None:
+        remote_add(self.repo, "origin", "/path/to/repo")
+        remote_add(self.repo, "backup", "/path/to/backup")
+        with mock.patch("pygit.config.read_config", wraps=config.read_config) as spy:
+            for name, url, _push in remote_list(self.repo):
+                self.assertEqual(get_remote_url(self.repo, name), url)
+                self.assertEqual(len(get_remote_fetch_refspecs(self.repo, name)), 1)
+        self.assertEqual(spy.call_count, 1)
+        remote_remove(self.repo, "backup")
+        self.assertEqual([r[0] for r in remote_list(self.repo)], ["origin"])
+
     def test_default_fetch_refspec(self) -> None:
         remote_add(self.repo, "origin", "/path/to/repo")
         refspecs = get_remote_fetch_refspecs(self.repo, "origin")
@@ -95,3 +108,17 @@ class TestRefspec(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0], ("refs/heads/main", "refs/remotes/origin/main"))
         self.assertEqual(result[1], ("refs/heads/feature", "refs/remotes/origin/feature"))
+
+    def test_refspec_expand_with_suffix(self) -> None:
+        r = parse_refspec("refs/heads/*/tip:refs/remotes/origin/*-tip")
+        self.assertEqual(refspec_expand(r, "refs/heads/team/tip"), "refs/remotes/origin/team-tip")
+        self.assertIsNone(refspec_expand(r, "refs/heads/team/base"))
+        self.assertIsNone(refspec_expand(parse_refspec("refs/*/x:dst/*"), "refs/x"))
+        self.assertEqual(r, parse_refspec("refs/heads/*/tip:refs/remotes/origin/*-tip"))
+
+    def test_refspec_expand_src_list_matches_single_expand(self) -> None:
+        srcs = ["refs/heads/a/tip", "refs/heads/tip", "refs/heads/b/c/tip", "refs/tags/x/tip", "refs/heads/a"]
+        for spec in ("refs/heads/*/tip:refs/remotes/o/*", "refs/heads/*:refs/remotes/o/*", "refs/heads/a:refs/remotes/o/a"):
+            r = parse_refspec(spec)
+            expected = [(src, refspec_expand(r, src)) for src in srcs if refspec_expand(r, src) is not None]
+            self.assertEqual(refspec_expand_src_list(r, srcs), expected)
@@ -1,12 +1,16 @@
 """Tests for show and restore."""
 
+import io
 import tempfile
 import unittest
+from contextlib import redirect_stdout
 from pathlib import Path
+from unittest import mock
 
+from pygit import repo as repo_mod
 from pygit.objects import Blob, Commit, Tree
-from pygit.porcelain import show_commit, restore
-from pygit.repo import Repository
+from pygit.porcelain import diff_trees, diff_trees_incremental, show_commit, restore
+from pygit.repo import Repository, tree_hash_for_commit
 
 
 def make_temp_repo_with_commit() -> tuple[Path, Repository, str]:
@@ -42,8 +46,6 @@ class TestShow(unittest.TestCase):
         self.repo_dir, self.repo, self.commit_sha = make_temp_repo_with_commit()
 
     def test_show_produces_diff_output(self) -> None:
-        import io
-        from contextlib import redirect_stdout
         out = io.StringIO()
         with redirect_stdout(out):
             show_commit(self.repo, "HEAD")
@@ -53,6 +55,42 @@ class TestShow(unittest.TestCase):
         self.assertIn("First", text)
         self.assertIn("diff", text.lower())
 
+    def test_diff_trees_prints_paths_in_order(self) -> None:
+        shas = {name: self.repo.store_object(Blob(f"{name}\n".encode())) for name in ("a", "b", "c", "d")}
+        tree_a = {"a": shas["a"], "b": shas["b"], "c": shas["c"]}
+        tree_b = {"b": shas["c"], "c": shas["c"], "d": shas["d"]}
+        out = io.StringIO()
+        with redirect_stdout(out):
+            diff_trees(self.repo, tree_a, tree_b)
+        headers = [l for l in out.getvalue().splitlines() if l.startswith("diff --git")]
+        self.assertEqual(headers, ["diff --git a/a b/a", "diff --git a/b b/b", "diff --git a/d b/d"])
+
+    def test_diff_trees_incremental_matches_flat_diff(self) -> None:
+        blob = {n: self.repo.store_object(Blob(f"{n}\n".encode())) for n in ("x", "y", "z")}
+        same = self.repo.store_object(Tree([("100644", "k", blob["x"])]))
+        sub_a = self.repo.store_object(Tree([("100644", "m", blob["x"]), ("100644", "n", blob["y"])]))
+        sub_b = self.repo.store_object(Tree([("100644", "m", blob["z"])]))
+        tree_a = self.repo.store_object(Tree([
+            ("040000", "keep", same), ("040000", "sub", sub_a), ("100644", "swap", blob["x"]),
+        ]))
+        tree_b = self.repo.store_object(Tree([
+            ("040000", "keep", same), ("040000", "sub", sub_b), ("040000", "swap", same), ("100644", "top", blob["y"]),
+        ]))
+
+        def capture(fn, *args) -> str:
+            out = io.StringIO()
+            with redirect_stdout(out):
+                fn(*args)
+            return out.getvalue()
+
+        flat = capture(
+            diff_trees, self.repo, self.repo.build_index_from_tree(tree_a), self.repo.build_index_from_tree(tree_b)
+        )
+        self.assertEqual(capture(diff_trees_incremental, self.repo, tree_a, tree_b), flat)
+        self.assertIn("a/sub/n", flat)
+        self.assertIn("b/swap/k", flat)
+        self.assertNotIn("keep/k", flat)
+
 
 class TestRestore(unittest.TestCase):
     def setUp(self) -> None:
@@ -75,3 +113,76 @@ class TestRestore(unittest.TestCase):
         (self.repo_dir / "f").write_text("changed\n")
         restore(self.repo, ["f"], staged=False)
         self.assertEqual((self.repo_dir / "f").read_text(), "hello\n")
+
+
+class TestTreeWalks(unittest.TestCase):
+    def setUp(self) -> None:
+        self.repo_dir, self.repo, _ = make_temp_repo_with_commit()
+        a = self.repo.store_object(Blob(b"a\n"))
+        b = self.repo.store_object(Blob(b"b\n"))
+        deep = self.repo.store_object(Tree([("100755", "run.sh", b)]))
+        sub = self.repo.store_object(Tree([("100644", "a.txt", a), ("40000", "deep", deep)]))
+        self.tree = self.repo.store_object(Tree([("100644", "top", a), ("40000", "sub", sub)]))
+        self.blobs = {"top": a, "sub/a.txt": a, "sub/deep/run.sh": b}
+
+    def test_nested_tree_helpers_agree(self) -> None:
+        self.assertEqual(self.repo.build_index_from_tree(self.tree), self.blobs)
+        self.assertEqual(self.repo.get_files_from_tree_recursive(self.tree), set(self.blobs))
+        flat = self.repo.flat_tree_entries(self.tree)
+        self.assertEqual(flat["sub/deep/run.sh"], ("100755", self.blobs["sub/deep/run.sh"]))
+        self.repo.restore_index_from_tree(self.tree)
+        idx = self.repo.load_index()
+        self.assertEqual({p: e["sha1"] for p, e in idx.items()}, self.blobs)
+        self.assertEqual(idx["sub/a.txt"]["size"], 2)
+
+    def test_restore_tree_writes_nested_files(self) -> None:
+        out = Path(tempfile.mkdtemp(prefix="pygit_restore_")) / "out"
+        self.repo.restore_tree(self.tree, out)
+        self.assertEqual((out / "top").read_bytes(), b"a\n")
+        self.assertEqual((out / "sub" / "deep" / "run.sh").read_bytes(), b"b\n")
+        (out / "top").write_bytes(b"much longer previous content\n")
+        self.repo.restore_tree(self.tree, out)
+        self.assertEqual((out / "top").read_bytes(), b"a\n")
+
+    def test_tree_cache_shared_across_walks(self) -> None:
+        cache: dict = {}
+        self.repo.build_index_from_tree(self.tree, tree_cache=cache)
+        self.assertEqual(len(cache), 3)
+        with mock.patch.object(self.repo, "load_object", side_effect=AssertionError("reloaded")):
+            self.assertEqual(self.repo.get_files_from_tree_recursive(self.tree, tree_cache=cache), set(self.blobs))
+        with mock.patch.object(repo_mod, "TREE_CACHE_MAX", 2):
+            small: dict = {}
+            self.assertEqual(self.repo.build_index_from_tree(self.tree, tree_cache=small), self.blobs)
+            self.assertEqual(len(small), 2)
+            self.assertNotIn(self.tree, small)
+
+    def test_create_tree_from_entries_roundtrips_interleaved_paths(self) -> None:
+        a, b = self.blobs["top"], self.blobs["sub/deep/run.sh"]
+        entries = {
+            "a-b": {"sha1": a, "mode": "100644"},
+            "a/x": {"sha1": b, "mode": "100644"},
+            "a/y/z": {"sha1": a, "mode": "100755"},
+            "a.c": {"sha1": b, "mode": "100644"},
+            "b/a/c": {"sha1": a, "mode": "100644"},
+        }
+        tree = self.repo.create_tree_from_entries(entries)
+        self.assertEqual(
+            self.repo.flat_tree_entries(tree),
+            {p: (e["mode"], e["sha1"]) for p, e in entries.items()},
+        )
+        self.assertEqual(self.repo.create_tree_from_entries({}), Tree().hash_id())
+
+    def test_tree_hash_for_commit_reads_header_only(self) -> None:
+        commit = Commit(
+            tree_hash=self.tree,
+            parent_hashes=[],
+            author="A <a@b.com>",
+            committer="A <a@b.com>",
+            message="Nested",
+            timestamp=1700000000,
+            tz_offset="+0000",
+        )
+        csha = self.repo.store_object(commit)
+        self.assertEqual(tree_hash_for_commit(self.repo, csha), self.tree)
+        self.assertIsNone(tree_hash_for_commit(self.repo, self.tree))
+        self.assertIsNone(tree_hash_for_commit(self.repo, "0" * 40))
@@ -3,10 +3,13 @@
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from pygit.porcelain import add_path, commit, status
+from pygit.refs import resolve_ref
+from pygit.reflog import ZEROS
 from pygit.repo import Repository
-from pygit.stash import stash_apply, stash_list, stash_pop, stash_save
+from pygit.stash import _drop_stash_entry, _stash_commit_for_ref, iter_stash, stash_apply, stash_list, stash_pop, stash_save
 
 
 class TestStash(unittest.TestCase):
@@ -37,6 +40,7 @@ class TestStash(unittest.TestCase):
         stash_save(self.repo, message="stash msg")
         stashes = stash_list(self.repo)
         self.assertEqual(len(stashes), 1)
+        self.assertEqual(list(iter_stash(self.repo)), stashes)
         self.assertIn("stash msg", stashes[0][1])
         stash_apply(self.repo)
         self.assertEqual((self.tmp / "g").read_text(), "two\n")
@@ -52,3 +56,66 @@ class TestStash(unittest.TestCase):
         stash_pop(self.repo)
         self.assertEqual((self.tmp / "h").read_text(), "b\n")
         self.assertEqual(len(stash_list(self.repo)), 0)
+
+    def test_stash_refs_resolve_newest_first(self) -> None:
+        (self.tmp / "k").write_text("base\n")
+        add_path(self.repo, "k")
+        commit(self.repo, "first", "D <d@b.c>")
+        shas = []
+        for text in ("one\n", "two\n"):
+            (self.tmp / "k").write_text(text)
+            add_path(self.repo, "k")
+            stash_save(self.repo, message=text.strip())
+            shas.append(resolve_ref(self.repo.git_dir, "refs/stash"))
+        with mock.patch("pygit.stash.read_reflog_reversed", side_effect=AssertionError("reflog read")):
+            self.assertEqual(_stash_commit_for_ref(self.repo, "stash@{0}"), shas[1])
+        self.assertEqual(_stash_commit_for_ref(self.repo, "stash@{1}"), shas[0])
+        self.assertIsNone(_stash_commit_for_ref(self.repo, "stash@{2}"))
+        stash_pop(self.repo)
+        self.assertEqual((self.tmp / "k").read_text(), "two\n")
+        self.assertEqual(_stash_commit_for_ref(self.repo, "stash@{0}"), shas[0])
+
+    def test_drop_truncates_last_reflog_line(self) -> None:
+        (self.tmp / "m").write_text("base\n")
+        add_path(self.repo, "m")
+        commit(self.repo, "first", "E <e@b.c>")
+        (self.tmp / "m").write_text("changed\n")
+        add_path(self.repo, "m")
+        stash_save(self.repo)
+        newest = resolve_ref(self.repo.git_dir, "refs/stash")
+        log = self.repo.git_dir / "logs" / "refs" / "stash"
+        older = ["1" * 40, "2" * 40]
+        pad = "x" * 5000
+        lines = [f"{ZEROS} {older[0]} E <e@b.c> 1 +0000\t{pad}\n", f"{older[0]} {older[1]} E <e@b.c> 2 +0000\t{pad}\n"]
+        log.write_text("".join(lines) + log.read_text())
+        with mock.patch("pygit.stash.read_reflog_reversed", side_effect=AssertionError("reflog read")), mock.patch(
+            "pygit.stash.os.fsync"
+        ) as fsync:
+            _drop_stash_entry(self.repo, "stash@{0}")
+        fsync.assert_called_once()
+        self.assertEqual(log.read_text(), "".join(lines))
+        self.assertEqual(resolve_ref(self.repo.git_dir, "refs/stash"), older[1])
+        self.assertNotEqual(newest, older[1])
+        _drop_stash_entry(self.repo, "stash@{0}")
+        _drop_stash_entry(self.repo, "stash@{0}")
+        self.assertEqual(log.read_bytes(), b"")
+        self.assertFalse((self.repo.git_dir / "refs" / "stash").exists())
+
+    def test_drop_skips_trailing_malformed_reflog_lines(self) -> None:
+        (self.tmp / "m").write_text("base\n")
+        add_path(self.repo, "m")
+        commit(self.repo, "first", "E <e@b.c>")
+        for text in ("one\n", "two\n"):
+            (self.tmp / "m").write_text(text)
+            add_path(self.repo, "m")
+            stash_save(self.repo)
+        older = _stash_commit_for_ref(self.repo, "stash@{1}")
+        log = self.repo.git_dir / "logs" / "refs" / "stash"
+        with open(log, "a") as f:
+            f.write("\nnot a reflog line\n\n")
+        _drop_stash_entry(self.repo, "stash@{0}")
+        self.assertEqual(len(stash_list(self.repo)), 1)
+        self.assertEqual(resolve_ref(self.repo.git_dir, "refs/stash"), older)
+        _drop_stash_entry(self.repo, "stash@{0}")
+        self.assertEqual(stash_list(self.repo), [])
+        self.assertFalse((self.repo.git_dir / "refs" / "stash").exists())
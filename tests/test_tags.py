@@ -4,9 +4,11 @@ import tempfile
 import unittest
 from pathlib import Path
 
+from pygit.errors import InvalidRefError
 from pygit.objects import Blob, Commit, Tag, Tree
 from pygit.plumbing import cat_file_type, cat_file_pretty, rev_parse
 from pygit.porcelain import tag_create_annotated, tag_create_lightweight, tag_delete, tag_list
+from pygit.refs import validate_tag_name
 from pygit.repo import Repository
 
 
@@ -100,3 +102,14 @@ class TestTagDelete(unittest.TestCase):
         self.assertTrue(ref_path.exists())
         tag_delete(self.repo, "v1")
         self.assertFalse(ref_path.exists())
+
+
+class TestTagNameValidation(unittest.TestCase):
+    def test_forbidden_characters_rejected(self) -> None:
+        for bad in ("a b", "a~1", "a^", "a:b", "a?", "a*", "a[0]", "a\\b", "", "/a", "a/", "a..b", "a//b", ".a"):
+            with self.assertRaises(InvalidRefError, msg=bad):
+                validate_tag_name(bad)
+
+    def test_valid_names_accepted(self) -> None:
+        for good in ("v1.0", "release/2024-01", "a.b_c-d", "ünïcode"):
+            validate_tag_name(good)
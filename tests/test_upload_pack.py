@@ -5,11 +5,20 @@ import tempfile
 import threading
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from pygit.errors import PygitError
 from pygit.pack import PACK_SIGNATURE, get_pack_sha_offsets, write_pack
-from pygit.pkt_line import pkt_encode, pkt_flush
+from pygit.pkt_line import pkt_encode, pkt_encode_line, pkt_flush
 from pygit.repo import Repository
-from pygit.upload_pack import fetch_via_upload_pack_tcp
+from pygit.upload_pack import (
+    _pkt_read_from_sock,
+    _send_want_have_done,
+    fetch_via_upload_pack_tcp,
+    upload_pack_advertise,
+    upload_pack_fetch,
+    upload_pack_fetch_to_dir,
+)
 from pygit.util import sha1_hash
 
 
@@ -158,3 +167,115 @@ class TestUploadPackTcp(unittest.TestCase):
         )
         obj = self.repo.load_object(self.commit_sha)
         self.assertEqual(obj.type, "commit")
+
+
+class TestUploadPackStreams(unittest.TestCase):
+    """Client-side reads reassemble data split across many small recv() calls."""
+
+    def test_pack_and_pkt_lines_reassembled_from_small_writes(self) -> None:
+        pack_bytes, sha = _make_minimal_pack_with_commit()
+        ref_pkt = pkt_encode(sha.encode() + b" refs/heads/main\0\n")
+        client, server = socket.socketpair()
+
+        def serve() -> None:
+            stream = ref_pkt + pkt_flush() + pkt_encode(b"NAK\n") + pack_bytes
+            for i in range(0, len(stream), 7):
+                server.sendall(stream[i : i + 7])
+            server.shutdown(socket.SHUT_WR)
+
+        t = threading.Thread(target=serve)
+        t.start()
+        try:
+            self.assertEqual(_pkt_read_from_sock(client, timeout=5), ref_pkt + pkt_flush())
+            self.assertEqual(upload_pack_fetch(client, want=[sha], timeout=5), pack_bytes)
+        finally:
+            t.join()
+            client.close()
+            server.close()
+
+    def test_pkt_read_stops_at_flush_for_long_advertisement(self) -> None:
+        lines = b"".join(pkt_encode(f"{i:040x} refs/heads/b{i}\n".encode()) for i in range(3000))
+        client, server = socket.socketpair()
+        t = threading.Thread(target=lambda: server.sendall(lines + pkt_flush() + b"after"))
+        t.start()
+        try:
+            self.assertEqual(_pkt_read_from_sock(client, timeout=5), lines + pkt_flush())
+            t.join()
+            self.assertEqual(client.recv(100), b"after")
+        finally:
+            client.close()
+            server.close()
+
+    def test_pkt_headers_count_encoded_bytes(self) -> None:
+        self.assertEqual(pkt_encode_line("want " + "a" * 40), b"0032want " + b"a" * 40 + b"\n")
+        self.assertEqual(pkt_encode_line("é"), b"0007\xc3\xa9\n")
+        self.assertEqual(pkt_encode(b""), b"0004")
+        with self.assertRaises(ValueError):
+            pkt_encode_line("x" * 65520)
+        sock = mock.Mock()
+        sock.sendall.side_effect = OSError("stop")
+        with self.assertRaises(OSError):
+            upload_pack_advertise(sock, path="/é")
+        self.assertEqual(sock.sendall.call_args[0][0], pkt_encode("git-upload-pack /é\0".encode()) + pkt_flush())
+        self.assertTrue(sock.sendall.call_args[0][0].startswith(b"0018"))
+
+    def test_want_have_done_sent_in_one_call(self) -> None:
+        sock = mock.Mock()
+        _send_want_have_done(sock, ["a" * 40, "b" * 40], {"c" * 40, "short", "é" * 40})
+        sock.sendall.assert_called_once()
+        sent = bytes(sock.sendall.call_args[0][0])
+        expected_start = pkt_encode(b"want " + b"a" * 40 + b"\n") + pkt_encode(b"want " + b"b" * 40 + b"\n")
+        self.assertTrue(sent.startswith(expected_start))
+        self.assertTrue(sent.endswith(pkt_encode(b"done\n") + pkt_flush()))
+        self.assertIn(b"have " + b"c" * 40, sent)
+        self.assertNotIn(b"short", sent)
+        self.assertEqual(len(sent), 50 * 3 + len(pkt_encode(b"done\n") + pkt_flush()))
+        sock = mock.Mock()
+        with self.assertRaises(PygitError):
+            _send_want_have_done(sock, ["a" * 40, "bad"], None)
+        sock.sendall.assert_not_called()
+
+    def test_pack_streamed_to_directory(self) -> None:
+        pack_bytes, sha = _make_minimal_pack_with_commit()
+        pack_dir = Path(tempfile.mkdtemp(prefix="pygit_upload_stream_")) / "pack"
+        client, server = socket.socketpair()
+
+        def serve() -> None:
+            stream = pkt_encode(b"NAK\n") + pack_bytes
+            for i in range(0, len(stream), 5):  # PACK signature straddles reads
+                server.sendall(stream[i : i + 5])
+            server.shutdown(socket.SHUT_WR)
+
+        t = threading.Thread(target=serve)
+        t.start()
+        try:
+            path = upload_pack_fetch_to_dir(client, want=[sha], pack_dir=pack_dir, timeout=5)
+        finally:
+            t.join()
+            client.close()
+            server.close()
+        self.assertEqual(path.name, f"pack-{pack_bytes[-20:].hex()}.pack")
+        self.assertEqual(path.read_bytes(), pack_bytes)
+        self.assertEqual(sorted(p.name for p in pack_dir.iterdir()), [path.name])
+
+    def test_streamed_pack_with_bad_checksum_rejected(self) -> None:
+        pack_bytes, sha = _make_minimal_pack_with_commit()
+        corrupt = bytearray(pack_bytes)
+        corrupt[20] ^= 0xFF
+        pack_dir = Path(tempfile.mkdtemp(prefix="pygit_upload_stream_")) / "pack"
+        client, server = socket.socketpair()
+
+        def serve() -> None:
+            server.sendall(pkt_encode(b"NAK\n") + bytes(corrupt))
+            server.shutdown(socket.SHUT_WR)
+
+        t = threading.Thread(target=serve)
+        t.start()
+        try:
+            with self.assertRaises(PygitError):
+                upload_pack_fetch_to_dir(client, want=[sha], pack_dir=pack_dir, timeout=5)
+        finally:
+            t.join()
+            client.close()
+            server.close()
+        self.assertEqual(list(pack_dir.iterdir()), [])